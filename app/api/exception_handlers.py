@@ -19,11 +19,32 @@ def _is_truncation_error(exc: Exception) -> bool:
     )
 
 
+def _is_statement_timeout(exc: Exception) -> bool:
+    """Return True when the DB cancelled the statement (SQLSTATE 57014).
+
+    That is what `statement_timeout` raises (see `get_session`). SQLAlchemy's
+    asyncpg adapter copies the SQLSTATE onto `orig` and chains asyncpg's
+    QueryCanceledError as its cause; the message text is never looked at.
+    """
+    orig = getattr(exc, "orig", None)
+    for err in (orig, getattr(orig, "__cause__", None)):
+        if err is None:
+            continue
+        if "57014" in (getattr(err, "sqlstate", None), getattr(err, "pgcode", None)):
+            return True
+        if type(err).__name__ == "QueryCanceledError":
+            return True
+    return False
+
+
 async def dbapi_error_handler(request: Request, exc: Exception) -> JSONResponse:
     """FastAPI exception handler for SQLAlchemy DBAPIError.
 
     - If the underlying DB exception indicates a string truncation, return
       400 Bad Request with a helpful message.
+    - If a statement ran past the route's statement timeout, return
+      504 Gateway Timeout, so clients can tell it from a failure and narrow
+      the query or retry later.
     - For other DB errors, return 500 Internal Server Error with a generic
       message (avoid exposing DB internals).
     """
@@ -38,6 +59,16 @@ async def dbapi_error_handler(request: Request, exc: Exception) -> JSONResponse:
                     )
                 },
             )
+        if _is_statement_timeout(exc):
+            return JSONResponse(
+                status_code=504,
+                content={
+                    "detail": (
+                        "The query took too long and was cancelled. Narrow the "
+                        "filters or try again later."
+                    )
+                },
+            )
     except Exception:
         # Never raise from the error handler - fall through to generic response
         pass
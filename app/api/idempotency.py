@@ -0,0 +1,125 @@
+"""`Idempotency-Key` support for POST endpoints.
+
+A client that retries a POST (e.g. after a timeout on a bad network) sends the
+same `Idempotency-Key` header each time. The first request with a key claims
+it and runs; its response is stored for `IDEMPOTENCY_TTL_HOURS`. Retries get
+the stored response back (marked `Idempotent-Replayed: true`) without the
+endpoint running again. Keys are scoped per user.
+
+- a key reused with a different method, path, query or body gets 422
+- a retry while the first request is still running gets 409
+- if the first request fails, its claim is dropped and a retry runs again;
+  if it dies outright, the claim lapses after `IDEMPOTENCY_LOCK_SECONDS`
+
+Requests without the header behave as before.
+"""
+
+import functools
+import hashlib
+import random
+from datetime import timedelta
+from typing import Type
+
+from fastapi import HTTPException, Request, Response, status
+from pydantic import BaseModel
+
+from app.constants import (
+    IDEMPOTENCY_KEY_MAX_LENGTH,
+    IDEMPOTENCY_LOCK_SECONDS,
+    IDEMPOTENCY_TTL_HOURS,
+)
+from app.crud.idempotency import (
+    claim_idempotency_key,
+    complete_idempotency_key,
+    get_idempotency_key,
+    prune_idempotency_keys,
+    release_idempotency_key,
+)
+
+HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# Share of keyed requests that also delete expired records, so the table
+# only holds about one TTL's worth of keys
+PRUNE_PROBABILITY = 0.01
+
+
+def _fingerprint(request: Request, body: bytes) -> bytes:
+    digest = hashlib.sha256()
+    for part in (request.method, request.url.path, request.url.query):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    digest.update(body)
+    return digest.digest()
+
+
+async def _replay(db, user_id: int, key_hash: bytes, fingerprint: bytes) -> Response:
+    record = await get_idempotency_key(db, user_id, key_hash)
+    if record is not None and record.fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"This {HEADER} was already used for a different request",
+        )
+    if record is None or record.status_code is None:
+        # Still running (or its record expired a moment ago)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A request with this {HEADER} is still in progress",
+            headers={"Retry-After": "1"},
+        )
+    return Response(
+        record.response,
+        status_code=record.status_code,
+        media_type="application/json",
+        headers={REPLAYED_HEADER: "true"},
+    )
+
+
+def idempotent(schema: Type[BaseModel], status_code: int = status.HTTP_200_OK):
+    """Decorate a POST endpoint to honour `Idempotency-Key`.
+
+    The endpoint must accept `request: Request`, `db` and `current_user`
+    arguments. Its result is serialized with `schema` (its response model)
+    and answered with `status_code`, for the first request and every replay.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            request: Request = kwargs["request"]
+            key = request.headers.get(HEADER)
+            if key is None:
+                return await func(*args, **kwargs)
+            if not key or len(key) > IDEMPOTENCY_KEY_MAX_LENGTH:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"{HEADER} must be 1-{IDEMPOTENCY_KEY_MAX_LENGTH} characters",
+                )
+
+            db = kwargs["db"]
+            user_id = kwargs["current_user"].id
+            key_hash = hashlib.sha256(key.encode("utf-8")).digest()
+            fingerprint = _fingerprint(request, await request.body())
+            if random.random() < PRUNE_PROBABILITY:
+                await prune_idempotency_keys(db)
+            claimed = await claim_idempotency_key(
+                db, user_id, key_hash, fingerprint, timedelta(seconds=IDEMPOTENCY_LOCK_SECONDS)
+            )
+            if not claimed:
+                return await _replay(db, user_id, key_hash, fingerprint)
+
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                await db.rollback()
+                await release_idempotency_key(db, user_id, key_hash)
+                raise
+            body = schema.model_validate(result).model_dump_json().encode("utf-8")
+            await complete_idempotency_key(
+                db, user_id, key_hash, status_code, body, timedelta(hours=IDEMPOTENCY_TTL_HOURS)
+            )
+            return Response(body, status_code=status_code, media_type="application/json")
+
+        return wrapper
+
+    return decorator
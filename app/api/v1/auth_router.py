@@ -2,11 +2,16 @@
 
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, Form, HTTPException, status
+from fastapi import APIRouter, Depends, Form, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.get_session import get_session
+from app.db.get_session import get_primary_session, get_session
 from app.schemas.user import EmailVerificationRequest, Token, UserCreate, UserResponse
+from app.services.login_throttle import (
+    login_retry_after,
+    record_login_failure,
+    record_login_success,
+)
 from app.services.user import (
     authenticate_user,
     create_tokens_for_user,
@@ -54,6 +59,7 @@ async def register(user_data: UserCreate, db: AsyncSession = Depends(get_session
 
 @router.post("/login", response_model=Token, status_code=status.HTTP_200_OK)
 async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestFormStrict = Depends(),
     db: AsyncSession = Depends(get_session),
 ):
@@ -61,26 +67,39 @@ async def login(
     Authenticate user and return access tokens.
 
     Accepts username (email) and password in form data.
-    Returns HTTP 200 with tokens on success, HTTP 401 if credentials are invalid.
+    Returns HTTP 200 with tokens on success, HTTP 401 if credentials are invalid,
+    HTTP 429 with Retry-After while the account or client is throttled after
+    repeated failures (checked before the password is).
     """
+    client_ip = request.client.host if request.client else None
+    retry_after = await login_retry_after(db, form_data.username, client_ip)
+    if retry_after is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many failed login attempts, try again later",
+            headers={"Retry-After": str(retry_after)},
+        )
+
     user = await authenticate_user(
         db, email=form_data.username, password=form_data.password
     )
 
     if not user:
+        await record_login_failure(db, form_data.username, client_ip)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    await record_login_success(db, form_data.username)
     tokens = await create_tokens_for_user(user)
     return tokens
 
 
 @router.get("/verify-email", status_code=status.HTTP_200_OK)
 async def verify_email(
-    token: str, db: AsyncSession = Depends(get_session)
+    token: str, db: AsyncSession = Depends(get_primary_session)
 ):
     """
     Verify user's email address using verification token.
@@ -1,14 +1,31 @@
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.fields import sparse_fields
+from app.api.idempotency import idempotent
+from app.api.wire import ROWS_RESPONSE_DOCS, fields_response, rows_response
+from app.constants import (
+    CONTACT_SEARCH_STATEMENT_TIMEOUT_MS,
+    DUPLICATES_STATEMENT_TIMEOUT_MS,
+    SYNC_MAX_PAGE_SIZE,
+    TYPEAHEAD_MAX_RESULTS,
+)
 from app.dependencies.auth import get_current_active_user
 from app.models.user import User
+from app.realtime.change_feed import change_feed
 from app.schemas.contact import (
+    ContactChanges,
     ContactCreate,
+    ContactMergeRequest,
     ContactRead,
+    ContactSuggestion,
     ContactUpdate,
+    DuplicateGroupRead,
+    PhoneLookupRequest,
+    PhoneLookupResult,
 )
 from app.services.contact import (
     create_contact_service,
@@ -16,14 +33,28 @@ from app.services.contact import (
     get_contact_service,
     update_contact_service,
     delete_contact_service,
+    typeahead_service,
+    lookup_phone_service,
+    lookup_phones_service,
+)
+from app.services.duplicates import (
+    DEFAULT_MIN_SCORE,
+    find_duplicates_service,
+    merge_contacts_service,
 )
-from app.db.get_session import get_session
+from app.services.sync import contact_changes_service
+from app.db.get_session import get_primary_session, get_session, statement_timeout
 
 router = APIRouter(prefix="/api/v1/contacts", tags=["Contacts"])
 
+# `fields=` on contact reads
+contact_fields = sparse_fields(ContactRead)
+
 
 @router.post("/", response_model=ContactRead, status_code=status.HTTP_201_CREATED)
+@idempotent(ContactRead, status_code=status.HTTP_201_CREATED)
 async def create_contact_endpoint(
+    request: Request,
     contact_in: ContactCreate,
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_active_user),
@@ -40,22 +71,37 @@ async def create_contact_endpoint(
     return contact
 
 
-@router.get("/", response_model=List[ContactRead])
+@router.get(
+    "/",
+    response_model=List[ContactRead],
+    responses=ROWS_RESPONSE_DOCS,
+    dependencies=[Depends(statement_timeout(CONTACT_SEARCH_STATEMENT_TIMEOUT_MS))],
+)
 async def list_contacts_endpoint(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     first_name: Optional[str] = None,
     last_name: Optional[str] = None,
     email: Optional[str] = None,
     upcoming: bool = False,
+    q: Optional[str] = None,
+    fields: Optional[tuple[str, ...]] = Depends(contact_fields),
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_active_user),
 ):
     """List contacts. Optional query params allow filtering by first_name,
     last_name or email (partial, case-insensitive). Use `upcoming=true` to
-    retrieve contacts with birthdays in the next 7 days.
+    retrieve contacts with birthdays in the next 7 days. Use `q` to search
+    every field at once (word prefixes, phone number prefixes), ranked by
+    relevance. Use `fields` (e.g. `fields=first_name,last_name`) to get only
+    some fields of each contact.
+
+    Besides JSON, answers in MessagePack (`Accept: application/msgpack`) and
+    in a columnar layout (`; layout=columnar`); large responses are gzip or
+    brotli compressed per `Accept-Encoding`.
     """
-    return await list_contacts_service(
+    contacts = await list_contacts_service(
         db,
         user_id=current_user.id,
         skip=skip,
@@ -64,20 +110,161 @@ async def list_contacts_endpoint(
         last_name=last_name,
         email=email,
         upcoming=upcoming,
+        q=q,
+        fields=fields,
+    )
+    return rows_response(request, contacts, ContactRead, fields)
+
+
+@router.get("/changes", response_model=ContactChanges)
+async def contact_changes_endpoint(
+    since: Optional[str] = None,
+    limit: int = Query(500, ge=1, le=SYNC_MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_primary_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Delta sync: contacts created, updated or deleted since the `since`
+    cursor returned by the previous call. Without `since`, returns all
+    contacts (a full sync) and a cursor to continue from. A 410 response
+    means the cursor is too old; start over with a full sync.
+
+    Always read from the primary: a lagging replica would hand out a cursor
+    past commits it hasn't replayed yet, and those changes would be skipped.
+    """
+    try:
+        return await contact_changes_service(db, current_user.id, since, limit)
+    except ValueError as exc:
+        if str(exc) == "invalid_cursor":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid sync cursor"
+            )
+        if str(exc) == "cursor_expired":
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail="Sync cursor expired, full sync required",
+            )
+        raise
+
+
+@router.get("/stream", response_class=StreamingResponse)
+async def contact_stream_endpoint(
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Server-sent events for the current user's contacts: `created` and
+    `updated` (the contact), `deleted` (its id), and `resync` when events may
+    have been missed, in which case catch up with `/changes`.
+    """
+    # Hand the connection used for authentication back to the pool; the
+    # stream itself is fed by the worker's shared LISTEN connection
+    await db.close()
+    return StreamingResponse(
+        change_feed.stream(current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
+@router.get("/typeahead", response_model=List[ContactSuggestion])
+async def typeahead_endpoint(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=TYPEAHEAD_MAX_RESULTS),
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Autocomplete contacts whose first name, last name, full name or email
+    starts with `prefix` (case-insensitive). Served from an in-memory index,
+    so keystrokes don't hit the contacts table.
+    """
+    return await typeahead_service(db, current_user.id, prefix, limit)
+
+
+@router.get("/lookup", response_model=List[ContactRead])
+async def lookup_phone_endpoint(
+    phone: str = Query(..., min_length=1),
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Reverse phone lookup: contacts with this number, in any formatting
+    ("+380 (50) 123-45-67" matches a stored "380501234567").
+    """
+    return await lookup_phone_service(db, current_user.id, phone)
+
+
+@router.post("/lookup", response_model=List[PhoneLookupResult])
+async def lookup_phones_endpoint(
+    lookup_in: PhoneLookupRequest,
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Batch reverse phone lookup (e.g. caller ID for a call log). Resolves
+    up to 1000 numbers in one query; returns one result per number, in
+    request order.
+    """
+    return await lookup_phones_service(db, current_user.id, lookup_in.phones)
+
+
+@router.get(
+    "/duplicates",
+    response_model=List[DuplicateGroupRead],
+    dependencies=[Depends(statement_timeout(DUPLICATES_STATEMENT_TIMEOUT_MS))],
+)
+async def find_duplicates_endpoint(
+    min_score: float = Query(DEFAULT_MIN_SCORE, ge=0, le=1),
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Find groups of contacts that likely describe the same person, matched
+    on normalized email, phone number and name. Higher scores mean more
+    matching keys.
+    """
+    groups = await find_duplicates_service(db, current_user.id, min_score)
+    return [group._asdict() for group in groups]
+
+
+@router.post("/merge", response_model=ContactRead)
+@idempotent(ContactRead)
+async def merge_contacts_endpoint(
+    request: Request,
+    merge_in: ContactMergeRequest,
+    db: AsyncSession = Depends(get_session),
+    current_user: User = Depends(get_current_active_user),
+):
+    """Merge contacts into one (`keep_id`, or the lowest id). Empty fields of
+    the kept contact are filled from the others, which are then deleted, in
+    a single transaction. Honours `Idempotency-Key`.
+    """
+    try:
+        return await merge_contacts_service(
+            db, current_user.id, merge_in.contact_ids, merge_in.keep_id
+        )
+    except ValueError as exc:
+        if str(exc) == "contacts_not_found":
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
+            )
+        if str(exc) == "keep_id_not_in_group":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="keep_id must be one of contact_ids",
+            )
+        raise
+
+
 @router.get("/{contact_id}", response_model=ContactRead)
 async def get_contact_endpoint(
     contact_id: int,
+    fields: Optional[tuple[str, ...]] = Depends(contact_fields),
     db: AsyncSession = Depends(get_session),
     current_user: User = Depends(get_current_active_user),
 ):
-    contact = await get_contact_service(db, contact_id, current_user.id)
+    contact = await get_contact_service(db, contact_id, current_user.id, fields)
     if not contact:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Contact not found"
         )
+    if fields is not None:
+        return fields_response(contact, fields)
     return contact
 
 
@@ -0,0 +1,33 @@
+"""Metrics router: in-process counters of the worker serving the request."""
+
+from fastapi import APIRouter
+
+from app.cache.single_flight import single_flight
+from app.cache.typeahead import typeahead_cache
+from app.middleware import admission_controller, disconnect_stats
+from app.realtime.change_feed import change_feed
+
+router = APIRouter(prefix="/api/v1/metrics", tags=["Metrics"])
+
+
+@router.get("/")
+async def metrics_endpoint():
+    """Counters of this worker process only (each worker keeps its own).
+
+    - `single_flight`: per read operation, how many calls were served by an
+      identical call already in flight (`coalesced`, `coalesced_ratio`)
+    - `typeahead`: prefix index cache size, hits, builds and evictions
+    - `change_feed`: live stream subscribers and delivery counters
+    - `disconnects`: GET requests cancelled because their client went away
+    - `admission`: running and queued requests, and how many were admitted,
+      queued, shed (`rejected`, `timed_out`) per priority class
+
+    No user data is exposed, but keep the route internal (e.g. at the proxy).
+    """
+    return {
+        "single_flight": single_flight.stats(),
+        "typeahead": typeahead_cache.stats(),
+        "change_feed": change_feed.stats(),
+        "disconnects": {"cancelled": disconnect_stats["cancelled"]},
+        "admission": admission_controller.stats(),
+    }
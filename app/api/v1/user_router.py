@@ -1,8 +1,6 @@
 """User router for authenticated user operations."""
 
 from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile, status
-from slowapi import Limiter
-from slowapi.util import get_remote_address
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.constants import AVATAR_ALLOWED_TYPES, AVATAR_MAX_FILE_SIZE
@@ -12,15 +10,14 @@ from app.dependencies.auth import get_current_active_user
 from app.models.user import User
 from app.schemas.user import UserResponse
 from app.services.cloudinary import upload_avatar
-
-limiter = Limiter(key_func=get_remote_address)
+from app.utils.rate_limit import limit
 
 
 router = APIRouter(prefix="/api/v1", tags=["User"])
 
 
 @router.get("/me", response_model=UserResponse, status_code=status.HTTP_200_OK)
-@limiter.limit("5/minute")  # Limit to 5 requests per minute
+@limit("5/minute")  # Limit to 5 requests per minute
 async def get_current_user_info(
     request: Request,  # Add request parameter
     current_user: User = Depends(get_current_active_user),
@@ -35,7 +32,7 @@ async def get_current_user_info(
 
 
 @router.post("/users/avatar", response_model=dict, status_code=status.HTTP_200_OK)
-# @limiter.limit("3/minute")  # Limit to 3 requests per minute
+# @limit("3/minute")  # Limit to 3 requests per minute
 async def update_user_avatar(
     request: Request,
     file: UploadFile = File(...),
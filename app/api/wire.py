@@ -0,0 +1,187 @@
+"""Wire formats for list responses: content negotiation and compression.
+
+`Accept` picks the encoding and the layout:
+
+- `application/json` (default): an array of objects, as before
+- `application/msgpack`: MessagePack with the same structure
+- `; layout=columnar` on either type: `{"field": [value, ...], ...}`, each
+  field name sent once instead of once per row
+
+Bodies of at least `COMPRESSION_MIN_BYTES` are compressed with brotli or gzip,
+per `Accept-Encoding`. `msgpack` and `brotli` are project dependencies but are
+imported on first use; in an environment without them the server answers in
+JSON and gzip respectively.
+"""
+
+import gzip
+from datetime import date
+from functools import cache
+from operator import attrgetter
+from typing import Any, NamedTuple, Optional, Sequence
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+
+from app.constants import BROTLI_QUALITY, COMPRESSION_MIN_BYTES, GZIP_COMPRESS_LEVEL
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+_MEDIA_TYPES = {
+    "application/json": JSON,
+    "application/msgpack": MSGPACK,
+    "application/x-msgpack": MSGPACK,
+    "application/*": JSON,
+    "*/*": JSON,
+}
+
+# OpenAPI `responses=` entry for endpoints answering with `rows_response`
+ROWS_RESPONSE_DOCS = {
+    200: {
+        "content": {
+            f"{JSON}; layout=columnar": {},
+            MSGPACK: {},
+            f"{MSGPACK}; layout=columnar": {},
+        }
+    }
+}
+
+
+class WireFormat(NamedTuple):
+    media_type: str
+    columnar: bool
+
+    @property
+    def content_type(self) -> str:
+        return f"{self.media_type}; layout=columnar" if self.columnar else self.media_type
+
+
+DEFAULT_FORMAT = WireFormat(JSON, False)
+
+
+@cache
+def _msgpack():
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    return msgpack
+
+
+@cache
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        return None
+    return brotli
+
+
+def _parse_header(value: str) -> list[tuple[str, dict[str, str], float]]:
+    """Split an Accept-style header into (item, params, q), best q first.
+
+    Equal q keeps the header's order.
+    """
+    entries = []
+    for position, part in enumerate(value.split(",")):
+        item, *raw_params = (p.strip() for p in part.split(";"))
+        if not item:
+            continue
+        params = {}
+        for raw in raw_params:
+            key, _, val = raw.partition("=")
+            params[key.strip().lower()] = val.strip().strip('"').lower()
+        try:
+            q = float(params.pop("q", "1"))
+        except ValueError:
+            q = 1.0
+        entries.append((-q, position, item.lower(), params))
+    entries.sort()
+    return [(item, params, -neg_q) for neg_q, _pos, item, params in entries]
+
+
+def negotiate_format(accept: Optional[str]) -> WireFormat:
+    for item, params, q in _parse_header(accept or ""):
+        media_type = _MEDIA_TYPES.get(item)
+        if q <= 0 or media_type is None or (media_type == MSGPACK and _msgpack() is None):
+            continue
+        return WireFormat(media_type, params.get("layout") == "columnar")
+    return DEFAULT_FORMAT
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """Return "br", "gzip" or None (identity), preferring brotli on a tie."""
+    q_values = {item: q for item, _params, q in _parse_header(accept_encoding or "")}
+    wildcard = q_values.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in ("br", "gzip"):
+        if encoding == "br" and _brotli() is None:
+            continue
+        q = q_values.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, date):  # also datetime
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def encode_rows(rows: Sequence[Any], fields: Sequence[str], fmt: WireFormat) -> bytes:
+    """Encode `fields` of each row (Row or ORM object) in `fmt`."""
+    if len(fields) == 1:
+        name = fields[0]
+        values = [(getattr(row, name),) for row in rows]
+    else:
+        getter = attrgetter(*fields)
+        values = [getter(row) for row in rows]
+
+    if fmt.columnar:
+        columns = zip(*values) if values else ((),) * len(fields)
+        payload: Any = {name: list(column) for name, column in zip(fields, columns)}
+    else:
+        payload = [dict(zip(fields, row)) for row in values]
+
+    if fmt.media_type == MSGPACK:
+        return _msgpack().packb(payload, default=_msgpack_default)
+    return to_json(payload)
+
+
+def compress(body: bytes, encoding: Optional[str]) -> bytes:
+    if encoding == "br":
+        return _brotli().compress(body, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=GZIP_COMPRESS_LEVEL)
+    return body
+
+
+def rows_response(
+    request: Request,
+    rows: Sequence[Any],
+    schema: type[BaseModel],
+    fields: Optional[Sequence[str]] = None,
+) -> Response:
+    """Serialize `rows` as a list of `schema` in the negotiated wire format.
+
+    Rows are expected to come from the database already matching `schema`,
+    so they are encoded without per-row validation. `fields` (a validated
+    subset of the schema's fields) narrows every object to those keys.
+    """
+    fmt = negotiate_format(request.headers.get("accept"))
+    body = encode_rows(rows, tuple(fields or schema.model_fields), fmt)
+    headers = {"Vary": "Accept, Accept-Encoding"}
+    if len(body) >= COMPRESSION_MIN_BYTES:
+        encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+        if encoding is not None:
+            body = compress(body, encoding)
+            headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=fmt.content_type, headers=headers)
+
+
+def fields_response(row: Any, fields: Sequence[str]) -> Response:
+    """Serialize just `fields` of one row as a JSON object (sparse fieldsets)."""
+    return Response(
+        content=to_json({name: getattr(row, name) for name in fields}), media_type=JSON
+    )
@@ -0,0 +1,11 @@
+from .single_flight import SingleFlight, single_flight
+from .typeahead import PrefixIndex, Suggestion, TypeaheadCache, typeahead_cache
+
+__all__ = [
+    "PrefixIndex",
+    "SingleFlight",
+    "Suggestion",
+    "TypeaheadCache",
+    "single_flight",
+    "typeahead_cache",
+]
@@ -0,0 +1,82 @@
+"""Single-flight: concurrent identical reads share one in-flight call.
+
+The first caller for a key (the leader) runs the call; callers arriving while
+it is in flight await the leader's result instead of issuing their own query.
+Nothing is cached: once the call finishes, the next caller starts a new one.
+
+Results are shared between requests, so only use this for calls returning
+immutable data (column rows, tuples), never session-bound ORM instances. If
+the leader is cancelled (its client went away), waiting callers retry on
+their own.
+"""
+
+import asyncio
+from collections import Counter
+from typing import Awaitable, Callable, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Per-worker registry of in-flight calls, keyed by `(operation, *args)`."""
+
+    def __init__(self):
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self.calls: Counter[str] = Counter()
+        self.coalesced: Counter[str] = Counter()
+
+    async def do(self, key: tuple, call: Callable[[], Awaitable[T]]) -> T:
+        """Return `await call()`, or the result of an identical call in flight.
+
+        `key[0]` names the operation in `stats()`.
+        """
+        operation = key[0]
+        self.calls[operation] += 1
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced[operation] += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # The leader was cancelled, not us: run it ourselves
+                self.calls[operation] -= 1
+                self.coalesced[operation] -= 1
+                return await self.do(key, call)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
+            # Avoid "exception was never retrieved" when nobody else waited
+            if future.done() and not future.cancelled():
+                future.exception()
+
+    def stats(self) -> dict:
+        return {
+            "inflight": len(self._inflight),
+            "operations": {
+                operation: {
+                    "calls": calls,
+                    "coalesced": self.coalesced[operation],
+                    "coalesced_ratio": round(self.coalesced[operation] / calls, 4),
+                }
+                for operation, calls in sorted(self.calls.items())
+                if calls
+            },
+        }
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,227 @@
+"""Per-user in-memory prefix index for contact typeahead.
+
+Each user's index is a sorted list of `(key, contact_id)` pairs over the
+lowercased first name, last name, "first last" and email, searched with
+`bisect`. Indexes are built lazily on a user's first typeahead request, kept
+current by the `crud.contact` write paths, and evicted least-recently-used
+once all indexes together exceed `TYPEAHEAD_MEMORY_BUDGET_MB`.
+
+Indexes are per worker process: writes handled by another worker are picked
+up when the index expires after `TYPEAHEAD_TTL_SECONDS`.
+"""
+
+import asyncio
+import sys
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Awaitable, Callable, Iterable, NamedTuple, Optional
+
+from app.constants import TYPEAHEAD_MEMORY_BUDGET_MB, TYPEAHEAD_TTL_SECONDS
+
+# Rough per-entry overhead of the list slot + tuple + int, in bytes
+_ENTRY_OVERHEAD = 8 + 56 + 28
+_RECORD_OVERHEAD = 8 + 72 + 28 + 100  # dict slot + record tuple + id + dict growth
+
+
+class Suggestion(NamedTuple):
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+
+
+def _index_keys(s: Suggestion) -> set[str]:
+    first, last = s.first_name.lower(), s.last_name.lower()
+    return {first, last, f"{first} {last}", s.email.lower()}
+
+
+def _record_size(s: Suggestion) -> int:
+    keys = _index_keys(s)
+    return (
+        _RECORD_OVERHEAD
+        + sys.getsizeof(s.first_name)
+        + sys.getsizeof(s.last_name)
+        + sys.getsizeof(s.email)
+        + sum(sys.getsizeof(k) + _ENTRY_OVERHEAD for k in keys)
+    )
+
+
+class PrefixIndex:
+    """Sorted-array prefix index over one user's contacts."""
+
+    __slots__ = ("keys", "records", "nbytes", "built_at")
+
+    def __init__(self, suggestions: Iterable[Suggestion] = ()):
+        self.records: dict[int, Suggestion] = {}
+        keys: list[tuple[str, int]] = []
+        self.nbytes = 0
+        for s in suggestions:
+            self.records[s.id] = s
+            keys.extend((k, s.id) for k in _index_keys(s))
+            self.nbytes += _record_size(s)
+        keys.sort()
+        self.keys = keys
+        self.built_at = time.monotonic()
+
+    def add(self, s: Suggestion) -> int:
+        """Insert or replace a contact; returns the change in `nbytes`."""
+        delta = self.remove(s.id)
+        for key in _index_keys(s):
+            insort(self.keys, (key, s.id))
+        self.records[s.id] = s
+        size = _record_size(s)
+        self.nbytes += size
+        return delta + size
+
+    def remove(self, contact_id: int) -> int:
+        """Drop a contact if present; returns the change in `nbytes`."""
+        s = self.records.pop(contact_id, None)
+        if s is None:
+            return 0
+        for key in _index_keys(s):
+            i = bisect_left(self.keys, (key, contact_id))
+            if i < len(self.keys) and self.keys[i] == (key, contact_id):
+                del self.keys[i]
+        size = _record_size(s)
+        self.nbytes -= size
+        return -size
+
+    def search(self, prefix: str, limit: int) -> list[Suggestion]:
+        """Contacts with any key starting with `prefix`, in key order."""
+        prefix = prefix.lower()
+        found: dict[int, Suggestion] = {}
+        keys = self.keys
+        i = bisect_left(keys, (prefix,))
+        while i < len(keys) and len(found) < limit:
+            key, contact_id = keys[i]
+            if not key.startswith(prefix):
+                break
+            if contact_id not in found:
+                found[contact_id] = self.records[contact_id]
+            i += 1
+        return list(found.values())
+
+
+class TypeaheadCache:
+    """LRU of per-user `PrefixIndex` objects under a global memory budget."""
+
+    def __init__(self, budget_bytes: int, ttl_seconds: float):
+        self.budget_bytes = budget_bytes
+        self.ttl_seconds = ttl_seconds
+        self.nbytes = 0
+        self._indexes: OrderedDict[int, PrefixIndex] = OrderedDict()
+        # user_id -> in-flight build; writes during a build mark it stale
+        self._building: dict[int, asyncio.Future] = {}
+        self._stale_builds: set[int] = set()
+        self.hits = 0
+        self.builds = 0
+        self.evictions = 0
+
+    def get(self, user_id: int) -> Optional[PrefixIndex]:
+        index = self._indexes.get(user_id)
+        if index is None:
+            return None
+        if time.monotonic() - index.built_at > self.ttl_seconds:
+            self.discard(user_id)
+            return None
+        self._indexes.move_to_end(user_id)
+        return index
+
+    async def get_or_build(
+        self, user_id: int, load: Callable[[], Awaitable[list[Suggestion]]]
+    ) -> PrefixIndex:
+        """Return the user's index, building it with `load` on a miss.
+
+        Concurrent misses for the same user share a single build. If the
+        build is cancelled (its client went away), waiting callers retry.
+        """
+        while True:
+            index = self.get(user_id)
+            if index is not None:
+                self.hits += 1
+                return index
+
+            pending = self._building.get(user_id)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                # The leader was cancelled, not us: build it ourselves
+
+        future = asyncio.get_running_loop().create_future()
+        self._building[user_id] = future
+        try:
+            index = PrefixIndex(await load())
+            self.builds += 1
+            if user_id not in self._stale_builds:
+                self._put(user_id, index)
+            future.set_result(index)
+            return index
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._building[user_id]
+            self._stale_builds.discard(user_id)
+            # Avoid "exception was never retrieved" when nobody else waited
+            if future.done() and not future.cancelled():
+                future.exception()
+
+    def _put(self, user_id: int, index: PrefixIndex) -> None:
+        self.discard(user_id)
+        if index.nbytes > self.budget_bytes:
+            return  # larger than the whole budget: serve it once, don't keep it
+        self._indexes[user_id] = index
+        self.nbytes += index.nbytes
+        self._evict()
+
+    def _evict(self) -> None:
+        while self.nbytes > self.budget_bytes and self._indexes:
+            _user_id, index = self._indexes.popitem(last=False)
+            self.nbytes -= index.nbytes
+            self.evictions += 1
+
+    def discard(self, user_id: int) -> None:
+        index = self._indexes.pop(user_id, None)
+        if index is not None:
+            self.nbytes -= index.nbytes
+
+    def on_upsert(self, user_id: int, suggestion: Suggestion) -> None:
+        """Apply a created/updated contact to the owner's index, if cached."""
+        if user_id in self._building:
+            self._stale_builds.add(user_id)
+        index = self._indexes.get(user_id)
+        if index is not None:
+            self.nbytes += index.add(suggestion)
+            self._evict()
+
+    def on_delete(self, user_id: int, contact_id: int) -> None:
+        """Remove a deleted contact from the owner's index, if cached."""
+        if user_id in self._building:
+            self._stale_builds.add(user_id)
+        index = self._indexes.get(user_id)
+        if index is not None:
+            self.nbytes += index.remove(contact_id)
+
+    def stats(self) -> dict:
+        return {
+            "users": len(self._indexes),
+            "bytes": self.nbytes,
+            "budget_bytes": self.budget_bytes,
+            "hits": self.hits,
+            "builds": self.builds,
+            "evictions": self.evictions,
+        }
+
+
+typeahead_cache = TypeaheadCache(
+    budget_bytes=TYPEAHEAD_MEMORY_BUDGET_MB * 1024 * 1024,
+    ttl_seconds=TYPEAHEAD_TTL_SECONDS,
+)
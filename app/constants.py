@@ -13,6 +13,9 @@ EMAIL_MAX_LENGTH = 100
 PHONE_NUMBER_MAX_LENGTH = 20
 ADDITIONAL_DATA_MAX_LENGTH = 255
 
+# Maximum numbers per batch reverse phone lookup
+PHONE_LOOKUP_MAX_BATCH = 1000
+
 # Authentication and JWT configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 JWT_TOKEN_ALGORITHM = os.getenv("JWT_TOKEN_ALGORITHM", "HS256")
@@ -20,6 +23,15 @@ ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30")
 REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7"))
 OAUTH2_SCHEME_TOKEN_URL = os.getenv("OAUTH2_SCHEME_TOKEN_URL", "/api/v1/auth/login")
 
+# Password hashing policy: "bcrypt" or "argon2id" (needs argon2-cffi). Pick the
+# costs with `python -m app.scripts.calibrate_password_hash`; stored hashes
+# made under another policy are upgraded on the user's next login.
+PASSWORD_HASH_SCHEME = os.getenv("PASSWORD_HASH_SCHEME", "bcrypt")
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST_KIB = int(os.getenv("ARGON2_MEMORY_COST_KIB", "65536"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+
 # Email configuration
 SMTP_LOCAL_DEBUG = os.getenv("SMTP_LOCAL_DEBUG", "False").lower() in ("true", "1", "yes")
 SMTP_HOST = os.getenv("SMTP_HOST", "")
@@ -39,3 +51,100 @@ CLOUDINARY_API_SECRET = os.getenv("CLOUDINARY_API_SECRET", "")
 # Avatar upload configuration
 AVATAR_MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB in bytes
 AVATAR_ALLOWED_TYPES = {"image/jpeg", "image/png"}
+
+# Database connection pool configuration (applies to the primary and each replica)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+# SQLAlchemy compiled-statement cache entries per engine
+DB_QUERY_CACHE_SIZE = int(os.getenv("DB_QUERY_CACHE_SIZE", "500"))
+# asyncpg prepared statements kept per connection (0 disables)
+ASYNCPG_STATEMENT_CACHE_SIZE = int(os.getenv("ASYNCPG_STATEMENT_CACHE_SIZE", "100"))
+# statement_timeout (ms) for each transaction of an API request's session; 0
+# disables. Routes that can scan many rows override it (see get_session).
+DB_STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "10000"))
+CONTACT_SEARCH_STATEMENT_TIMEOUT_MS = int(os.getenv("CONTACT_SEARCH_STATEMENT_TIMEOUT_MS", "3000"))
+DUPLICATES_STATEMENT_TIMEOUT_MS = int(os.getenv("DUPLICATES_STATEMENT_TIMEOUT_MS", "15000"))
+
+# Startup warm-up: connections to pre-open per engine (capped at DB_POOL_SIZE)
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "True").lower() in ("true", "1", "yes")
+WARMUP_POOL_CONNECTIONS = int(os.getenv("WARMUP_POOL_CONNECTIONS", str(DB_POOL_SIZE)))
+
+# Read replica configuration
+# Comma-separated list of replica URLs; leave empty to send all traffic to the primary
+SQLALCHEMY_REPLICA_URLS = [
+    url.strip()
+    for url in os.getenv("SQLALCHEMY_REPLICA_URLS", "").split(",")
+    if url.strip()
+]
+REPLICA_HEALTH_CHECK_INTERVAL = float(os.getenv("REPLICA_HEALTH_CHECK_INTERVAL", "10"))
+REPLICA_HEALTH_CHECK_TIMEOUT = float(os.getenv("REPLICA_HEALTH_CHECK_TIMEOUT", "2"))
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+# After a user's own write, their reads stay on the primary for this many seconds
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+# Typeahead: per-user in-memory prefix indexes (per worker)
+TYPEAHEAD_MEMORY_BUDGET_MB = int(os.getenv("TYPEAHEAD_MEMORY_BUDGET_MB", "64"))
+TYPEAHEAD_TTL_SECONDS = float(os.getenv("TYPEAHEAD_TTL_SECONDS", "60"))
+TYPEAHEAD_MAX_RESULTS = 50
+
+# Delta sync (GET /api/v1/contacts/changes)
+SYNC_MAX_PAGE_SIZE = 1000
+# Changes younger than this aren't returned yet, so a transaction that commits
+# slightly out of timestamp order can't slip behind a client's cursor
+SYNC_SETTLE_SECONDS = float(os.getenv("SYNC_SETTLE_SECONDS", "2"))
+# Tombstones (delete records) are pruned after this; older cursors need a full sync
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv("SYNC_TOMBSTONE_RETENTION_DAYS", "30"))
+
+# Live change feed (GET /api/v1/contacts/stream); one LISTEN connection per worker
+CHANGE_FEED_QUEUE_SIZE = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "256"))
+CHANGE_FEED_HEARTBEAT_SECONDS = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+CHANGE_FEED_CONNECT_TIMEOUT = 5.0
+
+# List responses: compress bodies at least this large (see app.api.wire)
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+GZIP_COMPRESS_LEVEL = 6
+# Brotli 4-5 compresses better than gzip -6 at similar speed; 11 is for static assets
+BROTLI_QUALITY = 5
+
+# Login throttling (see app.services.login_throttle). After the free attempts,
+# each failure blocks the account/IP for BASE * 2^n seconds, up to MAX.
+LOGIN_THROTTLE_ACCOUNT_FREE_ATTEMPTS = int(os.getenv("LOGIN_THROTTLE_ACCOUNT_FREE_ATTEMPTS", "5"))
+# Higher: many users can share one address (NAT, offices)
+LOGIN_THROTTLE_IP_FREE_ATTEMPTS = int(os.getenv("LOGIN_THROTTLE_IP_FREE_ATTEMPTS", "20"))
+LOGIN_THROTTLE_BASE_DELAY_SECONDS = float(os.getenv("LOGIN_THROTTLE_BASE_DELAY_SECONDS", "1"))
+LOGIN_THROTTLE_MAX_DELAY_SECONDS = float(os.getenv("LOGIN_THROTTLE_MAX_DELAY_SECONDS", "900"))
+# Failures are forgotten after this long without a new one
+LOGIN_THROTTLE_WINDOW_SECONDS = float(os.getenv("LOGIN_THROTTLE_WINDOW_SECONDS", "900"))
+
+# Idempotency-Key on POSTs (see app.api.idempotency)
+IDEMPOTENCY_KEY_MAX_LENGTH = 255
+# How long a stored response is replayed
+IDEMPOTENCY_TTL_HOURS = int(os.getenv("IDEMPOTENCY_TTL_HOURS", "24"))
+# A request still running after this is presumed dead; its key can be retried
+IDEMPOTENCY_LOCK_SECONDS = float(os.getenv("IDEMPOTENCY_LOCK_SECONDS", "60"))
+
+# Admission control (see app.middleware.admission), per worker. By default one
+# running request per pooled DB connection.
+ADMISSION_MAX_CONCURRENCY = int(
+    os.getenv("ADMISSION_MAX_CONCURRENCY", str(DB_POOL_SIZE + DB_MAX_OVERFLOW))
+)
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))
+# Longest wait for a slot before answering 503 (doubled for auth requests)
+ADMISSION_MAX_WAIT_SECONDS = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "2"))
+ADMISSION_BULK_MAX_CONCURRENCY = int(
+    os.getenv("ADMISSION_BULK_MAX_CONCURRENCY", str(max(1, ADMISSION_MAX_CONCURRENCY // 4)))
+)
+
+# Per-request profiling (see app.middleware.profiling); off unless a token is set
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN", "")
+PROFILING_DIR = os.getenv("PROFILING_DIR", "profiles")
+PROFILING_INTERVAL_SECONDS = float(os.getenv("PROFILING_INTERVAL_SECONDS", "0.001"))
+
+# In-process tracing (see app.tracing); off unless an output file is set
+TRACING_FILE = os.getenv("TRACING_FILE", "")
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "contacts-api")
+# Share of requests traced; a `traceparent` header's sampled flag overrides it
+TRACING_SAMPLE_RATIO = float(os.getenv("TRACING_SAMPLE_RATIO", "0.01"))
+# Upper bound on traces started per second per worker, whatever the ratio
+TRACING_MAX_TRACES_PER_SECOND = float(os.getenv("TRACING_MAX_TRACES_PER_SECOND", "10"))
+TRACING_MAX_SPANS_PER_TRACE = int(os.getenv("TRACING_MAX_SPANS_PER_TRACE", "1000"))
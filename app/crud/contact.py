@@ -1,12 +1,32 @@
-from typing import List, Optional
+import re
+from typing import AsyncIterator, List, Optional
 
-from datetime import date
+from datetime import date, datetime, timedelta
 
-from sqlalchemy import select
-from sqlalchemy.sql import and_
+from sqlalchemy import DateTime, Row, case, delete, func, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.sql import and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.contact import Contact as ContactModel
+from app.cache.typeahead import Suggestion, typeahead_cache
+from app.constants import ADDITIONAL_DATA_MAX_LENGTH, SYNC_SETTLE_SECONDS
+from app.db.statements import (
+    CONTACT_BY_EMAIL,
+    CONTACT_BY_ID,
+    CONTACT_READ_COLUMNS,
+    CONTACTS_BY_PHONES,
+    contact_by_id_statement,
+    contact_read_columns,
+    contacts_page_statement,
+)
+from app.models.contact import (
+    Contact as ContactModel,
+    ContactTombstone,
+    birthday_month_day,
+)
+from app.models.user import User
+from app.realtime.change_feed import publish_contact_events
+from app.validators import normalize_phone
 
 
 async def create_contact(
@@ -30,8 +50,11 @@ async def create_contact(
         additional_data=additional_data,
     )
     db.add(contact)
+    await db.flush()
+    await publish_contact_events(db, user_id, [_contact_event("created", contact)])
     await db.commit()
     await db.refresh(contact)
+    typeahead_cache.on_upsert(user_id, _suggestion(contact))
     return contact
 
 
@@ -39,24 +62,38 @@ async def get_contact_by_id(
     db: AsyncSession, contact_id: int, user_id: int
 ) -> Optional[ContactModel]:
     result = await db.execute(
-        select(ContactModel).where(
-            and_(ContactModel.id == contact_id, ContactModel.user_id == user_id)
-        )
+        CONTACT_BY_ID, {"contact_id": contact_id, "user_id": user_id}
     )
     return result.scalar_one_or_none()
 
 
+async def get_contact_fields_by_id(
+    db: AsyncSession, contact_id: int, user_id: int, fields: tuple[str, ...]
+) -> Optional[Row]:
+    """Like `get_contact_by_id`, but read only `fields` into a read-only row."""
+    result = await db.execute(
+        contact_by_id_statement(fields), {"contact_id": contact_id, "user_id": user_id}
+    )
+    return result.one_or_none()
+
+
 async def get_contacts(
-    db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100
-) -> List[ContactModel]:
+    db: AsyncSession,
+    user_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[tuple[str, ...]] = None,
+) -> List[Row]:
+    """Return a page of the user's contacts as read-only rows.
+
+    Rows carry only the `ContactRead` columns (or just `fields`) and are not
+    tracked by the session; load the model with `get_contact_by_id` to modify
+    a contact.
+    """
     result = await db.execute(
-        select(ContactModel)
-        .where(ContactModel.user_id == user_id)
-        .order_by(ContactModel.id.asc())
-        .offset(skip)
-        .limit(limit)
+        contacts_page_statement(fields), {"user_id": user_id, "skip": skip, "limit": limit}
     )
-    return result.scalars().all()
+    return result.all()
 
 
 async def search_contacts(
@@ -68,11 +105,13 @@ async def search_contacts(
     email: Optional[str] = None,
     skip: int = 0,
     limit: int = 100,
-) -> List[ContactModel]:
+    fields: Optional[tuple[str, ...]] = None,
+) -> List[Row]:
     """Search contacts by provided fields (case-insensitive, partial match).
 
     All provided filters are combined with AND. If no filters provided, returns
-    the normal paginated list.
+    the normal paginated list. Like `get_contacts`, returns read-only rows of
+    the `ContactRead` columns or just `fields`.
     """
     clauses = [ContactModel.user_id == user_id]
     if first_name:
@@ -83,43 +122,155 @@ async def search_contacts(
         clauses.append(ContactModel.email.ilike(f"%{email}%"))
 
     if len(clauses) == 1:  # Only user_id filter
-        return await get_contacts(db, user_id=user_id, skip=skip, limit=limit)
+        return await get_contacts(db, user_id=user_id, skip=skip, limit=limit, fields=fields)
 
     stmt = (
-        select(ContactModel)
+        select(*contact_read_columns(fields))
         .where(and_(*clauses))
         .order_by(ContactModel.id.asc())
         .offset(skip)
         .limit(limit)
     )
     result = await db.execute(stmt)
-    return result.scalars().all()
+    return result.all()
+
+
+# Shortest digit run treated as a phone number prefix
+PHONE_PREFIX_MIN_DIGITS = 3
+# A query that looks like (part of) a phone number: "+380 50-12"
+_PHONE_QUERY_RE = re.compile(r"[\d\s+()\-.]+")
+
+
+def _prefix_tsquery(q: str) -> Optional[str]:
+    """Turn free text into a tsquery where every word is a prefix match.
+
+    "jo smi" -> "'jo':* & 'smi':*". Only word characters are kept, so the
+    result is always valid tsquery syntax.
+    """
+    terms = re.findall(r"\w+", q.lower())
+    if not terms:
+        return None
+    return " & ".join(f"'{term}':*" for term in terms)
+
+
+async def full_text_search_contacts(
+    db: AsyncSession,
+    *,
+    user_id: int,
+    q: str,
+    skip: int = 0,
+    limit: int = 100,
+    fields: Optional[tuple[str, ...]] = None,
+) -> List[Row]:
+    """Search all contact fields with one ranked, indexed query.
+
+    Every word in `q` must prefix-match a word in some text field (names,
+    email and its parts, phone number, additional data) via the GIN-indexed
+    `search_vector`. A phone-like `q` with `PHONE_PREFIX_MIN_DIGITS` digits or
+    more also matches normalized phone numbers starting with those digits. Results are ordered by
+    rank, phone prefix matches first. Rows carry the `ContactRead` columns or
+    just `fields`.
+    """
+    tsquery_text = _prefix_tsquery(q)
+    if tsquery_text is None:
+        return []
+    tsquery = func.to_tsquery(literal("simple").cast(REGCONFIG), tsquery_text)
+    matches = [ContactModel.search_vector.op("@@")(tsquery)]
+    rank = func.ts_rank(ContactModel.search_vector, tsquery)
+
+    digits = normalize_phone(q)
+    if _PHONE_QUERY_RE.fullmatch(q.strip()) and len(digits) >= PHONE_PREFIX_MIN_DIGITS:
+        phone_match = ContactModel.normalized_phone.startswith(digits)
+        matches.append(phone_match)
+        rank = rank + case((phone_match, 1), else_=0)
+
+    stmt = (
+        select(*contact_read_columns(fields))
+        .where(ContactModel.user_id == user_id, or_(*matches))
+        .order_by(rank.desc(), ContactModel.id.asc())
+        .offset(skip)
+        .limit(limit)
+    )
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def get_contacts_by_phones(
+    db: AsyncSession, user_id: int, phones: List[str]
+) -> List[Row]:
+    """Reverse lookup: the user's contacts whose number matches any of `phones`.
+
+    Numbers are normalized first, so any formatting matches. One query, one
+    index probe per distinct number. Rows include `normalized_phone`.
+    """
+    normalized = sorted({n for n in map(normalize_phone, phones) if n})
+    if not normalized:
+        return []
+    result = await db.execute(
+        CONTACTS_BY_PHONES, {"user_id": user_id, "phones": normalized}
+    )
+    return result.all()
+
+
+def next_birthday(birthday: date, today: date) -> date:
+    """Next occurrence of `birthday` on or after `today` (Feb 29 -> Feb 28)."""
+    for year in (today.year, today.year + 1):
+        try:
+            candidate = birthday.replace(year=year)
+        except ValueError:  # Feb 29 in a non-leap year
+            candidate = date(year, 2, 28)
+        if candidate >= today:
+            return candidate
+    return candidate
+
+
+def birthday_window_clause(today: date, days: int):
+    """WHERE clause for birthdays falling within `days` days from `today`.
+
+    Compares month/day only, so it can use `ix_contacts_birthday_md`. Windows
+    that cross New Year become two ranges.
+    """
+    if days >= 365:
+        return ContactModel.birthday.is_not(None)
+    md = birthday_month_day(ContactModel.birthday)
+    end = today + timedelta(days=days)
+    start_md = today.month * 100 + today.day
+    end_md = end.month * 100 + end.day
+    if start_md <= end_md:
+        return md.between(start_md, end_md)
+    return or_(md >= start_md, md <= end_md)
 
 
-async def get_upcoming_birthdays(db: AsyncSession, user_id: int, days: int = 7) -> List[ContactModel]:
+async def get_upcoming_birthdays(
+    db: AsyncSession,
+    user_id: int,
+    days: int = 7,
+    fields: Optional[tuple[str, ...]] = None,
+) -> List[Row]:
     """Return contacts whose birthdays occur within the next `days` days.
 
-    This performs a DB query to fetch contacts with non-null birthdays and
-    filters them in Python by computing the next occurrence of their birthday
-    (handles year wrap). Results are ordered by how soon the birthday occurs.
+    The month/day window is filtered in the database; the next occurrence of
+    each birthday is computed in Python to order the results by how soon the
+    birthday occurs (handles year wrap). With `fields`, rows carry those
+    columns plus `birthday`.
     """
+    today = date.today()
+    columns = contact_read_columns(fields)
+    if fields is not None and "birthday" not in fields:
+        columns += (ContactModel.birthday,)
     result = await db.execute(
-        select(ContactModel).where(
-            and_(ContactModel.user_id == user_id, ContactModel.birthday.is_not(None))
+        select(*columns).where(
+            and_(
+                ContactModel.user_id == user_id,
+                ContactModel.birthday.is_not(None),
+                birthday_window_clause(today, days),
+            )
         )
     )
-    contacts = result.scalars().all()
-    today = date.today()
-    upcoming: List[tuple[int, ContactModel]] = []
+    contacts = result.all()
+    upcoming: List[tuple[int, Row]] = []
     for c in contacts:
-        bd = c.birthday
-        if not bd:
-            continue
-        # Next occurrence of birthday (in current year or next year)
-        next_bd = bd.replace(year=today.year)
-        if next_bd < today:
-            next_bd = bd.replace(year=today.year + 1)
-        delta = (next_bd - today).days
+        delta = (next_birthday(c.birthday, today) - today).days
         if 0 <= delta <= days:
             upcoming.append((delta, c))
 
@@ -127,12 +278,40 @@ async def get_upcoming_birthdays(db: AsyncSession, user_id: int, days: int = 7)
     return [c for _d, c in upcoming]
 
 
-async def get_contact_by_email(db: AsyncSession, email: str, user_id: int) -> Optional[ContactModel]:
-    result = await db.execute(
-        select(ContactModel).where(
-            and_(ContactModel.email == email, ContactModel.user_id == user_id)
+async def stream_upcoming_birthdays(
+    db: AsyncSession, today: date, days: int = 7, batch_size: int = 10_000
+) -> AsyncIterator[List[Row]]:
+    """Stream birthdays in the window across all active users, in batches.
+
+    One set-based query over `ix_contacts_birthday_md`, read through a
+    server-side cursor. Rows are ordered by owner, so each owner's contacts
+    are contiguous (possibly split across batches). Each row has `user_id`,
+    `owner_email`, `first_name`, `last_name` and `birthday`.
+    """
+    stmt = (
+        select(
+            ContactModel.user_id,
+            User.email.label("owner_email"),
+            ContactModel.first_name,
+            ContactModel.last_name,
+            ContactModel.birthday,
+        )
+        .join(User, User.id == ContactModel.user_id)
+        .where(
+            ContactModel.birthday.is_not(None),
+            birthday_window_clause(today, days),
+            User.is_active.is_(True),
         )
+        .order_by(ContactModel.user_id)
+        .execution_options(yield_per=batch_size)
     )
+    result = await db.stream(stmt)
+    async for batch in result.partitions():
+        yield batch
+
+
+async def get_contact_by_email(db: AsyncSession, email: str, user_id: int) -> Optional[ContactModel]:
+    result = await db.execute(CONTACT_BY_EMAIL, {"email": email, "user_id": user_id})
     return result.scalars().first()
 
 
@@ -143,11 +322,207 @@ async def update_contact(
         if value is not None and hasattr(contact, key):
             setattr(contact, key, value)
     db.add(contact)
+    await db.flush()
+    await publish_contact_events(db, contact.user_id, [_contact_event("updated", contact)])
     await db.commit()
     await db.refresh(contact)
+    typeahead_cache.on_upsert(contact.user_id, _suggestion(contact))
     return contact
 
 
 async def delete_contact(db: AsyncSession, contact: ContactModel) -> None:
+    user_id, contact_id = contact.user_id, contact.id
     await db.delete(contact)
+    db.add(ContactTombstone(contact_id=contact_id, user_id=user_id))
+    await db.flush()
+    await publish_contact_events(db, user_id, [_deleted_event(contact_id)])
+    await db.commit()
+    typeahead_cache.on_delete(user_id, contact_id)
+
+
+def _after_cursor(column, id_column, since: tuple[datetime, int]):
+    # Row comparison: Postgres walks the (user_id, <ts>, id) index from the cursor
+    since_at, since_id = since
+    return tuple_(column, id_column) > tuple_(
+        literal(since_at, DateTime(timezone=True)), literal(since_id)
+    )
+
+
+def _sync_horizon():
+    return func.now() - timedelta(seconds=SYNC_SETTLE_SECONDS)
+
+
+def _settled(column):
+    """Only rows written at least `SYNC_SETTLE_SECONDS` ago (see constants)."""
+    return column < _sync_horizon()
+
+
+async def get_sync_horizon(db: AsyncSession) -> datetime:
+    """The settle horizon the change queries of this transaction use.
+
+    `now()` is fixed per transaction, so once every change before the horizon
+    has been read, a client can resume from here without missing any.
+    """
+    result = await db.execute(select(_sync_horizon()))
+    return result.scalar_one()
+
+
+async def get_contact_changes(
+    db: AsyncSession,
+    user_id: int,
+    since: Optional[tuple[datetime, int]] = None,
+    limit: int = 500,
+) -> List[Row]:
+    """Contacts created or updated after the `(updated_at, id)` cursor.
+
+    Returns `ContactRead` rows plus `updated_at`, oldest change first. With
+    no cursor, returns every contact (a full sync) in the same order.
+    """
+    stmt = select(*CONTACT_READ_COLUMNS, ContactModel.updated_at).where(
+        ContactModel.user_id == user_id, _settled(ContactModel.updated_at)
+    )
+    if since is not None:
+        stmt = stmt.where(_after_cursor(ContactModel.updated_at, ContactModel.id, since))
+    stmt = stmt.order_by(ContactModel.updated_at, ContactModel.id).limit(limit)
+    result = await db.execute(stmt)
+    return result.all()
+
+
+async def get_contact_deletions(
+    db: AsyncSession, user_id: int, since: tuple[datetime, int], limit: int = 500
+) -> List[Row]:
+    """Tombstones (`contact_id`, `deleted_at`) after the cursor, oldest first."""
+    result = await db.execute(
+        select(ContactTombstone.contact_id, ContactTombstone.deleted_at)
+        .where(
+            ContactTombstone.user_id == user_id,
+            _settled(ContactTombstone.deleted_at),
+            _after_cursor(ContactTombstone.deleted_at, ContactTombstone.contact_id, since),
+        )
+        .order_by(ContactTombstone.deleted_at, ContactTombstone.contact_id)
+        .limit(limit)
+    )
+    return result.all()
+
+
+async def prune_tombstones(db: AsyncSession, older_than: timedelta) -> int:
+    """Delete tombstones older than `older_than`; returns how many were removed."""
+    result = await db.execute(
+        delete(ContactTombstone).where(
+            ContactTombstone.deleted_at < func.now() - older_than
+        )
+    )
+    await db.commit()
+    return result.rowcount
+
+
+def _contact_event(event_type: str, contact: ContactModel) -> dict:
+    """Change-feed event carrying the contact's `ContactRead` fields."""
+    return {
+        "type": event_type,
+        "data": {column.key: getattr(contact, column.key) for column in CONTACT_READ_COLUMNS},
+    }
+
+
+def _deleted_event(contact_id: int) -> dict:
+    return {"type": "deleted", "data": {"id": contact_id}}
+
+
+def _suggestion(contact) -> Suggestion:
+    return Suggestion(contact.id, contact.first_name, contact.last_name, contact.email)
+
+
+async def get_typeahead_suggestions(db: AsyncSession, user_id: int) -> List[Suggestion]:
+    """Load every contact of a user as typeahead records (for index builds)."""
+    result = await db.execute(
+        select(
+            ContactModel.id,
+            ContactModel.first_name,
+            ContactModel.last_name,
+            ContactModel.email,
+        ).where(ContactModel.user_id == user_id)
+    )
+    return [Suggestion(*row) for row in result]
+
+
+_DEDUPE_COLUMNS = (
+    ContactModel.id,
+    ContactModel.first_name,
+    ContactModel.last_name,
+    ContactModel.email,
+    ContactModel.phone_number,
+)
+
+
+async def get_contact_rows_for_dedupe(db: AsyncSession, user_id: int) -> List[Row]:
+    """Load the fields duplicate detection needs for one user's contacts."""
+    result = await db.execute(
+        select(*_DEDUPE_COLUMNS).where(ContactModel.user_id == user_id)
+    )
+    return result.all()
+
+
+async def stream_contact_rows_for_dedupe(
+    db: AsyncSession, batch_size: int = 10_000
+) -> AsyncIterator[List[Row]]:
+    """Stream dedupe rows for all users, ordered by owner (see batch job)."""
+    stmt = (
+        select(ContactModel.user_id, *_DEDUPE_COLUMNS)
+        .order_by(ContactModel.user_id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await db.stream(stmt)
+    async for batch in result.partitions():
+        yield batch
+
+
+async def merge_contacts(
+    db: AsyncSession, *, user_id: int, keep_id: int, merge_ids: List[int]
+) -> ContactModel:
+    """Merge `merge_ids` into `keep_id` and delete them, in one transaction.
+
+    Fields that are empty on the kept contact are filled from the merged ones
+    (lowest id first); `additional_data` is concatenated while it fits.
+    Rows are locked for the duration of the merge.
+
+    Raises:
+        ValueError: "contacts_not_found" if any id isn't one of the user's contacts.
+    """
+    ids = [keep_id, *merge_ids]
+    result = await db.execute(
+        select(ContactModel)
+        .where(ContactModel.user_id == user_id, ContactModel.id.in_(ids))
+        .order_by(ContactModel.id.asc())
+        .with_for_update()
+    )
+    contacts = {c.id: c for c in result.scalars().all()}
+    if len(contacts) != len(set(ids)):
+        await db.rollback()
+        raise ValueError("contacts_not_found")
+
+    keep = contacts.pop(keep_id)
+    for other in contacts.values():
+        if keep.birthday is None and other.birthday is not None:
+            keep.birthday = other.birthday
+        if other.additional_data and other.additional_data != keep.additional_data:
+            if not keep.additional_data:
+                keep.additional_data = other.additional_data
+            else:
+                combined = f"{keep.additional_data}; {other.additional_data}"
+                if len(combined) <= ADDITIONAL_DATA_MAX_LENGTH:
+                    keep.additional_data = combined
+        await db.delete(other)
+        db.add(ContactTombstone(contact_id=other.id, user_id=user_id))
+
+    await db.flush()
+    await publish_contact_events(
+        db,
+        user_id,
+        [*(_deleted_event(contact_id) for contact_id in contacts), _contact_event("updated", keep)],
+    )
     await db.commit()
+    await db.refresh(keep)
+    for contact_id in contacts:
+        typeahead_cache.on_delete(user_id, contact_id)
+    typeahead_cache.on_upsert(user_id, _suggestion(keep))
+    return keep
@@ -0,0 +1,120 @@
+"""CRUD operations for IdempotencyKey records."""
+
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.idempotency_key import IdempotencyKey
+
+
+def _this_key(user_id: int, key_hash: bytes):
+    return (IdempotencyKey.user_id == user_id, IdempotencyKey.key_hash == key_hash)
+
+
+async def claim_idempotency_key(
+    db: AsyncSession,
+    user_id: int,
+    key_hash: bytes,
+    fingerprint: bytes,
+    lock_for: timedelta,
+) -> bool:
+    """
+    Mark a key as in progress, unless a live record for it exists.
+
+    An expired record (an old response, or a claim whose request died) is
+    taken over.
+
+    Args:
+        db: Database session
+        user_id: Owner of the key
+        key_hash: SHA-256 of the Idempotency-Key header
+        fingerprint: SHA-256 of the request
+        lock_for: How long the claim holds if the request never completes
+
+    Returns:
+        bool: True if this request now owns the key
+    """
+    stmt = insert(IdempotencyKey).values(
+        user_id=user_id,
+        key_hash=key_hash,
+        fingerprint=fingerprint,
+        status_code=None,
+        response=None,
+        expires_at=func.now() + lock_for,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.user_id, IdempotencyKey.key_hash],
+        set_={
+            "fingerprint": stmt.excluded.fingerprint,
+            "status_code": None,
+            "response": None,
+            "expires_at": stmt.excluded.expires_at,
+        },
+        where=IdempotencyKey.expires_at <= func.now(),
+    ).returning(IdempotencyKey.user_id)
+    claimed = (await db.execute(stmt)).first() is not None
+    await db.commit()
+    return claimed
+
+
+async def get_idempotency_key(
+    db: AsyncSession, user_id: int, key_hash: bytes
+) -> Optional[Row]:
+    """
+    Retrieve the live record of a key.
+
+    Returns:
+        Optional[Row]: (fingerprint, status_code, response), or None if the
+        key is unknown or expired
+    """
+    result = await db.execute(
+        select(
+            IdempotencyKey.fingerprint,
+            IdempotencyKey.status_code,
+            IdempotencyKey.response,
+        ).where(*_this_key(user_id, key_hash), IdempotencyKey.expires_at > func.now())
+    )
+    return result.first()
+
+
+async def complete_idempotency_key(
+    db: AsyncSession,
+    user_id: int,
+    key_hash: bytes,
+    status_code: int,
+    response: bytes,
+    ttl: timedelta,
+) -> None:
+    """Store the response of a claimed key, to be replayed for `ttl`."""
+    await db.execute(
+        update(IdempotencyKey)
+        .where(*_this_key(user_id, key_hash))
+        .values(status_code=status_code, response=response, expires_at=func.now() + ttl)
+    )
+    await db.commit()
+
+
+async def release_idempotency_key(db: AsyncSession, user_id: int, key_hash: bytes) -> None:
+    """Drop an in-progress claim (the request failed), so a retry runs again."""
+    await db.execute(
+        delete(IdempotencyKey).where(
+            *_this_key(user_id, key_hash), IdempotencyKey.status_code.is_(None)
+        )
+    )
+    await db.commit()
+
+
+async def prune_idempotency_keys(db: AsyncSession) -> int:
+    """
+    Delete expired records.
+
+    Returns:
+        int: Number of records deleted
+    """
+    result = await db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at <= func.now()))
+    await db.commit()
+    return result.rowcount
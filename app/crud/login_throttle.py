@@ -0,0 +1,106 @@
+"""CRUD operations for LoginThrottle counters."""
+
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import case, delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.login_throttle import LoginThrottle
+
+# Cap on the backoff exponent; the delay is capped long before this anyway
+MAX_BACKOFF_EXPONENT = 30
+
+
+def _last_activity():
+    # A block counts as activity until it ends, so waiting out the longest
+    # block doesn't also reset the counter
+    return func.coalesce(LoginThrottle.blocked_until, LoginThrottle.updated_at)
+
+
+async def get_retry_after(db: AsyncSession, keys: list[str]) -> Optional[float]:
+    """
+    Return the seconds until the longest active block on `keys` ends.
+
+    Args:
+        db: Database session (on the primary: the table isn't replicated)
+        keys: Throttle keys to check
+
+    Returns:
+        Optional[float]: Seconds left, or None if none of the keys is blocked
+    """
+    remaining = func.extract("epoch", func.max(LoginThrottle.blocked_until) - func.now())
+    result = await db.execute(
+        select(remaining).where(
+            LoginThrottle.key.in_(keys),
+            LoginThrottle.blocked_until > func.now(),
+        )
+    )
+    seconds = result.scalar()
+    return float(seconds) if seconds is not None else None
+
+
+async def record_failure(
+    db: AsyncSession,
+    key: str,
+    free_attempts: int,
+    base_delay: float,
+    max_delay: float,
+    window: float,
+) -> None:
+    """
+    Count a failed login for `key` and block it once past `free_attempts`.
+
+    The n-th failure past the free ones blocks the key for
+    `base_delay * 2^(n-1)` seconds, capped at `max_delay`. Counters idle for
+    `window` seconds start over. Does not commit.
+
+    Args:
+        db: Database session
+        key: Throttle key
+        free_attempts: Failures allowed before blocking (at least 1)
+        base_delay: First block, in seconds
+        max_delay: Longest block, in seconds
+        window: Seconds of inactivity after which failures are forgotten
+    """
+    failures = case(
+        (_last_activity() < func.now() - timedelta(seconds=window), 1),
+        else_=LoginThrottle.failures + 1,
+    )
+    exponent = func.least(failures - free_attempts - 1, MAX_BACKOFF_EXPONENT)
+    delay = func.least(base_delay * func.power(2, exponent), max_delay)
+    blocked_until = case(
+        (failures > free_attempts, func.now() + literal(timedelta(seconds=1)) * delay),
+        else_=None,
+    )
+    stmt = insert(LoginThrottle).values(
+        key=key, failures=1, blocked_until=None, updated_at=func.now()
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[LoginThrottle.key],
+        set_={
+            "failures": failures,
+            "blocked_until": blocked_until,
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def clear(db: AsyncSession, key: str) -> None:
+    """Forget the failures counted for `key`. Does not commit."""
+    await db.execute(delete(LoginThrottle).where(LoginThrottle.key == key))
+
+
+async def prune(db: AsyncSession, window: float) -> int:
+    """
+    Delete counters idle for longer than `window` seconds. Does not commit.
+
+    Returns:
+        int: Number of counters deleted
+    """
+    result = await db.execute(
+        delete(LoginThrottle).where(_last_activity() < func.now() - timedelta(seconds=window))
+    )
+    return result.rowcount
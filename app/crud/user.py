@@ -2,9 +2,9 @@
 
 from typing import Optional
 
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.statements import USER_BY_EMAIL, USER_BY_ID
 from app.models.user import User
 
 
@@ -38,7 +38,7 @@ async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     Returns:
         Optional[User]: The user if found, None otherwise
     """
-    result = await db.execute(select(User).where(User.email == email))
+    result = await db.execute(USER_BY_EMAIL, {"email": email})
     return result.scalar_one_or_none()
 
 
@@ -53,7 +53,7 @@ async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
     Returns:
         Optional[User]: The user if found, None otherwise
     """
-    result = await db.execute(select(User).where(User.id == user_id))
+    result = await db.execute(USER_BY_ID, {"user_id": user_id})
     return result.scalar_one_or_none()
 
 
@@ -114,3 +114,21 @@ async def update_avatar(db: AsyncSession, user_id: int, avatar_url: str) -> Opti
         await db.commit()
         await db.refresh(user)
     return user
+
+
+async def update_password_hash(db: AsyncSession, user: User, hashed_password: str) -> User:
+    """
+    Replace a user's stored password hash.
+    
+    Args:
+        db: Database session
+        user: User instance (already loaded, e.g. by login)
+        hashed_password: New hash of the same password
+        
+    Returns:
+        User: The updated user
+    """
+    user.hashed_password = hashed_password
+    await db.commit()
+    await db.refresh(user)
+    return user
@@ -2,8 +2,19 @@ import os
 import logging
 from typing import AsyncGenerator
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from app.constants import (
+    ASYNCPG_STATEMENT_CACHE_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_SIZE,
+    DB_QUERY_CACHE_SIZE,
+    DB_STATEMENT_TIMEOUT_MS,
+    SQLALCHEMY_REPLICA_URLS,
+)
+from app.db.routing import STATEMENT_TIMEOUT_MS, USE_PRIMARY, ReplicaSet, RoutingSession
+from app.tracing.db import TracedAsyncSession
 from app.utils import _str_to_bool
 
 # Read the SQLALCHEMY_DATABASE_URL from environment (use .env in docker-compose)
@@ -12,11 +23,15 @@ DEFAULT_DB_URL = (
 )
 raw_db_url = os.environ.get("SQLALCHEMY_DATABASE_URL", DEFAULT_DB_URL)
 
-# If the configured URL uses psycopg2, convert it to asyncpg for async engine
-if "psycopg2" in raw_db_url:
-    async_db_url = raw_db_url.replace("psycopg2", "asyncpg")
-else:
-    async_db_url = raw_db_url
+
+def _to_async_url(url: str) -> str:
+    # If the configured URL uses psycopg2, convert it to asyncpg for async engine
+    if "psycopg2" in url:
+        return url.replace("psycopg2", "asyncpg")
+    return url
+
+
+async_db_url = _to_async_url(raw_db_url)
 
 # Determine whether to echo SQL from environment variables.
 # Supported env vars (checked in order): SQLALCHEMY_ECHO
@@ -30,21 +45,78 @@ sql_logger = logging.getLogger("sqlalchemy.engine")
 sql_logger.setLevel(logging.INFO if SQL_ECHO else logging.WARNING)
 
 # Create async engine (SQLAlchemy 2.0 style)
-engine: AsyncEngine = create_async_engine(async_db_url, echo=SQL_ECHO, future=True)
+_engine_kwargs = dict(
+    echo=SQL_ECHO,
+    future=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    query_cache_size=DB_QUERY_CACHE_SIZE,
+    connect_args={"prepared_statement_cache_size": ASYNCPG_STATEMENT_CACHE_SIZE},
+)
+engine: AsyncEngine = create_async_engine(async_db_url, **_engine_kwargs)
+
+# Optional read replicas (SQLALCHEMY_REPLICA_URLS); empty means primary only
+replica_set = ReplicaSet(
+    [create_async_engine(_to_async_url(url), **_engine_kwargs) for url in SQLALCHEMY_REPLICA_URLS]
+)
+
+
+class AppRoutingSession(RoutingSession):
+    primary = engine.sync_engine
+    replicas = replica_set
+
 
 SessionLocal = sessionmaker(
     bind=engine,
-    class_=AsyncSession,
+    class_=TracedAsyncSession,
+    sync_session_class=AppRoutingSession,
     expire_on_commit=False,
     autoflush=False,
     autocommit=False,
 )
 
+# Methods whose routes only read and may be served from a replica
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+
+
+def statement_timeout(timeout_ms: int):
+    """Return a route dependency overriding `DB_STATEMENT_TIMEOUT_MS`.
 
-async def get_session() -> AsyncGenerator[AsyncSession, None]:
+    Use as `dependencies=[Depends(statement_timeout(3000))]` on the route;
+    route dependencies run before the session is created.
+    """
+
+    async def set_statement_timeout(request: Request) -> None:
+        request.state.statement_timeout_ms = timeout_ms
+
+    return set_statement_timeout
+
+
+def _request_statement_timeout(request: Request) -> int:
+    return getattr(request.state, "statement_timeout_ms", DB_STATEMENT_TIMEOUT_MS)
+
+
+async def get_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
     """Yield an async SQLAlchemy Session and ensure it's closed after use.
 
+    GET/HEAD requests read from a healthy replica when replicas are configured;
+    all other requests are pinned to the primary. Every transaction of the
+    session runs under the route's statement timeout.
+
     Use as a FastAPI dependency: Depends(get_session)
     """
+    if request.method in READ_ONLY_METHODS:
+        replica_set.refresh_if_stale()
+    async with SessionLocal() as session:
+        session.info[STATEMENT_TIMEOUT_MS] = _request_statement_timeout(request)
+        if request.method not in READ_ONLY_METHODS:
+            session.info[USE_PRIMARY] = True
+        yield session
+
+
+async def get_primary_session(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Yield a session pinned to the primary, for GET routes that write."""
     async with SessionLocal() as session:
+        session.info[STATEMENT_TIMEOUT_MS] = _request_statement_timeout(request)
+        session.info[USE_PRIMARY] = True
         yield session
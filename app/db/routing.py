@@ -0,0 +1,222 @@
+"""Read/write routing between the primary database and optional read replicas.
+
+Sessions created with `RoutingSession` as their sync session class send
+SELECTs to a healthy replica and everything else (flushes, DML, anything after
+the session has written) to the primary. Replica health is re-checked at most
+once per `REPLICA_HEALTH_CHECK_INTERVAL`, in a background task started from
+the request path; requests never wait for it.
+"""
+
+import asyncio
+import itertools
+import logging
+import time
+from typing import Optional
+
+from sqlalchemy import Delete, Insert, Update, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from app.constants import (
+    READ_YOUR_WRITES_SECONDS,
+    REPLICA_HEALTH_CHECK_INTERVAL,
+    REPLICA_HEALTH_CHECK_TIMEOUT,
+    REPLICA_MAX_LAG_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Keys stored in `Session.info`
+USE_PRIMARY = "use_primary"
+SUBJECT = "subject"
+STATEMENT_TIMEOUT_MS = "statement_timeout_ms"
+_WROTE = "wrote"  # flushed changes not yet committed
+_REPLICA = "replica"
+
+# SET LOCAL statement_timeout, with the value as a bind parameter
+_SET_STATEMENT_TIMEOUT = text("SELECT set_config('statement_timeout', :value, true)")
+
+# Replication lag in seconds; 0 on a primary (no replay timestamp) and on a
+# replica that has replayed all the WAL it received, however old its last
+# replayed transaction is (an idle primary sends no new ones)
+_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class Replica:
+    """A replica engine together with its last known health."""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.healthy = True
+        self.lag: float = 0.0
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    async def _probe(self) -> float:
+        async with self.engine.connect() as conn:
+            result = await conn.execute(_LAG_QUERY)
+            return float(result.scalar_one())
+
+    async def check(self) -> None:
+        """Probe the replica and update `healthy` / `lag`.
+
+        Connecting counts against `REPLICA_HEALTH_CHECK_TIMEOUT` too, so an
+        unreachable replica fails fast instead of after the driver's connect
+        timeout.
+        """
+        try:
+            self.lag = await asyncio.wait_for(
+                self._probe(), timeout=REPLICA_HEALTH_CHECK_TIMEOUT
+            )
+            healthy = self.lag <= REPLICA_MAX_LAG_SECONDS
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Replica {self.name} health check timed out after "
+                f"{REPLICA_HEALTH_CHECK_TIMEOUT}s"
+            )
+            healthy = False
+        except Exception as e:
+            logger.warning(f"Replica {self.name} health check failed: {e}")
+            healthy = False
+
+        if healthy != self.healthy:
+            logger.warning(
+                f"Replica {self.name} is now {'healthy' if healthy else 'unhealthy'} "
+                f"(lag={self.lag:.1f}s)"
+            )
+        self.healthy = healthy
+
+
+class ReplicaSet:
+    """Round-robin selection over the healthy replicas."""
+
+    def __init__(self, engines: list[AsyncEngine]):
+        self.replicas = [Replica(e) for e in engines]
+        self._cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._checked_at = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+
+    def __bool__(self) -> bool:
+        return bool(self.replicas)
+
+    def pick(self) -> Optional[Replica]:
+        """Return the next healthy replica, or None when all are down."""
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.healthy:
+                return replica
+        return None
+
+    async def refresh(self) -> None:
+        """Check all replicas now and wait for the result."""
+        await asyncio.gather(*(r.check() for r in self.replicas))
+        self._checked_at = time.monotonic()
+
+    def refresh_if_stale(self) -> None:
+        """Start a background re-check if the last check is older than the interval.
+
+        Doesn't wait for it: callers keep using the previous health state
+        until the check finishes.
+        """
+        if not self.replicas or self._refresh_task is not None:
+            return
+        if time.monotonic() - self._checked_at < REPLICA_HEALTH_CHECK_INTERVAL:
+            return
+        self._refresh_task = asyncio.create_task(self._refresh_in_background())
+
+    async def _refresh_in_background(self) -> None:
+        try:
+            await self.refresh()
+        finally:
+            self._refresh_task = None
+
+    async def dispose(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+# Subject (user email) -> monotonic time of that user's last committed write.
+# Per-worker only: another worker may still serve the user from a replica.
+_recent_writes: dict[str, float] = {}
+
+
+def recently_wrote(subject: str) -> bool:
+    """Return True if `subject` committed a write within the read-your-writes window."""
+    written_at = _recent_writes.get(subject)
+    if written_at is None:
+        return False
+    if time.monotonic() - written_at > READ_YOUR_WRITES_SECONDS:
+        _recent_writes.pop(subject, None)
+        return False
+    return True
+
+
+def _prune_recent_writes(now: float) -> None:
+    expired = [s for s, t in _recent_writes.items() if now - t > READ_YOUR_WRITES_SECONDS]
+    for subject in expired:
+        del _recent_writes[subject]
+
+
+class RoutingSession(Session):
+    """Session that routes reads to replicas and writes to the primary.
+
+    Subclasses set `primary` and `replicas`; the subclass is then passed as
+    `sync_session_class` to an async sessionmaker. Once a session has flushed
+    it stays on the primary, so refreshes after commit see the new rows.
+    """
+
+    primary: Engine
+    replicas: ReplicaSet
+
+    def get_bind(self, mapper=None, clause=None, **kw):
+        if (
+            not self.replicas
+            or self._flushing
+            or isinstance(clause, (Insert, Update, Delete))
+            or self.info.get(USE_PRIMARY)
+        ):
+            return self.primary
+
+        # Stick to one replica for the lifetime of the session
+        replica = self.info.get(_REPLICA)
+        if replica is None or not replica.healthy:
+            replica = self.replicas.pick()
+            if replica is None:
+                return self.primary
+            self.info[_REPLICA] = replica
+        return replica.engine.sync_engine
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_wrote(session: Session, flush_context) -> None:
+    session.info[USE_PRIMARY] = True
+    session.info[_WROTE] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_write(session: Session) -> None:
+    if not session.info.pop(_WROTE, False):
+        return
+    subject = session.info.get(SUBJECT)
+    if subject:
+        now = time.monotonic()
+        _recent_writes[subject] = now
+        if len(_recent_writes) > 10_000:
+            _prune_recent_writes(now)
+
+
+@event.listens_for(RoutingSession, "after_begin")
+def _apply_statement_timeout(session: Session, transaction, connection) -> None:
+    # Transaction-scoped, so it is re-applied on every begin (a session may
+    # commit and start over) and never leaks to the pooled connection
+    timeout_ms = session.info.get(STATEMENT_TIMEOUT_MS)
+    if timeout_ms:
+        connection.execute(_SET_STATEMENT_TIMEOUT, {"value": str(timeout_ms)})
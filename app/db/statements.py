@@ -0,0 +1,96 @@
+"""Registry of prebuilt, parameterized statements for the hot lookups.
+
+The statements are constructed once at import and executed with bound
+parameters, so a call doesn't rebuild the `select(...)` and SQLAlchemy's cache
+key for the construct is computed once and memoized. With the same SQL text on
+every call, asyncpg's per-connection prepared-statement cache
+(`ASYNCPG_STATEMENT_CACHE_SIZE`) is hit after the first execution on each
+connection; the compiled form lives in the engine's query cache
+(`DB_QUERY_CACHE_SIZE`).
+
+List statements select only the `ContactRead` columns: they return plain
+`Row` tuples with attribute access, which skip ORM instance construction,
+instrumentation and the session identity map. Sparse fieldsets (`fields=`)
+narrow them further; each narrowed variant is built once per field set.
+"""
+
+from functools import lru_cache
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import Executable, Integer, Select, String, any_, bindparam, select
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.models.contact import Contact
+from app.models.user import User
+from app.schemas.contact import ContactRead
+
+
+class HotStatement(NamedTuple):
+    stmt: Executable
+    # Parameters that match no rows; used to prime caches at startup
+    warmup_params: dict[str, Any]
+
+
+USER_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+
+USER_BY_ID = select(User).where(User.id == bindparam("user_id"))
+
+CONTACT_BY_ID = select(Contact).where(
+    Contact.id == bindparam("contact_id"), Contact.user_id == bindparam("user_id")
+)
+
+CONTACT_BY_EMAIL = select(Contact).where(
+    Contact.email == bindparam("email"), Contact.user_id == bindparam("user_id")
+)
+
+# Columns serialized by ContactRead, in schema order
+CONTACT_READ_COLUMNS = tuple(getattr(Contact, name) for name in ContactRead.model_fields)
+
+CONTACTS_PAGE = (
+    select(*CONTACT_READ_COLUMNS)
+    .where(Contact.user_id == bindparam("user_id"))
+    .order_by(Contact.id.asc())
+    .offset(bindparam("skip", type_=Integer))
+    .limit(bindparam("limit", type_=Integer))
+)
+
+# Reverse phone lookup; `phones` must already be normalized
+CONTACTS_BY_PHONES = (
+    select(Contact.normalized_phone, *CONTACT_READ_COLUMNS)
+    .where(
+        Contact.user_id == bindparam("user_id"),
+        Contact.normalized_phone == any_(bindparam("phones", type_=ARRAY(String))),
+    )
+    .order_by(Contact.id.asc())
+)
+
+
+def contact_read_columns(fields: Optional[tuple[str, ...]] = None) -> tuple:
+    """The columns of `fields` (`ContactRead` field names), or all of them."""
+    if fields is None:
+        return CONTACT_READ_COLUMNS
+    return tuple(getattr(Contact, name) for name in fields)
+
+
+@lru_cache(maxsize=128)
+def contacts_page_statement(fields: Optional[tuple[str, ...]] = None) -> Select:
+    """`CONTACTS_PAGE` selecting only `fields`."""
+    if fields is None:
+        return CONTACTS_PAGE
+    return CONTACTS_PAGE.with_only_columns(*contact_read_columns(fields))
+
+
+@lru_cache(maxsize=128)
+def contact_by_id_statement(fields: tuple[str, ...]) -> Select:
+    """`CONTACT_BY_ID` returning a `Row` of just `fields` instead of the model."""
+    return CONTACT_BY_ID.with_only_columns(*contact_read_columns(fields))
+
+
+HOT_STATEMENTS: dict[str, HotStatement] = {
+    "user_by_email": HotStatement(USER_BY_EMAIL, {"email": ""}),
+    "user_by_id": HotStatement(USER_BY_ID, {"user_id": 0}),
+    "contact_by_id": HotStatement(CONTACT_BY_ID, {"contact_id": 0, "user_id": 0}),
+    "contact_by_email": HotStatement(CONTACT_BY_EMAIL, {"email": "", "user_id": 0}),
+    "contacts_page": HotStatement(CONTACTS_PAGE, {"user_id": 0, "skip": 0, "limit": 1}),
+    "contacts_by_phones": HotStatement(CONTACTS_BY_PHONES, {"user_id": 0, "phones": [""]}),
+}
@@ -5,11 +5,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.crud.user import get_user_by_email
 from app.db.get_session import get_session
+from app.db.routing import SUBJECT, USE_PRIMARY, recently_wrote
 from app.models.user import User
+from app.tracing import traced
 from app.utils.auth import decode_token
 from app.utils.security import oauth2_scheme
 
 
+@traced("dependency get_current_user")
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: AsyncSession = Depends(get_session)
@@ -36,6 +39,12 @@ async def get_current_user(
     email = decode_token(token)
     if email is None:
         raise credentials_exception
+
+    # Tag the session with the user so their writes and follow-up reads
+    # (read-your-writes window) go to the primary
+    db.info[SUBJECT] = email
+    if recently_wrote(email):
+        db.info[USE_PRIMARY] = True
     
     user = await get_user_by_email(db, email=email)
     if user is None:
@@ -44,6 +53,7 @@ async def get_current_user(
     return user
 
 
+@traced("dependency get_current_active_user")
 async def get_current_active_user(
     current_user: User = Depends(get_current_user)
 ) -> User:
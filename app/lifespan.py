@@ -0,0 +1,124 @@
+"""Application lifespan: warm the worker up before it serves traffic.
+
+On startup the pool of each engine is pre-filled and the hot statements are
+run once on every pre-opened connection, so the first requests after a deploy
+don't pay for connecting, statement compilation and asyncpg prepares. Pydantic
+serializers, the JWT backend and email templates are primed as well. On
+shutdown the change feed listener is stopped, all engines are disposed and
+buffered traces are written out.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from datetime import date
+
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.constants import DB_POOL_SIZE, WARMUP_ENABLED, WARMUP_POOL_CONNECTIONS
+from app.crud.contact import search_contacts
+from app.db.get_session import engine, replica_set
+from app.db.statements import HOT_STATEMENTS
+from app.realtime.change_feed import change_feed
+from app.schemas.contact import ContactRead
+from app.schemas.user import UserResponse
+from app.tracing import shutdown_exporter
+
+logger = logging.getLogger(__name__)
+# Startup/readiness messages are worth seeing even with the root logger at WARNING
+logger.setLevel(logging.INFO)
+
+
+async def _warm_statements(conn: AsyncConnection) -> None:
+    """Run the hot lookups once on `conn`; ids/emails that match no rows."""
+    async with AsyncSession(bind=conn, expire_on_commit=False) as db:
+        for hot in HOT_STATEMENTS.values():
+            await db.execute(hot.stmt, hot.warmup_params)
+        await search_contacts(db, user_id=0, first_name="_", limit=1)
+
+
+async def warm_engine(engine: AsyncEngine, connections: int) -> int:
+    """Open `connections` pooled connections at once and prime each of them.
+
+    Connections are held concurrently so the pool really grows to that size;
+    closing them returns them to the pool. Returns how many were opened.
+    """
+    connections = max(0, min(connections, DB_POOL_SIZE))
+    conns = []
+    try:
+        for result in await asyncio.gather(
+            *(engine.connect() for _ in range(connections)), return_exceptions=True
+        ):
+            if isinstance(result, Exception):
+                logger.warning(f"Warm-up connection to {engine.url.host} failed: {result}")
+            else:
+                conns.append(result)
+        await asyncio.gather(*(_warm_statements(conn) for conn in conns))
+    finally:
+        for conn in conns:
+            await conn.close()
+    return len(conns)
+
+
+def warm_serializers() -> None:
+    """Build pydantic validators/serializers for the response models."""
+    ContactRead.model_validate(
+        {
+            "id": 0,
+            "first_name": "",
+            "last_name": "",
+            "email": "warmup@example.com",
+            "phone_number": "",
+            "birthday": date.today(),
+        }
+    ).model_dump_json()
+    UserResponse.model_json_schema()
+
+
+def warm_integrations() -> None:
+    """Load the lazily imported JWT backend and compile the email templates."""
+    from app.services.email import get_jinja_env
+    from app.utils.auth import decode_token
+
+    decode_token("warmup")
+    get_jinja_env().get_template("verify_email.html")
+
+
+async def warm_up() -> None:
+    started = time.perf_counter()
+    engines = [engine] + [replica.engine for replica in replica_set.replicas]
+    try:
+        opened = await asyncio.gather(
+            *(warm_engine(e, WARMUP_POOL_CONNECTIONS) for e in engines)
+        )
+    except Exception as e:
+        # Best effort: a worker that can't warm up can still serve
+        logger.warning(f"Database warm-up failed: {e}")
+        opened = []
+    db_elapsed = time.perf_counter() - started
+
+    warm_serializers()
+    warm_integrations()
+    logger.info(
+        f"Warm-up done in {time.perf_counter() - started:.3f}s "
+        f"(db {db_elapsed:.3f}s, connections opened per engine: {list(opened)})"
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    started = time.perf_counter()
+    if WARMUP_ENABLED:
+        await warm_up()
+    await replica_set.refresh()
+    logger.info(f"Worker ready to serve in {time.perf_counter() - started:.3f}s")
+
+    yield
+
+    await change_feed.stop()
+    await engine.dispose()
+    await replica_set.dispose()
+    logger.info("Database engines disposed")
+    shutdown_exporter()
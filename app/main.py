@@ -2,10 +2,23 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import sqlalchemy.exc
 
-from app.api.v1 import auth_router, contact_router, user_router
+from app.api.v1 import auth_router, contact_router, metrics_router, user_router
 from app.api.exception_handlers import dbapi_error_handler
+from app.constants import PROFILING_TOKEN, TRACING_FILE, TRACING_SERVICE_NAME
+from app.lifespan import lifespan
+from app.middleware import AdmissionControlMiddleware, CancelOnDisconnectMiddleware
 
-app = FastAPI(title="Contact Management API", version="1.0.0")
+app = FastAPI(title="Contact Management API", version="1.0.0", lifespan=lifespan)
+
+# Profile single requests on demand; not installed at all without a token
+if PROFILING_TOKEN:
+    from app.middleware.profiling import ProfilingMiddleware
+
+    app.add_middleware(ProfilingMiddleware)
+
+# Shed excess load with a fast 503 (inside CORS, so CORS headers are still
+# added to it, and inside the disconnect watcher, so gone clients leave the queue)
+app.add_middleware(AdmissionControlMiddleware)
 
 # Configure CORS
 app.add_middleware(
@@ -16,6 +29,19 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# Stop work (and running queries) for GET requests whose client disconnected
+app.add_middleware(CancelOnDisconnectMiddleware)
+
+# Trace sampled requests into a local OTLP JSON file; outermost, so the spans
+# cover the admission queue. Not installed at all without a file.
+if TRACING_FILE:
+    from app.middleware.tracing import TracingMiddleware
+    from app.tracing import OtlpJsonFileExporter, instrument_sqlalchemy, set_exporter
+
+    set_exporter(OtlpJsonFileExporter(TRACING_FILE, TRACING_SERVICE_NAME))
+    instrument_sqlalchemy()
+    app.add_middleware(TracingMiddleware)
+
 # Register a global handler for SQLAlchemy DB errors so we can map known DB
 # situations (like string truncation) to friendly HTTP responses.
 app.add_exception_handler(sqlalchemy.exc.DBAPIError, dbapi_error_handler)
@@ -23,3 +49,4 @@ app.add_exception_handler(sqlalchemy.exc.DBAPIError, dbapi_error_handler)
 app.include_router(auth_router.router)
 app.include_router(contact_router.router)
 app.include_router(user_router.router)
+app.include_router(metrics_router.router)
@@ -0,0 +1,10 @@
+from .admission import AdmissionControlMiddleware, AdmissionController, admission_controller
+from .disconnect import CancelOnDisconnectMiddleware, disconnect_stats
+
+__all__ = [
+    "AdmissionControlMiddleware",
+    "AdmissionController",
+    "CancelOnDisconnectMiddleware",
+    "admission_controller",
+    "disconnect_stats",
+]
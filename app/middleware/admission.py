@@ -0,0 +1,224 @@
+"""Admission control: bounded concurrency and fast load shedding per worker.
+
+At most `ADMISSION_MAX_CONCURRENCY` API requests run at once in a worker (by
+default one per pooled DB connection). Requests beyond that wait in a bounded
+queue, best priority class first:
+
+- `auth` (/api/v1/auth/...): logging in must keep working under load
+- `interactive`: everything else under /api/v1
+- `bulk` (duplicate scans, sync pages, batch phone lookups): served last,
+  and never more than `ADMISSION_BULK_MAX_CONCURRENCY` at once
+
+A request that can't start within its class's wait limit, or finds the queue
+full of requests at least as important, gets an immediate 503 with
+`Retry-After` instead of timing out. A full queue drops its newest, least
+important waiter to make room for a more important request. Long-lived
+streams, docs and metrics are not limited.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+from collections import Counter
+from typing import NamedTuple, Optional
+
+from app.constants import (
+    ADMISSION_BULK_MAX_CONCURRENCY,
+    ADMISSION_MAX_CONCURRENCY,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_MAX_WAIT_SECONDS,
+)
+
+
+class PriorityClass(NamedTuple):
+    name: str
+    priority: int  # lower is served first
+    max_wait: float  # seconds in the queue before giving up
+    max_concurrency: Optional[int]  # cap for this class alone
+    retry_after: int  # seconds, sent with the 503
+
+
+AUTH = PriorityClass("auth", 0, ADMISSION_MAX_WAIT_SECONDS * 2, None, 1)
+INTERACTIVE = PriorityClass("interactive", 1, ADMISSION_MAX_WAIT_SECONDS, None, 1)
+BULK = PriorityClass("bulk", 2, ADMISSION_MAX_WAIT_SECONDS, ADMISSION_BULK_MAX_CONCURRENCY, 5)
+CLASSES = (AUTH, INTERACTIVE, BULK)
+
+# (method or None for any, path)
+BULK_ROUTES = {
+    (None, "/api/v1/contacts/duplicates"),
+    (None, "/api/v1/contacts/changes"),
+    ("POST", "/api/v1/contacts/lookup"),
+}
+# Not limited: open for minutes without a DB connection, or operational
+UNLIMITED_PATHS = {"/api/v1/contacts/stream", "/api/v1/metrics", "/api/v1/metrics/"}
+
+
+def classify(method: str, path: str) -> Optional[PriorityClass]:
+    """Return the priority class of a request, or None if it isn't limited."""
+    if method == "OPTIONS" or not path.startswith("/api/v1/") or path in UNLIMITED_PATHS:
+        return None
+    if path.startswith("/api/v1/auth/"):
+        return AUTH
+    route = path.rstrip("/")
+    if (None, route) in BULK_ROUTES or (method, route) in BULK_ROUTES:
+        return BULK
+    return INTERACTIVE
+
+
+class AdmissionController:
+    """Per-worker slots and priority wait queue."""
+
+    def __init__(self, max_concurrency: int, max_queue: int):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.in_flight = 0
+        self._running: Counter[str] = Counter()
+        self._waiting: Counter[str] = Counter()
+        # (priority, seq, class, future); entries whose future is done are stale
+        self._queue: list = []
+        self._seq = itertools.count()
+        self.admitted: Counter[str] = Counter()
+        self.queued: Counter[str] = Counter()
+        self.rejected: Counter[str] = Counter()
+        self.timed_out: Counter[str] = Counter()
+
+    def _may_start(self, cls: PriorityClass) -> bool:
+        return self.in_flight < self.max_concurrency and (
+            cls.max_concurrency is None or self._running[cls.name] < cls.max_concurrency
+        )
+
+    def _start(self, cls: PriorityClass) -> None:
+        self.in_flight += 1
+        self._running[cls.name] += 1
+        self.admitted[cls.name] += 1
+
+    def _dispatch(self) -> None:
+        """Hand free slots to the best waiters allowed to start."""
+        blocked = []
+        while self._queue and self.in_flight < self.max_concurrency:
+            entry = heapq.heappop(self._queue)
+            _, _, cls, future = entry
+            if future.done():
+                continue
+            if not self._may_start(cls):
+                blocked.append(entry)  # its class is at its own cap
+                continue
+            self._waiting[cls.name] -= 1
+            self._start(cls)
+            future.set_result(True)
+        for entry in blocked:
+            heapq.heappush(self._queue, entry)
+
+    def _make_room(self, cls: PriorityClass) -> bool:
+        """Drop the newest waiter of a worse class than `cls`, if any."""
+        live = [entry for entry in self._queue if not entry[3].done()]
+        if not live:
+            return True
+        worst = max(live, key=lambda entry: (entry[0], entry[1]))
+        if worst[0] <= cls.priority:
+            return False
+        self._waiting[worst[2].name] -= 1
+        worst[3].set_result(False)
+        return True
+
+    async def acquire(self, cls: PriorityClass) -> bool:
+        """Wait for a slot; False means shed the request."""
+        ahead = any(self._waiting[c.name] for c in CLASSES if c.priority <= cls.priority)
+        if not ahead and self._may_start(cls):
+            self._start(cls)
+            return True
+        if sum(self._waiting.values()) >= self.max_queue and not self._make_room(cls):
+            self.rejected[cls.name] += 1
+            return False
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (cls.priority, next(self._seq), cls, future))
+        self._waiting[cls.name] += 1
+        self.queued[cls.name] += 1
+        try:
+            await asyncio.wait({future}, timeout=cls.max_wait)
+        except asyncio.CancelledError:
+            # Client gone while queued (see CancelOnDisconnectMiddleware)
+            if future.done() and future.result():
+                self.release(cls)
+            else:
+                self._abandon(cls, future)
+            raise
+        if not future.done():
+            self._abandon(cls, future)
+            self.timed_out[cls.name] += 1
+            return False
+        if not future.result():
+            self.rejected[cls.name] += 1
+            return False
+        return True
+
+    def _abandon(self, cls: PriorityClass, future: asyncio.Future) -> None:
+        if not future.done():
+            self._waiting[cls.name] -= 1
+            future.cancel()
+
+    def release(self, cls: PriorityClass) -> None:
+        self.in_flight -= 1
+        self._running[cls.name] -= 1
+        self._dispatch()
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "waiting": sum(self._waiting.values()),
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "classes": {
+                cls.name: {
+                    "running": self._running[cls.name],
+                    "waiting": self._waiting[cls.name],
+                    "admitted": self.admitted[cls.name],
+                    "queued": self.queued[cls.name],
+                    "rejected": self.rejected[cls.name],
+                    "timed_out": self.timed_out[cls.name],
+                }
+                for cls in CLASSES
+            },
+        }
+
+
+admission_controller = AdmissionController(ADMISSION_MAX_CONCURRENCY, ADMISSION_MAX_QUEUE)
+
+
+class AdmissionControlMiddleware:
+    """Pure ASGI middleware; see the module docstring."""
+
+    def __init__(self, app, controller: AdmissionController = admission_controller):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        cls = classify(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if cls is None:
+            await self.app(scope, receive, send)
+            return
+        if not await self.controller.acquire(cls):
+            await _overloaded(send, cls)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.controller.release(cls)
+
+
+async def _overloaded(send, cls: PriorityClass) -> None:
+    body = json.dumps({"detail": "Server is overloaded, retry later"}).encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", str(cls.retry_after).encode("ascii")),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,70 @@
+"""Cancel read requests whose client has gone away.
+
+Starlette keeps running an endpoint after its client disconnects, so a slow
+query (a wide search, say) holds its pooled connection and keeps Postgres busy
+for a response nobody will read. This middleware watches the connection while
+a GET/HEAD request is handled and cancels the handler task on disconnect;
+asyncpg then cancels the running statement on the server and the session
+rolls back and returns its connection.
+
+Writes are left to finish: their outcome shouldn't depend on when the client
+hung up, and a retry with `Idempotency-Key` then replays the result.
+"""
+
+import asyncio
+from collections import Counter
+
+from app.db.get_session import READ_ONLY_METHODS
+
+# Per worker; reported by the metrics endpoint
+disconnect_stats: Counter[str] = Counter()
+
+
+class CancelOnDisconnectMiddleware:
+    """Pure ASGI middleware; see the module docstring."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in READ_ONLY_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        # The watcher owns `receive`; the app reads what it forwards
+        messages: asyncio.Queue = asyncio.Queue()
+        response_complete = False
+
+        async def watch() -> None:
+            while True:
+                message = await receive()
+                messages.put_nowait(message)
+                if message["type"] == "http.disconnect":
+                    return
+
+        async def send_and_track(message) -> None:
+            nonlocal response_complete
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                response_complete = True
+
+        handler = asyncio.ensure_future(self.app(scope, messages.get, send_and_track))
+        watcher = asyncio.ensure_future(watch())
+        try:
+            await asyncio.wait({handler, watcher}, return_when=asyncio.FIRST_COMPLETED)
+            # The server also reports a disconnect once the response is sent;
+            # only an early one means the client gave up
+            if not handler.done() and not response_complete:
+                handler.cancel()
+                disconnect_stats["cancelled"] += 1
+                try:
+                    await handler
+                except asyncio.CancelledError:
+                    if asyncio.current_task().cancelling():
+                        raise
+                return
+            await handler
+        finally:
+            if not handler.done():
+                handler.cancel()
+            watcher.cancel()
@@ -0,0 +1,215 @@
+"""On-demand CPU profile of a single request.
+
+Installed only when `PROFILING_TOKEN` is set; otherwise the app has no
+profiling code in its request path at all. When installed, a request carrying
+`X-Debug-Profile: <PROFILING_TOKEN>` is profiled and the file name is returned
+in `X-Profile-File`. Other requests pay one header lookup. A wrong token is
+ignored silently.
+
+Modes (`X-Debug-Profile-Mode`):
+
+- `sample` (default): a thread samples the event loop's stack every
+  `PROFILING_INTERVAL_SECONDS` and keeps only the samples taken while this
+  request's task was running, so concurrent requests don't show up. The
+  output is in folded-stack format (`<name>.folded`). Open it in speedscope,
+  or render it with `flamegraph.pl`.
+- `cprofile`: deterministic cProfile of the event loop thread for the
+  request's duration, written as pstats (`<name>.prof`, for snakeviz or
+  `python -m pstats`). Includes whatever else the loop ran meanwhile. Only
+  one runs at a time per worker; a concurrent one gets 409 with `Retry-After`.
+
+Files go to `PROFILING_DIR`, named `<time>-<request id>-<route>`.
+"""
+
+import cProfile
+import hmac
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from types import FrameType
+from typing import Optional
+
+from app.constants import PROFILING_DIR, PROFILING_INTERVAL_SECONDS, PROFILING_TOKEN
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-debug-profile"
+MODE_HEADER = b"x-debug-profile-mode"
+REQUEST_ID_HEADER = b"x-request-id"
+FILE_HEADER = b"x-profile-file"
+
+
+# The switch interval is process-wide: lowered while any sampler runs, and
+# restored by the last one to stop
+_switch_interval_lock = threading.Lock()
+_samplers_running = 0
+_saved_switch_interval = 0.0
+
+# One cProfile at a time: a second Profile would raise (3.12+) or silently
+# take over the first one's hook (earlier versions)
+_cprofile_active = False
+
+
+def _lower_switch_interval(interval: float) -> None:
+    global _samplers_running, _saved_switch_interval
+    with _switch_interval_lock:
+        if _samplers_running == 0:
+            _saved_switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(_saved_switch_interval, interval))
+        _samplers_running += 1
+
+
+def _restore_switch_interval() -> None:
+    global _samplers_running
+    with _switch_interval_lock:
+        _samplers_running -= 1
+        if _samplers_running == 0:
+            sys.setswitchinterval(_saved_switch_interval)
+
+
+def _frame_name(frame: FrameType) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+class StackSampler:
+    """Samples one thread's stack, keeping stacks that pass through `marker`."""
+
+    def __init__(self, thread_id: int, marker: FrameType, interval: float):
+        self.thread_id = thread_id
+        self.marker = marker
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self) -> None:
+        # The sampler only runs when the loop thread hands over the GIL. By
+        # default that happens every 5 ms or when the loop blocks in select()
+        # (between requests' steps), so short bursts of request code would
+        # never be sampled.
+        _lower_switch_interval(self.interval / 2)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        _restore_switch_interval()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            # Walk up to the marker: stacks without it belong to other tasks
+            # (or the idle loop), and frames above it are the same every time
+            while frame is not None and frame is not self.marker:
+                names.append(_frame_name(frame))
+                frame = frame.f_back
+            if frame is not None:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def write(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _file_stem(scope, request_id: str) -> str:
+    route = getattr(scope.get("route"), "path", scope["path"])
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", f"{scope['method']} {route}").strip("_")
+    return os.path.join(
+        PROFILING_DIR, f"{time.strftime('%Y%m%dT%H%M%S')}-{request_id}-{slug}"
+    )
+
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware; see the module docstring."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        global _cprofile_active
+        token = _header(scope, PROFILE_HEADER) if scope["type"] == "http" else None
+        if token is None or not hmac.compare_digest(token, PROFILING_TOKEN):
+            await self.app(scope, receive, send)
+            return
+
+        mode = _header(scope, MODE_HEADER) or "sample"
+        request_id = re.sub(r"[^A-Za-z0-9_-]", "", _header(scope, REQUEST_ID_HEADER) or "")
+        request_id = request_id[:32] or uuid.uuid4().hex[:12]
+        extension = ".prof" if mode == "cprofile" else ".folded"
+        path = None
+
+        async def send_with_file(message) -> None:
+            nonlocal path
+            if message["type"] == "http.response.start":
+                # The route is resolved by now
+                path = _file_stem(scope, request_id) + extension
+                headers = [*message.get("headers", []), (FILE_HEADER, path.encode("latin-1"))]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        os.makedirs(PROFILING_DIR, exist_ok=True)
+        if mode == "cprofile":
+            if _cprofile_active:
+                await _profiler_busy(send)
+                return
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError:
+                # Some other profiling tool is active in this process
+                await _profiler_busy(send)
+                return
+            _cprofile_active = True
+            try:
+                await self.app(scope, receive, send_with_file)
+            finally:
+                profiler.disable()
+                _cprofile_active = False
+                path = path or _file_stem(scope, request_id) + extension
+                profiler.dump_stats(path)
+        else:
+            # This coroutine's frame is on the loop thread's stack exactly
+            # while this request's task is running
+            sampler = StackSampler(
+                threading.get_ident(), sys._getframe(), PROFILING_INTERVAL_SECONDS
+            )
+            sampler.start()
+            try:
+                await self.app(scope, receive, send_with_file)
+            finally:
+                sampler.stop()
+                path = path or _file_stem(scope, request_id) + extension
+                sampler.write(path)
+        logger.info(f"Profile of {scope['method']} {scope['path']} written to {path}")
+
+
+async def _profiler_busy(send) -> None:
+    body = json.dumps({"detail": "Another profile is running in this worker, retry later"})
+    body = body.encode("utf-8")
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 409,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", b"1"),
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
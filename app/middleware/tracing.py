@@ -0,0 +1,89 @@
+"""Start a trace for sampled requests (see app.tracing).
+
+Installed only when `TRACING_FILE` is set. The root span covers the whole
+request, including the admission queue, and is named after the matched route.
+An incoming W3C `traceparent` header continues the caller's trace and its
+sampled flag decides whether this request is traced; otherwise
+`TRACING_SAMPLE_RATIO` does. Either way at most
+`TRACING_MAX_TRACES_PER_SECOND` traces start per worker. Traced responses
+carry `X-Trace-Id`, to find the trace in the file.
+"""
+
+import re
+from typing import Optional
+
+from app.tracing import KIND_SERVER, start_trace, use_span
+
+TRACEPARENT_HEADER = b"traceparent"
+TRACE_ID_HEADER = b"x-trace-id"
+
+_TRACEPARENT = re.compile(r"00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})")
+
+
+def parse_traceparent(value: Optional[str]) -> tuple[Optional[str], Optional[str], Optional[bool]]:
+    """Return (trace id, parent span id, sampled) of a traceparent header."""
+    match = _TRACEPARENT.fullmatch(value.strip()) if value else None
+    if match is None:
+        return None, None, None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None, None, None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class TracingMiddleware:
+    """Pure ASGI middleware; see the module docstring."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        trace_id, parent_id, sampled = parse_traceparent(_header(scope, TRACEPARENT_HEADER))
+        root = start_trace(
+            f"{method} {scope['path']}",
+            kind=KIND_SERVER,
+            trace_id=trace_id,
+            parent_id=parent_id,
+            sampled=sampled,
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        )
+        if root is None:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
+
+        async def send_with_trace_id(message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = [
+                    *message.get("headers", []),
+                    (TRACE_ID_HEADER, root.trace.trace_id.encode("ascii")),
+                ]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        with use_span(root):
+            try:
+                await self.app(scope, receive, send_with_trace_id)
+            finally:
+                route = getattr(scope.get("route"), "path", None)
+                if route is not None:
+                    root.name = f"{method} {route}"
+                    root.set_attribute("http.route", route)
+                root.set_attribute("http.response.status_code", status_code)
+                if status_code is not None and status_code >= 500 and root.error is None:
+                    root.error = f"HTTP {status_code}"
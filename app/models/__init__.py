@@ -1,6 +1,8 @@
 from .base import Base
-from .contact import Contact
+from .contact import Contact, ContactTombstone
+from .idempotency_key import IdempotencyKey
+from .login_throttle import LoginThrottle
 from .user import User
 
 
-__all__ = ["Base", "Contact", "User"]
+__all__ = ["Base", "Contact", "ContactTombstone", "IdempotencyKey", "LoginThrottle", "User"]
@@ -1,7 +1,21 @@
-from datetime import date
+from datetime import date, datetime
 from typing import Optional
 
-from sqlalchemy import Date, ForeignKey, Integer, String
+from sqlalchemy import (
+    Computed,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    PrimaryKeyConstraint,
+    String,
+    extract,
+    func,
+    literal_column,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ..constants import (
@@ -14,11 +28,38 @@ from ..constants import (
 
 from .base import Base
 
+# Keep in sync with app.validators.normalize_phone
+NORMALIZED_PHONE_EXPRESSION = (
+    "regexp_replace(regexp_replace(phone_number, '\\D', '', 'g'), '^00', '')"
+)
+
+# Every text field, plus the email split on punctuation so "john" finds
+# "john.doe@example.com". 'simple' config: names must not be stemmed.
+SEARCH_VECTOR_EXPRESSION = (
+    "to_tsvector('simple', "
+    "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || "
+    "regexp_replace(coalesce(email, ''), '[^[:alnum:]]+', ' ', 'g') || ' ' || "
+    "coalesce(phone_number, '') || ' ' || coalesce(additional_data, ''))"
+)
+
 
 class Contact(Base):
+    """A user's contact.
+
+    The table is hash-partitioned on `user_id`, and the primary key is
+    `(user_id, id)`, so ORM updates and deletes, like every per-user query,
+    touch a single partition. `id` stays unique because every partition draws
+    it from one sequence (Postgres can't enforce uniqueness across partitions).
+    """
+
     __tablename__ = "contacts"
+    __table_args__ = (
+        PrimaryKeyConstraint("user_id", "id", name="contacts_pkey"),
+        {"postgresql_partition_by": "HASH (user_id)"},
+    )
 
-    id: Mapped[int] = mapped_column(primary_key=True)
+    id: Mapped[int] = mapped_column(Integer, autoincrement=True)
     first_name: Mapped[str] = mapped_column(
         String(FIRST_NAME_MAX_LENGTH), nullable=False
     )
@@ -27,14 +68,30 @@ class Contact(Base):
     phone_number: Mapped[str] = mapped_column(
         String(PHONE_NUMBER_MAX_LENGTH), nullable=False
     )
+    normalized_phone: Mapped[Optional[str]] = mapped_column(
+        String(PHONE_NUMBER_MAX_LENGTH),
+        Computed(NORMALIZED_PHONE_EXPRESSION, persisted=True),
+    )
     birthday: Mapped[Optional[date]] = mapped_column(Date, nullable=True)
     additional_data: Mapped[Optional[str]] = mapped_column(
         String(ADDITIONAL_DATA_MAX_LENGTH), nullable=True
     )
     user_id: Mapped[int] = mapped_column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    # Generated by Postgres for full-text search; never loaded unless asked for
+    search_vector: Mapped[Optional[str]] = mapped_column(
+        TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True), deferred=True
     )
-    
+    # Bumped on every write; drives delta sync (see crud.contact.get_contact_changes).
+    # clock_timestamp(), not now(): rows written later in a transaction sort later
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("clock_timestamp()"),
+        onupdate=func.clock_timestamp(),
+        nullable=False,
+    )
+
     # Relationship to User
     owner: Mapped["User"] = relationship("User", back_populates="contacts")  # noqa: F821
 
@@ -42,3 +99,61 @@ class Contact(Base):
         return (
             f"<Contact(name='{self.first_name} {self.last_name}', email={self.email})>"
         )
+
+
+def birthday_month_day(birthday):
+    """SQL expression for a birthday as MMDD (e.g. 1231), ignoring the year.
+
+    Queries must use this exact expression to hit `ix_contacts_birthday_md`;
+    the multiplier is rendered inline because a bound parameter would not
+    match the indexed expression.
+    """
+    return extract("month", birthday) * literal_column("100") + extract("day", birthday)
+
+
+# Birthday window lookups across all users (see crud.contact)
+Index(
+    "ix_contacts_birthday_md",
+    birthday_month_day(Contact.birthday),
+    Contact.user_id,
+    postgresql_where=Contact.birthday.is_not(None),
+)
+
+# Full-text search over all text fields (see crud.contact.full_text_search_contacts)
+Index("ix_contacts_search_vector", Contact.search_vector, postgresql_using="gin")
+
+# Reverse phone lookup (=) and digit-prefix matching (LIKE '380%') within a
+# user's contacts; pattern ops serve both
+Index(
+    "ix_contacts_user_id_normalized_phone",
+    Contact.user_id,
+    Contact.normalized_phone,
+    postgresql_ops={"normalized_phone": "varchar_pattern_ops"},
+)
+
+# Delta sync: a user's contacts changed after a cursor, in cursor order
+Index("ix_contacts_user_id_updated_at", Contact.user_id, Contact.updated_at, Contact.id)
+
+
+class ContactTombstone(Base):
+    """Record of a deleted contact, kept so delta sync can report the delete.
+
+    Pruned after `SYNC_TOMBSTONE_RETENTION_DAYS`; cursors older than that
+    must fall back to a full sync.
+    """
+
+    __tablename__ = "contact_tombstones"
+
+    contact_id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    deleted_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=text("clock_timestamp()"),
+        nullable=False,
+    )
+
+    __table_args__ = (
+        Index("ix_contact_tombstones_user_id_deleted_at", "user_id", "deleted_at", "contact_id"),
+    )
@@ -0,0 +1,32 @@
+"""Stored responses of idempotent POSTs (see app.api.idempotency)."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, ForeignKey, Integer, LargeBinary, SmallInteger
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class IdempotencyKey(Base):
+    """One `Idempotency-Key` a user sent, and the response to replay for it.
+
+    Kept compact: the key and the request fingerprint are stored as SHA-256
+    digests (32 bytes each, whatever the client sent), and one timestamp
+    serves as both the claim deadline (while `status_code` is NULL, the
+    request is in progress) and the expiry of the stored response.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    key_hash: Mapped[bytes] = mapped_column(LargeBinary(32), primary_key=True)
+    fingerprint: Mapped[bytes] = mapped_column(LargeBinary(32), nullable=False)
+    status_code: Mapped[Optional[int]] = mapped_column(SmallInteger)
+    response: Mapped[Optional[bytes]] = mapped_column(LargeBinary)
+    expires_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, index=True
+    )
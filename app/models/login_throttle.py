@@ -0,0 +1,27 @@
+"""Failed-login counters shared by all workers (see services.login_throttle)."""
+
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+
+class LoginThrottle(Base):
+    """Recent failed logins for one account or one client IP.
+
+    `key` is an HMAC of the account email or the IP, so attacker-supplied
+    emails aren't stored. UNLOGGED: counters are cheap to write and may be
+    lost on a crash. Unlogged tables aren't replicated, so they are only ever
+    read on the primary (login is a POST).
+    """
+
+    __tablename__ = "login_throttle"
+    __table_args__ = {"prefixes": ["UNLOGGED"]}
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    failures: Mapped[int] = mapped_column(Integer, nullable=False)
+    blocked_until: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True))
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
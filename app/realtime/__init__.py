@@ -0,0 +1,3 @@
+from .change_feed import ChangeFeed, Subscription, change_feed, publish_contact_events
+
+__all__ = ["ChangeFeed", "Subscription", "change_feed", "publish_contact_events"]
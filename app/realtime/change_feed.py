@@ -0,0 +1,209 @@
+"""Live contact change events: Postgres LISTEN/NOTIFY fanned out over SSE.
+
+Write paths in `crud.contact` call `publish_contact_events` inside their
+transaction; Postgres delivers the NOTIFY on commit (and drops it on
+rollback). Each worker holds ONE dedicated LISTEN connection, outside the
+SQLAlchemy pool, and fans notifications out to in-memory subscriber queues, so
+open streams cost a queue each and no database connection.
+
+Payloads are "<user_id>:<json list of events>", which lets the listener skip
+users without subscribers without parsing JSON. Subscribers that fall behind,
+and all subscribers after the LISTEN connection is re-established, receive a
+`resync` event: some changes may have been missed and the client should catch
+up through `GET /api/v1/contacts/changes`.
+"""
+
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants import (
+    CHANGE_FEED_CONNECT_TIMEOUT,
+    CHANGE_FEED_HEARTBEAT_SECONDS,
+    CHANGE_FEED_QUEUE_SIZE,
+)
+from app.db.get_session import engine
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "contact_changes"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+RECONNECT_MAX_DELAY = 30.0
+
+
+def _sse(event_type: str, data: dict) -> str:
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+RESYNC = _sse("resync", {})
+
+
+async def publish_contact_events(db: AsyncSession, user_id: int, events: list[dict]) -> None:
+    """NOTIFY `events` (dicts with `type` and `data`) for `user_id` on commit.
+
+    Call inside the write's transaction, after its flush, so the NOTIFY runs
+    on the primary (replicas reject it). Batches too large for one payload
+    are replaced by a single `resync` event.
+    """
+    payload = f"{user_id}:{json.dumps(events, default=str, separators=(',', ':'))}"
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        payload = f'{user_id}:[{{"type":"resync","data":{{}}}}]'
+    await db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+class Subscription:
+    """One open stream: a bounded queue of preformatted SSE messages."""
+
+    __slots__ = ("user_id", "queue")
+
+    def __init__(self, user_id: int, maxsize: int):
+        self.user_id = user_id
+        self.queue: asyncio.Queue[str] = asyncio.Queue(maxsize)
+
+    def push(self, message: str) -> bool:
+        """Queue `message`; returns False if the backlog had to be dropped."""
+        try:
+            self.queue.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            # Too slow to keep up: drop the backlog, ask the client to resync
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+            return False
+
+
+class ChangeFeed:
+    """Per-worker LISTEN connection and the subscribers it fans out to."""
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self._subscribers: dict[int, set[Subscription]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._listening = asyncio.Event()
+        self.delivered = 0
+        self.overflows = 0
+        self.reconnects = 0
+
+    async def subscribe(self, user_id: int) -> Subscription:
+        """Register a subscriber, starting the listener on first use.
+
+        Waits up to `CHANGE_FEED_CONNECT_TIMEOUT` for LISTEN to be active;
+        if it isn't yet, the subscriber gets a `resync` once it is.
+        """
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        try:
+            await asyncio.wait_for(self._listening.wait(), CHANGE_FEED_CONNECT_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Change feed not listening yet; subscriber will get a resync")
+        subscription = Subscription(user_id, CHANGE_FEED_QUEUE_SIZE)
+        self._subscribers.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscribers = self._subscribers.get(subscription.user_id)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+
+    async def stream(self, user_id: int) -> AsyncIterator[str]:
+        """SSE body for one client: events as they come, keep-alive comments
+        while idle. Unsubscribes when the client goes away.
+        """
+        subscription = await self.subscribe(user_id)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    yield await asyncio.wait_for(
+                        subscription.queue.get(), CHANGE_FEED_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def _on_notify(self, _conn, _pid: int, _channel: str, payload: str) -> None:
+        user_id, _, body = payload.partition(":")
+        try:
+            subscribers = self._subscribers.get(int(user_id))
+            if not subscribers:
+                return
+            messages = [_sse(e["type"], e["data"]) for e in json.loads(body)]
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring malformed change notification: {e}")
+            return
+        for subscription in list(subscribers):
+            for message in messages:
+                if subscription.push(message):
+                    self.delivered += 1
+                else:
+                    self.overflows += 1
+                    break
+
+    def _broadcast(self, message: str) -> None:
+        for subscribers in self._subscribers.values():
+            for subscription in subscribers:
+                subscription.push(message)
+
+    async def _run(self) -> None:
+        """Keep one LISTEN connection alive, reconnecting with backoff."""
+        import asyncpg
+
+        delay = 1.0
+        while True:
+            try:
+                conn = await asyncpg.connect(self.dsn, timeout=CHANGE_FEED_CONNECT_TIMEOUT)
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+                logger.warning(f"Change feed connect failed, retrying in {delay:.0f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+                continue
+            try:
+                await conn.add_listener(CHANNEL, self._on_notify)
+                delay = 1.0
+                self._listening.set()
+                # Anything sent while nobody was listening is lost
+                self._broadcast(RESYNC)
+                while True:
+                    # Liveness probe: notices half-open connections too
+                    await asyncio.sleep(CHANGE_FEED_HEARTBEAT_SECONDS)
+                    await conn.execute("SELECT 1", timeout=CHANGE_FEED_CONNECT_TIMEOUT)
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                logger.warning(f"Change feed connection lost, reconnecting: {e}")
+                self.reconnects += 1
+            finally:
+                self._listening.clear()
+                conn.terminate()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "listening": self._listening.is_set(),
+            "users": len(self._subscribers),
+            "subscribers": sum(len(s) for s in self._subscribers.values()),
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+            "reconnects": self.reconnects,
+        }
+
+
+# LISTEN always goes to the primary; replicas don't receive notifications
+change_feed = ChangeFeed(
+    engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+)
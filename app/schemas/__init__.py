@@ -1,4 +1,16 @@
-from .contact import ContactBase, ContactCreate, ContactRead, ContactUpdate
+from .contact import (
+    ContactBase,
+    ContactChange,
+    ContactChanges,
+    ContactCreate,
+    ContactMergeRequest,
+    ContactRead,
+    ContactSuggestion,
+    ContactUpdate,
+    DuplicateGroupRead,
+    PhoneLookupRequest,
+    PhoneLookupResult,
+)
 from .user import (
     EmailVerificationRequest,
     Token,
@@ -10,10 +22,17 @@ from .user import (
 
 __all__ = [
     "ContactBase",
+    "ContactChange",
+    "ContactChanges",
     "ContactCreate",
+    "ContactMergeRequest",
     "ContactRead",
+    "ContactSuggestion",
     "ContactUpdate",
+    "DuplicateGroupRead",
     "EmailVerificationRequest",
+    "PhoneLookupRequest",
+    "PhoneLookupResult",
     "Token",
     "TokenData",
     "UserBase",
@@ -1,5 +1,5 @@
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from typing import List, Optional
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
 
@@ -9,6 +9,7 @@ from ..constants import (
     EMAIL_MAX_LENGTH,
     PHONE_NUMBER_MAX_LENGTH,
     ADDITIONAL_DATA_MAX_LENGTH,
+    PHONE_LOOKUP_MAX_BATCH,
 )
 
 from ..validators import validate_phone_digits
@@ -46,3 +47,57 @@ class ContactRead(ContactBase):
     id: int
 
     model_config = {"from_attributes": True}
+
+
+class ContactSuggestion(BaseModel):
+    """Typeahead result: just enough to render and pick a contact."""
+
+    id: int
+    first_name: str
+    last_name: str
+    email: str
+
+    model_config = {"from_attributes": True}
+
+
+class DuplicateGroupRead(BaseModel):
+    """A set of contacts that likely describe the same person."""
+
+    contact_ids: List[int]
+    score: float = Field(..., description="Lowest pair score in the group (0-1)")
+    reasons: List[str] = Field(..., description="Matching keys: email, phone, name")
+
+
+class ContactMergeRequest(BaseModel):
+    contact_ids: List[int] = Field(..., min_length=2)
+    keep_id: Optional[int] = Field(
+        None, description="Contact to keep; defaults to the lowest id"
+    )
+
+
+class PhoneLookupRequest(BaseModel):
+    phones: List[str] = Field(..., min_length=1, max_length=PHONE_LOOKUP_MAX_BATCH)
+
+
+class PhoneLookupResult(BaseModel):
+    """Contacts matching one looked-up number (in the format it was sent)."""
+
+    phone: str
+    contacts: List[ContactRead]
+
+
+class ContactChange(ContactRead):
+    updated_at: datetime
+
+
+class ContactChanges(BaseModel):
+    """One page of a delta sync.
+
+    Apply `updated` (upserts) and `deleted` (contact ids), then pass `cursor`
+    as `since` on the next call. Keep paging while `has_more` is true.
+    """
+
+    updated: List[ContactChange]
+    deleted: List[int]
+    cursor: str
+    has_more: bool
@@ -0,0 +1,138 @@
+"""Nightly birthday digest: `python -m app.scripts.birthday_digest`.
+
+Finds every contact with a birthday in the coming window across all users in
+one indexed, streamed query (`crud.contact.stream_upcoming_birthdays`), groups
+the rows per owner and queues one digest email per owner. A small pool of
+senders drains the queue while the query keeps streaming. Run time and rows
+per second are reported at the end.
+
+    python -m app.scripts.birthday_digest --days 7 --senders 8
+    python -m app.scripts.birthday_digest --dry-run   # count only, send nothing
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import date
+
+from app.crud.contact import next_birthday, stream_upcoming_birthdays
+from app.db.get_session import SessionLocal, engine, replica_set
+from app.services.email import send_birthday_digest_email
+
+logger = logging.getLogger("app.scripts.birthday_digest")
+
+
+@dataclass
+class Digest:
+    owner_email: str
+    contacts: list[dict]
+
+
+@dataclass
+class Stats:
+    rows: int = 0
+    owners: int = 0
+    sent: int = 0
+    failed: int = 0
+
+
+def _build_digest(owner_email: str, rows: list, today: date) -> Digest:
+    contacts = []
+    for row in rows:
+        upcoming = next_birthday(row.birthday, today)
+        contacts.append(
+            {
+                "first_name": row.first_name,
+                "last_name": row.last_name,
+                "next_birthday": upcoming,
+                "days_until": (upcoming - today).days,
+            }
+        )
+    contacts.sort(key=lambda c: c["days_until"])
+    return Digest(owner_email, contacts)
+
+
+async def produce(queue: asyncio.Queue, stats: Stats, today: date, days: int, batch_size: int) -> None:
+    """Stream the window and put one Digest per owner on the queue."""
+    current_user_id = None
+    current_email = None
+    current_rows: list = []
+
+    async def flush() -> None:
+        if current_rows:
+            stats.owners += 1
+            await queue.put(_build_digest(current_email, current_rows, today))
+
+    # Read-only: served from a replica when replicas are configured
+    async with SessionLocal() as db:
+        async for batch in stream_upcoming_birthdays(db, today, days, batch_size):
+            stats.rows += len(batch)
+            for row in batch:
+                if row.user_id != current_user_id:
+                    await flush()
+                    current_user_id, current_email, current_rows = row.user_id, row.owner_email, []
+                current_rows.append(row)
+        await flush()
+
+
+async def send(queue: asyncio.Queue, stats: Stats, days: int, dry_run: bool) -> None:
+    while True:
+        digest = await queue.get()
+        try:
+            if not dry_run:
+                await send_birthday_digest_email(digest.owner_email, digest.contacts, days)
+            stats.sent += 1
+        except Exception as e:
+            stats.failed += 1
+            logger.error(f"Failed to send birthday digest to {digest.owner_email}: {e}")
+        finally:
+            queue.task_done()
+
+
+async def run(days: int, senders: int, batch_size: int, dry_run: bool) -> Stats:
+    today = date.today()
+    stats = Stats()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=senders * 4)
+    workers = [asyncio.create_task(send(queue, stats, days, dry_run)) for _ in range(senders)]
+
+    started = time.perf_counter()
+    try:
+        await produce(queue, stats, today, days, batch_size)
+        query_elapsed = time.perf_counter() - started
+        await queue.join()
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await engine.dispose()
+        await replica_set.dispose()
+    elapsed = time.perf_counter() - started
+
+    logger.info(
+        f"Birthday digest for {today} +{days}d: {stats.rows} contacts, "
+        f"{stats.owners} owners, {stats.sent} digests {'counted' if dry_run else 'sent'}, "
+        f"{stats.failed} failed"
+    )
+    logger.info(
+        f"Query/stream {query_elapsed:.2f}s, total {elapsed:.2f}s, "
+        f"{stats.rows / query_elapsed if query_elapsed else 0:,.0f} rows/s"
+    )
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=int, default=7, help="window length in days")
+    parser.add_argument("--senders", type=int, default=8, help="concurrent email senders")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="rows fetched per round trip")
+    parser.add_argument("--dry-run", action="store_true", help="don't send any email")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    stats = asyncio.run(run(args.days, args.senders, args.batch_size, args.dry_run))
+    raise SystemExit(1 if stats.failed else 0)
+
+
+if __name__ == "__main__":
+    main()
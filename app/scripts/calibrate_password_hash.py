@@ -0,0 +1,100 @@
+"""Pick password-hash costs for a target latency: `python -m app.scripts.calibrate_password_hash`.
+
+Times hashing on this host (run it where the API runs) and prints the
+settings to put in `.env`. bcrypt's cost doubles the work per step, so the
+first cost at or above the target is chosen. For argon2id the memory and
+parallelism are kept (ARGON2_MEMORY_COST_KIB, ARGON2_PARALLELISM) and the
+number of passes is raised until the target is reached. Existing hashes are
+upgraded on each user's next login.
+
+    python -m app.scripts.calibrate_password_hash --target-ms 250
+    python -m app.scripts.calibrate_password_hash --scheme argon2id --target-ms 300
+"""
+
+import argparse
+import logging
+import os
+import time
+
+import bcrypt
+
+from app.constants import ARGON2_MEMORY_COST_KIB, ARGON2_PARALLELISM, PASSWORD_HASH_SCHEME
+
+logger = logging.getLogger("app.scripts.calibrate_password_hash")
+
+BCRYPT_MIN_ROUNDS = 4
+BCRYPT_MAX_ROUNDS = 20
+ARGON2_MAX_TIME_COST = 50
+
+
+def _time_ms(hash_once, samples: int) -> float:
+    """Median milliseconds of `samples` calls."""
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hash_once()
+        timings.append((time.perf_counter() - started) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate_bcrypt(target_ms: float, samples: int) -> dict:
+    password = os.urandom(32)
+    for rounds in range(BCRYPT_MIN_ROUNDS, BCRYPT_MAX_ROUNDS + 1):
+        salt = bcrypt.gensalt(rounds=rounds)
+        ms = _time_ms(lambda: bcrypt.hashpw(password, salt), samples)
+        logger.info(f"bcrypt rounds={rounds}: {ms:.1f} ms")
+        if ms >= target_ms:
+            break
+    return {"PASSWORD_HASH_SCHEME": "bcrypt", "BCRYPT_ROUNDS": rounds}
+
+
+def calibrate_argon2id(target_ms: float, samples: int) -> dict:
+    try:
+        from argon2 import PasswordHasher, Type
+    except ImportError:
+        raise SystemExit("argon2id needs the argon2-cffi package")
+
+    password = os.urandom(32)
+    for time_cost in range(1, ARGON2_MAX_TIME_COST + 1):
+        hasher = PasswordHasher(
+            time_cost=time_cost,
+            memory_cost=ARGON2_MEMORY_COST_KIB,
+            parallelism=ARGON2_PARALLELISM,
+            type=Type.ID,
+        )
+        ms = _time_ms(lambda: hasher.hash(password), samples)
+        logger.info(
+            f"argon2id t={time_cost} m={ARGON2_MEMORY_COST_KIB}KiB "
+            f"p={ARGON2_PARALLELISM}: {ms:.1f} ms"
+        )
+        if ms >= target_ms:
+            break
+    return {
+        "PASSWORD_HASH_SCHEME": "argon2id",
+        "ARGON2_TIME_COST": time_cost,
+        "ARGON2_MEMORY_COST_KIB": ARGON2_MEMORY_COST_KIB,
+        "ARGON2_PARALLELISM": ARGON2_PARALLELISM,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scheme", choices=["bcrypt", "argon2id"], default=PASSWORD_HASH_SCHEME
+    )
+    parser.add_argument(
+        "--target-ms", type=float, default=250, help="hash time to reach, in milliseconds"
+    )
+    parser.add_argument("--samples", type=int, default=5, help="timings per cost (median)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    if args.scheme == "argon2id":
+        settings = calibrate_argon2id(args.target_ms, args.samples)
+    else:
+        settings = calibrate_bcrypt(args.target_ms, args.samples)
+    print("\n".join(f"{name}={value}" for name, value in settings.items()))
+
+
+if __name__ == "__main__":
+    main()
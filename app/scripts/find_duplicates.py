@@ -0,0 +1,113 @@
+"""Batch duplicate-contact detection: `python -m app.scripts.find_duplicates`.
+
+Streams every user's contacts (ordered by owner) in one query, finds likely
+duplicate groups per user with `services.duplicates.find_duplicate_groups`,
+and reports them. With `--apply`, groups scoring at least `--merge-min-score`
+are merged, each group in its own transaction.
+
+    python -m app.scripts.find_duplicates                     # report only
+    python -m app.scripts.find_duplicates --user-id 42
+    python -m app.scripts.find_duplicates --apply --merge-min-score 0.9
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from app.crud.contact import get_contact_rows_for_dedupe, merge_contacts, stream_contact_rows_for_dedupe
+from app.db.get_session import SessionLocal, engine, replica_set
+from app.db.routing import USE_PRIMARY
+from app.services.duplicates import DEFAULT_MIN_SCORE, find_duplicate_groups
+
+logger = logging.getLogger("app.scripts.find_duplicates")
+
+
+@dataclass
+class Stats:
+    users: int = 0
+    contacts: int = 0
+    groups: int = 0
+    duplicates: int = 0
+    merged_groups: int = 0
+
+
+async def _handle_user(user_id: int, rows: list, stats: Stats, args) -> None:
+    stats.users += 1
+    stats.contacts += len(rows)
+    groups = find_duplicate_groups(rows, args.min_score)
+    for group in groups:
+        stats.groups += 1
+        stats.duplicates += len(group.contact_ids) - 1
+        logger.info(
+            f"user {user_id}: contacts {group.contact_ids} "
+            f"score={group.score} ({', '.join(group.reasons)})"
+        )
+        if args.apply and group.score >= args.merge_min_score:
+            async with SessionLocal() as db:
+                db.info[USE_PRIMARY] = True
+                try:
+                    await merge_contacts(
+                        db,
+                        user_id=user_id,
+                        keep_id=group.contact_ids[0],
+                        merge_ids=group.contact_ids[1:],
+                    )
+                    stats.merged_groups += 1
+                except ValueError:
+                    # Contacts changed since they were read; skip the group
+                    logger.warning(f"user {user_id}: group {group.contact_ids} changed, skipped")
+
+
+async def run(args) -> Stats:
+    stats = Stats()
+    started = time.perf_counter()
+    try:
+        if args.user_id is not None:
+            async with SessionLocal() as db:
+                rows = await get_contact_rows_for_dedupe(db, args.user_id)
+            await _handle_user(args.user_id, rows, stats, args)
+        else:
+            current_user_id: Optional[int] = None
+            current_rows: list = []
+            async with SessionLocal() as db:
+                async for batch in stream_contact_rows_for_dedupe(db, args.batch_size):
+                    for row in batch:
+                        if row.user_id != current_user_id:
+                            if current_rows:
+                                await _handle_user(current_user_id, current_rows, stats, args)
+                            current_user_id, current_rows = row.user_id, []
+                        current_rows.append(row)
+                if current_rows:
+                    await _handle_user(current_user_id, current_rows, stats, args)
+    finally:
+        await engine.dispose()
+        await replica_set.dispose()
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Scanned {stats.contacts} contacts of {stats.users} users in {elapsed:.2f}s "
+        f"({stats.contacts / elapsed if elapsed else 0:,.0f} contacts/s): "
+        f"{stats.groups} duplicate groups, {stats.duplicates} redundant contacts, "
+        f"{stats.merged_groups} groups merged"
+    )
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", type=int, help="only scan this user")
+    parser.add_argument("--min-score", type=float, default=DEFAULT_MIN_SCORE, help="report threshold")
+    parser.add_argument("--apply", action="store_true", help="merge high-scoring groups")
+    parser.add_argument("--merge-min-score", type=float, default=0.9, help="merge threshold")
+    parser.add_argument("--batch-size", type=int, default=10_000, help="rows fetched per round trip")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+"""Fill a dev database with synthetic users and contacts: `python -m app.scripts.generate_dataset`.
+
+For performance testing at production scale. Creates `--users` users, each
+with a skewed number of contacts: counts follow a Pareto distribution with
+mean `--contacts-per-user`, so most address books are small and a few are
+huge (capped at `--max-contacts`). Names, email domains and phone formats are
+drawn from frequency-weighted lists, and about 70% of contacts have a
+birthday (ages 18-85, peaking in the thirties).
+
+Output is deterministic for a given `--seed` (and the same arguments): each
+user's contacts come from their own generator, so the number of worker
+processes doesn't change the data. Only database ids depend on the existing
+rows.
+
+Rows are bulk-loaded with binary `COPY` into the `users` and `contacts`
+tables. Server defaults fill in ids, `updated_at` and the generated columns.
+Contacts are loaded by `--workers` processes in parallel, one connection
+each. Their users sit in different hash partitions, so the processes don't
+contend. Finish with ANALYZE.
+
+    python -m app.scripts.generate_dataset --users 1000 --contacts-per-user 200
+    python -m app.scripts.generate_dataset --users 100000 --contacts-per-user 500 --workers 8 --seed 7
+"""
+
+import argparse
+import asyncio
+import itertools
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+
+logger = logging.getLogger("app.scripts.generate_dataset")
+
+# Fixed, so the same seed gives the same birthdays whenever it runs
+REFERENCE_DATE = date(2026, 1, 1)
+
+CONTACT_COLUMNS = [
+    "first_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "birthday",
+    "additional_data",
+    "user_id",
+]
+USER_COLUMNS = ["id", "email", "hashed_password", "is_verified", "is_active"]
+
+FIRST_NAMES = [
+    "Olena", "John", "Maria", "Andrii", "Anna", "Oleksandr", "James", "Iryna",
+    "Dmytro", "Mary", "Michael", "Natalia", "Taras", "Sophia", "David", "Yulia",
+    "Serhii", "Emma", "Robert", "Kateryna", "William", "Tetiana", "Petro", "Olivia",
+    "Mykola", "Linda", "Ivan", "Oksana", "Thomas", "Svitlana", "Daniel", "Halyna",
+    "Bohdan", "Chloe", "Yaroslav", "Zoriana", "Lucas", "Marta", "Roman", "Ines",
+]
+LAST_NAMES = [
+    "Melnyk", "Smith", "Shevchenko", "Johnson", "Kovalenko", "Bondarenko",
+    "Williams", "Tkachenko", "Brown", "Kravchenko", "Oliinyk", "Jones", "Koval",
+    "Garcia", "Shevchuk", "Miller", "Polishchuk", "Davis", "Lysenko", "Rodriguez",
+    "Marchenko", "Wilson", "Savchenko", "Moroz", "Anderson", "Rudenko", "Taylor",
+    "Pavlenko", "Kowalski", "Nowak", "Martin", "Hnatiuk", "Lee", "Kuzmenko",
+    "Dubois", "Petrenko", "Schmidt", "Ivanenko", "Rossi", "Zhuk",
+]
+EMAIL_DOMAINS = [
+    "gmail.com", "ukr.net", "outlook.com", "yahoo.com", "i.ua", "icloud.com",
+    "proton.me", "example.com", "company.com.ua", "meta.ua",
+]
+NOTES = [
+    "met at the conference",
+    "colleague",
+    "family",
+    "university friend",
+    "neighbour",
+    "call after 6 pm",
+    "prefers Telegram",
+    "dentist",
+    "client since 2019",
+]
+
+# Phone numbers by country, by share; `s` is 9 subscriber digits. Stored the
+# way the API accepts them (ContactCreate: digits only, 12-14 of them)
+PHONE_FORMATS = [
+    (lambda s: f"380{s}", 70),  # Ukraine
+    (lambda s: f"00380{s}", 10),  # Ukraine, international prefix
+    (lambda s: f"447{s}", 8),  # UK mobile
+    (lambda s: f"4915{s}", 6),  # Germany mobile
+    (lambda s: f"3538{s}", 6),  # Ireland mobile
+]
+
+
+def _zipf_cum_weights(count: int, exponent: float = 1.1) -> list[float]:
+    return list(itertools.accumulate(1 / rank**exponent for rank in range(1, count + 1)))
+
+
+FIRST_NAME_WEIGHTS = _zipf_cum_weights(len(FIRST_NAMES))
+LAST_NAME_WEIGHTS = _zipf_cum_weights(len(LAST_NAMES))
+DOMAIN_WEIGHTS = _zipf_cum_weights(len(EMAIL_DOMAINS), 1.4)
+PHONE_FORMAT_FUNCS = [fmt for fmt, _ in PHONE_FORMATS]
+PHONE_FORMAT_WEIGHTS = list(itertools.accumulate(share for _, share in PHONE_FORMATS))
+
+
+def contact_counts(users: int, mean: int, alpha: float, cap: int, seed: int) -> list[int]:
+    """Contacts per user: Pareto(alpha) scaled to `mean`, capped at `cap`."""
+    rnd = random.Random(seed)
+    scale = mean * (alpha - 1) / alpha  # Pareto(alpha) with x_m=1 has mean alpha/(alpha-1)
+    return [min(cap, int(scale * rnd.paretovariate(alpha))) for _ in range(users)]
+
+
+def contact_records(seed: int, user_index: int, user_id: int, count: int) -> list[tuple]:
+    """The contacts of one user, in CONTACT_COLUMNS order."""
+    rnd = random.Random(seed * 2**32 + user_index)
+    firsts = rnd.choices(FIRST_NAMES, cum_weights=FIRST_NAME_WEIGHTS, k=count)
+    lasts = rnd.choices(LAST_NAMES, cum_weights=LAST_NAME_WEIGHTS, k=count)
+    domains = rnd.choices(EMAIL_DOMAINS, cum_weights=DOMAIN_WEIGHTS, k=count)
+    phones = rnd.choices(PHONE_FORMAT_FUNCS, cum_weights=PHONE_FORMAT_WEIGHTS, k=count)
+    records = []
+    for n, (first, last, domain, phone) in enumerate(zip(firsts, lasts, domains, phones)):
+        birthday = None
+        if rnd.random() < 0.7:
+            age_days = int(rnd.triangular(18, 85, 33) * 365.25)
+            birthday = REFERENCE_DATE - timedelta(days=age_days)
+        records.append(
+            (
+                first,
+                last,
+                f"{first}.{last}{n}@{domain}".lower(),
+                phone(f"{rnd.randrange(10**9):09d}"),
+                birthday,
+                rnd.choice(NOTES) if rnd.random() < 0.15 else None,
+                user_id,
+            )
+        )
+    return records
+
+
+async def _connect(dsn: str):
+    import asyncpg
+
+    conn = await asyncpg.connect(dsn)
+    # Dev data: losing the last commits in a crash is fine, waiting on fsync isn't
+    await conn.execute("SET synchronous_commit = off")
+    return conn
+
+
+async def _copy_contacts(dsn: str, shard: list[tuple], seed: int, batch_rows: int) -> int:
+    conn = await _connect(dsn)
+    try:
+        copied = 0
+        batch: list[tuple] = []
+        for user_index, user_id, count in shard:
+            batch.extend(contact_records(seed, user_index, user_id, count))
+            if len(batch) >= batch_rows:
+                await conn.copy_records_to_table("contacts", records=batch, columns=CONTACT_COLUMNS)
+                copied += len(batch)
+                batch = []
+        if batch:
+            await conn.copy_records_to_table("contacts", records=batch, columns=CONTACT_COLUMNS)
+            copied += len(batch)
+        return copied
+    finally:
+        await conn.close()
+
+
+def load_shard(dsn: str, shard: list[tuple], seed: int, batch_rows: int) -> int:
+    """Worker process entry point: generate and COPY one shard of users' contacts."""
+    return asyncio.run(_copy_contacts(dsn, shard, seed, batch_rows))
+
+
+async def create_users(dsn: str, args, hashed_password: str) -> list[int]:
+    """COPY the users in; return their ids in user-index order."""
+    conn = await _connect(dsn)
+    try:
+        taken = await conn.fetchval(
+            "SELECT count(*) FROM users WHERE email LIKE $1", f"{args.prefix}.{args.seed}.%"
+        )
+        if taken:
+            raise SystemExit(
+                f"Users for prefix {args.prefix!r} and seed {args.seed} already exist; "
+                "pick another --seed or --prefix"
+            )
+        # Reserve ids up front so contacts can reference them without a lookup
+        ids = [
+            row[0]
+            for row in await conn.fetch(
+                "SELECT nextval(pg_get_serial_sequence('users', 'id')) "
+                "FROM generate_series(1, $1)",
+                args.users,
+            )
+        ]
+        records = [
+            (user_id, f"{args.prefix}.{args.seed}.{i}@{args.email_domain}", hashed_password, True, True)
+            for i, user_id in enumerate(ids)
+        ]
+        await conn.copy_records_to_table("users", records=records, columns=USER_COLUMNS)
+        return ids
+    finally:
+        await conn.close()
+
+
+async def analyze(dsn: str) -> None:
+    conn = await _connect(dsn)
+    try:
+        # Autovacuum never analyzes the partitioned parent itself
+        await conn.execute("ANALYZE users")
+        await conn.execute("ANALYZE contacts")
+    finally:
+        await conn.close()
+
+
+def run(args) -> None:
+    from app.db.get_session import engine
+    from app.utils.auth import get_password_hash
+
+    dsn = engine.url.set(drivername="postgresql").render_as_string(hide_password=False)
+    counts = contact_counts(
+        args.users, args.contacts_per_user, args.alpha, args.max_contacts, args.seed
+    )
+    total = sum(counts)
+    logger.info(
+        f"Generating {args.users} users and {total:,} contacts "
+        f"(largest address book: {max(counts, default=0):,}) with seed {args.seed}"
+    )
+
+    started = time.perf_counter()
+    user_ids = asyncio.run(create_users(dsn, args, get_password_hash(args.password)))
+    logger.info(f"Users loaded in {time.perf_counter() - started:.1f}s")
+
+    # Many more shards than workers: the skew would otherwise leave one
+    # worker with most of the rows
+    users = list(zip(range(args.users), user_ids, counts))
+    shard_count = max(1, min(len(users), args.workers * 16))
+    shards = [users[i::shard_count] for i in range(shard_count)]
+
+    started = time.perf_counter()
+    copied = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(load_shard, dsn, shard, args.seed, args.batch_rows) for shard in shards
+        ]
+        for future in as_completed(futures):
+            copied += future.result()
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"{copied:,}/{total:,} contacts ({copied / elapsed if elapsed else 0:,.0f} rows/s)"
+            )
+
+    asyncio.run(analyze(dsn))
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"Done: {copied:,} contacts in {elapsed:.1f}s. Log in as "
+        f"{args.prefix}.{args.seed}.0@{args.email_domain} with password {args.password!r}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument(
+        "--contacts-per-user", type=int, default=100, help="mean address book size"
+    )
+    parser.add_argument(
+        "--alpha", type=float, default=1.5, help="Pareto shape; lower is more skewed (> 1)"
+    )
+    parser.add_argument("--max-contacts", type=int, default=200_000, help="largest address book")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--batch-rows", type=int, default=50_000, help="rows per COPY")
+    parser.add_argument("--prefix", default="synthetic", help="user email prefix")
+    # Must pass EmailStr: special-use domains like .test are rejected
+    parser.add_argument("--email-domain", default="example.com")
+    parser.add_argument("--password", default="password", help="password of every user")
+    args = parser.parse_args()
+    if args.alpha <= 1:
+        parser.error("--alpha must be greater than 1")
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Report import time per module for the API process.
+
+Runs `python -X importtime -c "import app.main"` in a fresh interpreter and
+summarizes the output:
+
+    python -m app.scripts.import_profile            # top 25 modules + packages
+    python -m app.scripts.import_profile --top 50 --module app.main
+"""
+
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from typing import NamedTuple
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def collect(module: str) -> list[ImportTiming]:
+    """Import `module` in a subprocess and parse the `-X importtime` lines."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"Importing {module} failed")
+
+    timings = []
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings.append(
+            ImportTiming(name.strip(), int(self_us), int(cumulative_us), depth)
+        )
+    return timings
+
+
+def report(timings: list[ImportTiming], top: int) -> None:
+    total_us = sum(t.self_us for t in timings)
+    print(f"Total import time: {total_us / 1000:.1f} ms across {len(timings)} modules\n")
+
+    print(f"Top {top} modules by cumulative time:")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for t in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        print(f"{t.cumulative_us / 1000:>14.1f} {t.self_us / 1000:>9.1f}  {t.module}")
+
+    # Self time summed per top-level package shows which dependency costs most
+    per_package: dict[str, int] = defaultdict(int)
+    for t in timings:
+        per_package[t.module.split(".")[0]] += t.self_us
+    print(f"\nTop {top} top-level packages by self time:")
+    print(f"{'self ms':>14} {'share':>9}  package")
+    for package, us in sorted(per_package.items(), key=lambda kv: kv[1], reverse=True)[:top]:
+        print(f"{us / 1000:>14.1f} {us / total_us:>9.1%}  {package}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="app.main", help="module to import")
+    parser.add_argument("--top", type=int, default=25, help="rows per table")
+    args = parser.parse_args()
+    report(collect(args.module), args.top)
+
+
+if __name__ == "__main__":
+    main()
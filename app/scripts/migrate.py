@@ -0,0 +1,133 @@
+"""Startup migration step: `python -m app.scripts.migrate`.
+
+Safe to run from several containers at once. The fast path reads the head
+revision straight from the migration files (no Alembic environment, no model
+imports) and compares it with `alembic_version`; only when they differ does it
+take a Postgres advisory lock, re-check and run `alembic upgrade head`.
+"""
+
+import logging
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+import psycopg2
+from dotenv import load_dotenv
+
+logger = logging.getLogger("app.scripts.migrate")
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+VERSIONS_DIR = PROJECT_ROOT / "migrations" / "versions"
+ALEMBIC_INI = PROJECT_ROOT / "alembic.ini"
+
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_KEY = 7_311_004_226
+
+_REVISION_RE = re.compile(r"^revision\s*(?::[^=]*)?=\s*['\"]([^'\"]+)['\"]", re.M)
+_DOWN_REVISION_RE = re.compile(r"^down_revision\s*(?::[^=]*)?=\s*(.+)$", re.M)
+_QUOTED_RE = re.compile(r"['\"]([^'\"]+)['\"]")
+
+
+def get_database_url() -> str:
+    """Return a libpq URL built the same way as `migrations/env.py`."""
+    database_url = os.getenv("SQLALCHEMY_DATABASE_URL")
+    if not database_url:
+        POSTGRES_USER = os.getenv("POSTGRES_USER")
+        POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD")
+        POSTGRES_DB = os.getenv("POSTGRES_DB")
+        ALEMBIC_POSTGRES_HOST = os.getenv("ALEMBIC_POSTGRES_HOST", "db")
+        database_url = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{ALEMBIC_POSTGRES_HOST}:5432/{POSTGRES_DB}"
+    # Drop the SQLAlchemy driver suffix (postgresql+psycopg2:// -> postgresql://)
+    return re.sub(r"^postgresql\+\w+://", "postgresql://", database_url)
+
+
+def get_head_revisions() -> set[str]:
+    """Parse revision ids from the migration files without importing them."""
+    revisions: set[str] = set()
+    parents: set[str] = set()
+    for path in VERSIONS_DIR.glob("*.py"):
+        source = path.read_text(encoding="utf-8")
+        match = _REVISION_RE.search(source)
+        if not match:
+            continue
+        revisions.add(match.group(1))
+        down = _DOWN_REVISION_RE.search(source)
+        if down:
+            parents.update(_QUOTED_RE.findall(down.group(1)))
+    return revisions - parents
+
+
+def get_current_revisions(conn) -> set[str]:
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass('alembic_version')")
+        if cur.fetchone()[0] is None:
+            return set()
+        cur.execute("SELECT version_num FROM alembic_version")
+        return {row[0] for row in cur.fetchall()}
+
+
+def run_upgrade() -> None:
+    # Imported lazily: loading Alembic and the migration environment is the
+    # slow part we skip on the fast path
+    from alembic import command
+    from alembic.config import Config
+
+    command.upgrade(Config(str(ALEMBIC_INI)), "head")
+
+
+def migrate() -> None:
+    started = time.perf_counter()
+    heads = get_head_revisions()
+
+    conn = psycopg2.connect(get_database_url())
+    conn.autocommit = True
+    try:
+        if len(heads) == 1 and get_current_revisions(conn) == heads:
+            logger.info(
+                f"Database already at head {next(iter(heads))} "
+                f"(checked in {time.perf_counter() - started:.3f}s)"
+            )
+            return
+
+        lock_started = time.perf_counter()
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+        lock_wait = time.perf_counter() - lock_started
+        try:
+            # Another container may have finished the upgrade while we waited
+            if len(heads) == 1 and get_current_revisions(conn) == heads:
+                logger.info(
+                    f"Migrations applied by another process "
+                    f"(waited {lock_wait:.3f}s for lock, total {time.perf_counter() - started:.3f}s)"
+                )
+                return
+
+            upgrade_started = time.perf_counter()
+            run_upgrade()
+            logger.info(
+                f"Migrations applied: lock wait {lock_wait:.3f}s, "
+                f"upgrade {time.perf_counter() - upgrade_started:.3f}s, "
+                f"total {time.perf_counter() - started:.3f}s"
+            )
+        finally:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+    finally:
+        conn.close()
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    load_dotenv()  # take environment variables from .env file
+    try:
+        migrate()
+    except Exception as e:
+        logger.error(f"Migration failed: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
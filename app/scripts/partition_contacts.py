@@ -0,0 +1,148 @@
+"""Online copy of contacts into the partitioned table: `python -m app.scripts.partition_contacts`.
+
+Used between the two partitioning migrations (see README, "Partitioned
+contacts"). While revision 1b6d4f9e2a7c's trigger mirrors every new write into
+`contacts_partitioned`, `backfill` copies the existing rows in id order, one
+short transaction per batch, so the application keeps running. Source rows
+are locked FOR SHARE while their batch is copied, so a concurrent update or
+delete waits for the batch and its mirrored write lands after the copy. The
+progress is stored in `contacts_partition_backfill`; an interrupted run
+resumes where it stopped.
+
+    python -m app.scripts.partition_contacts status
+    python -m app.scripts.partition_contacts backfill --batch-size 5000 --pause 0.05
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+from sqlalchemy import text
+
+from app.db.get_session import engine
+
+logger = logging.getLogger("app.scripts.partition_contacts")
+
+# Arbitrary, fixed key: one backfill at a time
+BACKFILL_LOCK_KEY = 7_311_004_227
+
+COLUMNS = (
+    "id, first_name, last_name, email, phone_number, birthday, "
+    "additional_data, user_id, updated_at"
+)
+
+COPY_BATCH = text(
+    f"""
+    WITH batch AS (
+        SELECT {COLUMNS} FROM contacts
+        WHERE id > :last_id
+        ORDER BY id
+        LIMIT :batch_size
+        FOR SHARE
+    ), copied AS (
+        INSERT INTO contacts_partitioned ({COLUMNS})
+        SELECT {COLUMNS} FROM batch
+        ON CONFLICT (user_id, id) DO NOTHING
+        RETURNING 1
+    )
+    SELECT (SELECT max(id) FROM batch) AS max_id,
+           (SELECT count(*) FROM batch) AS rows,
+           (SELECT count(*) FROM copied) AS copied
+    """
+)
+
+
+async def _shadow_exists(conn) -> bool:
+    result = await conn.execute(text("SELECT to_regclass('contacts_partition_backfill')"))
+    return result.scalar() is not None
+
+
+async def status() -> None:
+    async with engine.connect() as conn:
+        if not await _shadow_exists(conn):
+            logger.info("No backfill pending (contacts is partitioned, or 1b6d4f9e2a7c isn't applied)")
+            return
+        last_id = (await conn.execute(text("SELECT last_id FROM contacts_partition_backfill"))).scalar_one()
+        max_id = (await conn.execute(text("SELECT coalesce(max(id), 0) FROM contacts"))).scalar_one()
+        remaining = (
+            await conn.execute(text("SELECT count(*) FROM contacts WHERE id > :last_id"), {"last_id": last_id})
+        ).scalar_one()
+    logger.info(f"Copied up to id {last_id} of {max_id}; {remaining} rows left")
+
+
+async def backfill(batch_size: int, pause: float) -> None:
+    async with engine.connect() as lock_conn:
+        if not await _shadow_exists(lock_conn):
+            logger.info("Nothing to backfill")
+            return
+        locked = (
+            await lock_conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": BACKFILL_LOCK_KEY})
+        ).scalar_one()
+        await lock_conn.commit()
+        if not locked:
+            raise SystemExit("Another backfill is running")
+
+        started = time.perf_counter()
+        total = copied_total = 0
+        while True:
+            batch_started = time.perf_counter()
+            async with engine.begin() as conn:
+                last_id = (
+                    await conn.execute(text("SELECT last_id FROM contacts_partition_backfill FOR UPDATE"))
+                ).scalar_one()
+                row = (
+                    await conn.execute(COPY_BATCH, {"last_id": last_id, "batch_size": batch_size})
+                ).one()
+                if not row.rows:
+                    break
+                await conn.execute(
+                    text("UPDATE contacts_partition_backfill SET last_id = :max_id"),
+                    {"max_id": row.max_id},
+                )
+            total += row.rows
+            copied_total += row.copied
+            logger.info(
+                f"Copied ids {last_id + 1}..{row.max_id}: {row.rows} rows "
+                f"({row.rows - row.copied} already mirrored) in "
+                f"{time.perf_counter() - batch_started:.3f}s"
+            )
+            if pause:
+                await asyncio.sleep(pause)
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            f"Backfill done: {total} rows ({copied_total} copied) in {elapsed:.1f}s "
+            f"({total / elapsed if elapsed else 0:,.0f} rows/s). "
+            "Run `alembic upgrade head` to swap the tables in."
+        )
+        await lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BACKFILL_LOCK_KEY})
+
+
+async def run(args) -> None:
+    try:
+        if args.command == "status":
+            await status()
+        else:
+            await backfill(args.batch_size, args.pause)
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="show backfill progress")
+    backfill_parser = commands.add_parser("backfill", help="copy existing rows in batches")
+    backfill_parser.add_argument("--batch-size", type=int, default=5_000, help="rows per transaction")
+    backfill_parser.add_argument(
+        "--pause", type=float, default=0.0, help="seconds to sleep between batches (throttling)"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""Delete expired contact tombstones: `python -m app.scripts.prune_tombstones`.
+
+Tombstones only exist so delta sync can report deletes; once they are older
+than `SYNC_TOMBSTONE_RETENTION_DAYS` the API rejects cursors that old anyway.
+Run daily (e.g. from cron).
+
+    python -m app.scripts.prune_tombstones
+    python -m app.scripts.prune_tombstones --days 60
+"""
+
+import argparse
+import asyncio
+import logging
+from datetime import timedelta
+
+from app.constants import SYNC_TOMBSTONE_RETENTION_DAYS
+from app.crud.contact import prune_tombstones
+from app.db.get_session import SessionLocal, engine, replica_set
+
+logger = logging.getLogger("app.scripts.prune_tombstones")
+
+
+async def run(days: int) -> int:
+    try:
+        async with SessionLocal() as db:
+            removed = await prune_tombstones(db, timedelta(days=days))
+    finally:
+        await engine.dispose()
+        await replica_set.dispose()
+    logger.info(f"Pruned {removed} tombstones older than {days} days")
+    return removed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--days", type=int, default=SYNC_TOMBSTONE_RETENTION_DAYS, help="retention in days"
+    )
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-5.5s [%(name)s] %(message)s")
+    asyncio.run(run(args.days))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
-"""Cloudinary service for avatar upload and management."""
+"""Cloudinary service for avatar upload and management.
+
+The `cloudinary` SDK is imported on first upload rather than at app startup,
+since most requests never touch avatars.
+"""
+
+from functools import cache
 
-import cloudinary
-import cloudinary.uploader
 from fastapi import HTTPException, UploadFile, status
 
 from app.constants import (
@@ -9,10 +13,17 @@ from app.constants import (
     CLOUDINARY_API_SECRET,
     CLOUDINARY_CLOUD_NAME,
 )
+from app.tracing import KIND_CLIENT, traced
 
 
+@cache
 def configure_cloudinary() -> None:
-    """Configure Cloudinary with credentials from environment variables."""
+    """Configure Cloudinary with credentials from environment variables.
+
+    Runs once per process; later calls are no-ops.
+    """
+    import cloudinary
+
     cloudinary.config(
         cloud_name=CLOUDINARY_CLOUD_NAME,
         api_key=CLOUDINARY_API_KEY,
@@ -21,6 +32,7 @@ def configure_cloudinary() -> None:
     )
 
 
+@traced("cloudinary upload_avatar", KIND_CLIENT)
 async def upload_avatar(file: UploadFile, user_id: int) -> str:
     """
     Upload user avatar to Cloudinary.
@@ -36,7 +48,8 @@ async def upload_avatar(file: UploadFile, user_id: int) -> str:
         HTTPException: If upload fails
     """
     configure_cloudinary()
-    
+    import cloudinary.uploader
+
     try:
         # Create a unique public_id for the avatar
         public_id = f"avatars/user_{user_id}"
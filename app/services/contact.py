@@ -1,18 +1,34 @@
 from typing import List
 
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.cache.single_flight import single_flight
+from app.cache.typeahead import Suggestion, typeahead_cache
 from app.crud.contact import (
     create_contact,
     get_contact_by_id,
+    get_contact_fields_by_id,
     get_contact_by_email,
     get_contacts,
     search_contacts,
+    full_text_search_contacts,
+    get_contacts_by_phones,
+    get_typeahead_suggestions,
     get_upcoming_birthdays,
     update_contact,
     delete_contact,
 )
+from app.db.routing import USE_PRIMARY
 from app.schemas.contact import ContactCreate, ContactUpdate, ContactRead
+from app.validators import normalize_phone
+
+
+def _read_key(db: AsyncSession, operation: str, user_id: int, *params) -> tuple:
+    """Single-flight key: reads pinned to the primary (read-your-writes) are
+    never served by a call that may be running on a replica.
+    """
+    return (operation, user_id, bool(db.info.get(USE_PRIMARY)), *params)
 
 
 async def create_contact_service(
@@ -43,13 +59,56 @@ async def list_contacts_service(
     last_name: str | None = None,
     email: str | None = None,
     upcoming: bool = False,
-) -> List[ContactRead]:
+    q: str | None = None,
+    fields: tuple[str, ...] | None = None,
+) -> List[Row]:
     """List contacts with optional filtering by first_name, last_name or email.
 
     If `upcoming` is True, returns contacts with birthdays in the next 7 days.
+    If `q` is given, returns ranked full-text matches across all fields.
+    `fields` (`ContactRead` field names) limits the columns read.
+    Identical concurrent calls for the same user share one query.
     """
+    key = _read_key(
+        db,
+        "list_contacts",
+        user_id,
+        skip,
+        limit,
+        first_name,
+        last_name,
+        email,
+        upcoming,
+        q,
+        fields,
+    )
+    return await single_flight.do(
+        key,
+        lambda: _list_contacts(
+            db, user_id, skip, limit, first_name, last_name, email, upcoming, q, fields
+        ),
+    )
+
+
+async def _list_contacts(
+    db: AsyncSession,
+    user_id: int,
+    skip: int,
+    limit: int,
+    first_name: str | None,
+    last_name: str | None,
+    email: str | None,
+    upcoming: bool,
+    q: str | None,
+    fields: tuple[str, ...] | None,
+) -> List[Row]:
     if upcoming:
-        return await get_upcoming_birthdays(db, user_id=user_id, days=7)
+        return await get_upcoming_birthdays(db, user_id=user_id, days=7, fields=fields)
+
+    if q:
+        return await full_text_search_contacts(
+            db, user_id=user_id, q=q, skip=skip, limit=limit, fields=fields
+        )
 
     # If any filter present, use the search helper (partial, case-insensitive).
     if first_name or last_name or email:
@@ -61,16 +120,54 @@ async def list_contacts_service(
             email=email,
             skip=skip,
             limit=limit,
+            fields=fields,
         )
 
-    return await get_contacts(db, user_id=user_id, skip=skip, limit=limit)
+    return await get_contacts(db, user_id=user_id, skip=skip, limit=limit, fields=fields)
+
+
+async def typeahead_service(
+    db: AsyncSession, user_id: int, prefix: str, limit: int = 10
+) -> List[Suggestion]:
+    """Prefix-match names and emails from the user's in-memory index.
+
+    The index is built from the database on the user's first request (or
+    after eviction/expiry); later requests don't touch the database.
+    """
+    index = await typeahead_cache.get_or_build(
+        user_id, lambda: get_typeahead_suggestions(db, user_id)
+    )
+    return index.search(prefix, limit)
+
 
+async def lookup_phone_service(db: AsyncSession, user_id: int, phone: str):
+    """Contacts of the user whose number matches `phone` in any formatting."""
+    return await single_flight.do(
+        _read_key(db, "lookup_phone", user_id, normalize_phone(phone)),
+        lambda: get_contacts_by_phones(db, user_id, [phone]),
+    )
 
-async def get_upcoming_birthdays_service(db: AsyncSession, user_id: int, days: int = 7):
-    return await get_upcoming_birthdays(db, user_id=user_id, days=days)
 
+async def lookup_phones_service(
+    db: AsyncSession, user_id: int, phones: List[str]
+) -> List[dict]:
+    """Batch reverse lookup: one result per input number, in input order."""
+    rows = await get_contacts_by_phones(db, user_id, phones)
+    by_number: dict[str, list] = {}
+    for row in rows:
+        by_number.setdefault(row.normalized_phone, []).append(row)
+    return [
+        {"phone": phone, "contacts": by_number.get(normalize_phone(phone), [])}
+        for phone in phones
+    ]
 
-async def get_contact_service(db: AsyncSession, contact_id: int, user_id: int):
+
+async def get_contact_service(
+    db: AsyncSession, contact_id: int, user_id: int, fields: tuple[str, ...] | None = None
+):
+    """The contact model, or a read-only row of just `fields` when given."""
+    if fields is not None:
+        return await get_contact_fields_by_id(db, contact_id, user_id, fields)
     return await get_contact_by_id(db, contact_id, user_id)
 
 
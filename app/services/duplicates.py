@@ -0,0 +1,148 @@
+"""Duplicate-contact detection and merging.
+
+Detection is blocking-based and runs in near-linear time: each contact is
+put into a block per normalized key (email, phone, name), and only contacts
+sharing a block become candidate pairs. Blocks larger than
+`MAX_BLOCK_SIZE` (e.g. a very common name) are skipped, which keeps the
+candidate count linear in the address book size. Each candidate pair collects
+the set of keys it shares while the blocks are walked, so scoring is a single
+pass over those sets instead of comparing contacts field by field.
+"""
+
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Iterable, NamedTuple, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.contact import get_contact_rows_for_dedupe, merge_contacts
+
+# Weight of each shared key; a pair's score is the sum, capped at 1.0
+KEY_WEIGHTS = {"email": 0.6, "phone": 0.5, "name": 0.3}
+DEFAULT_MIN_SCORE = 0.5
+MAX_BLOCK_SIZE = 50
+# Phone numbers match on their last digits, so "+380 50..." equals "050..."
+PHONE_KEY_DIGITS = 9
+
+
+class DuplicateGroup(NamedTuple):
+    contact_ids: list[int]
+    score: float
+    reasons: list[str]
+
+
+def email_key(email: Optional[str]) -> Optional[str]:
+    if not email:
+        return None
+    return email.strip().lower() or None
+
+
+def phone_key(phone: Optional[str]) -> Optional[str]:
+    if not phone:
+        return None
+    digits = re.sub(r"\D", "", phone)
+    if len(digits) < PHONE_KEY_DIGITS:
+        return None
+    return digits[-PHONE_KEY_DIGITS:]
+
+
+def name_key(first_name: Optional[str], last_name: Optional[str]) -> Optional[str]:
+    """Case-, accent-, spacing- and order-insensitive name key."""
+    text = unicodedata.normalize("NFKD", f"{first_name or ''} {last_name or ''}")
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    tokens = sorted(re.findall(r"\w+", text))
+    return " ".join(tokens) or None
+
+
+def _blocking_keys(row) -> Iterable[tuple[str, str]]:
+    for kind, value in (
+        ("email", email_key(row.email)),
+        ("phone", phone_key(row.phone_number)),
+        ("name", name_key(row.first_name, row.last_name)),
+    ):
+        if value:
+            yield kind, value
+
+
+def find_duplicate_groups(rows, min_score: float = DEFAULT_MIN_SCORE) -> list[DuplicateGroup]:
+    """Group likely duplicates among one user's contacts.
+
+    `rows` need `id`, `first_name`, `last_name`, `email`, `phone_number`.
+    Pairs scoring at least `min_score` are clustered transitively; each group
+    reports its lowest pair score and the kinds of keys that linked it.
+    """
+    blocks: dict[tuple[str, str], list[int]] = defaultdict(list)
+    for row in rows:
+        for key in _blocking_keys(row):
+            blocks[key].append(row.id)
+
+    # (low_id, high_id) -> kinds of keys the pair shares
+    shared: dict[tuple[int, int], set[str]] = defaultdict(set)
+    for (kind, _value), ids in blocks.items():
+        if len(ids) < 2 or len(ids) > MAX_BLOCK_SIZE:
+            continue
+        ids.sort()
+        for i, a in enumerate(ids):
+            for b in ids[i + 1:]:
+                shared[(a, b)].add(kind)
+
+    # Union-find over pairs above the threshold
+    parent: dict[int, int] = {}
+
+    def find(x: int) -> int:
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    group_score: dict[int, float] = {}
+    group_reasons: dict[int, set[str]] = defaultdict(set)
+    linked: list[tuple[int, int, float, set[str]]] = []
+    for (a, b), kinds in shared.items():
+        score = min(1.0, sum(KEY_WEIGHTS[k] for k in kinds))
+        if score >= min_score:
+            linked.append((a, b, score, kinds))
+            parent[find(a)] = find(b)
+
+    members: dict[int, list[int]] = defaultdict(list)
+    for contact_id in parent:
+        members[find(contact_id)].append(contact_id)
+    for a, _b, score, kinds in linked:
+        root = find(a)
+        group_score[root] = min(group_score.get(root, 1.0), score)
+        group_reasons[root] |= kinds
+
+    groups = [
+        DuplicateGroup(sorted(ids), round(group_score[root], 2), sorted(group_reasons[root]))
+        for root, ids in members.items()
+        if len(ids) > 1
+    ]
+    groups.sort(key=lambda g: (-g.score, g.contact_ids[0]))
+    return groups
+
+
+async def find_duplicates_service(
+    db: AsyncSession, user_id: int, min_score: float = DEFAULT_MIN_SCORE
+) -> list[DuplicateGroup]:
+    rows = await get_contact_rows_for_dedupe(db, user_id)
+    return find_duplicate_groups(rows, min_score)
+
+
+async def merge_contacts_service(
+    db: AsyncSession, user_id: int, contact_ids: list[int], keep_id: Optional[int] = None
+):
+    """Merge `contact_ids` into one contact (by default the lowest id).
+
+    Raises:
+        ValueError: "contacts_not_found" if any id isn't one of the user's
+            contacts, "keep_id_not_in_group" if `keep_id` isn't in the list.
+    """
+    ids = sorted(set(contact_ids))
+    keep_id = ids[0] if keep_id is None else keep_id
+    if keep_id not in ids:
+        raise ValueError("keep_id_not_in_group")
+    return await merge_contacts(
+        db, user_id=user_id, keep_id=keep_id, merge_ids=[i for i in ids if i != keep_id]
+    )
@@ -1,10 +1,13 @@
-"""Email service for sending verification and notification emails."""
+"""Email service for sending verification and notification emails.
+
+`fastapi_mail` and Jinja2 are imported on first use so that importing the app
+doesn't pay for them.
+"""
 
 import logging
+from functools import cache
 from pathlib import Path
-
-from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
-from jinja2 import Environment, FileSystemLoader
+from typing import TYPE_CHECKING
 
 from app.constants import (
     FRONTEND_URL,
@@ -17,14 +20,25 @@ from app.constants import (
     SMTP_PORT,
     SMTP_USER,
 )
+from app.tracing import KIND_CLIENT, traced
+
+if TYPE_CHECKING:
+    from fastapi_mail import ConnectionConfig
+    from jinja2 import Environment
 
 logger = logging.getLogger(__name__)
 
 # Get the templates directory
 TEMPLATES_DIR = Path(__file__).parent.parent.parent / "templates" / "emails"
 
-# Initialize Jinja2 environment
-jinja_env = Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
+
+@cache
+def get_jinja_env() -> "Environment":
+    """Return the Jinja2 environment for email templates, built on first use."""
+    from jinja2 import Environment, FileSystemLoader
+
+    return Environment(loader=FileSystemLoader(str(TEMPLATES_DIR)))
+
 
 def is_smtp_configured() -> bool:
     """Check if SMTP is properly configured.
@@ -38,11 +52,13 @@ def is_smtp_configured() -> bool:
     return bool(SMTP_HOST and SMTP_USER and SMTP_PASSWORD)
 
 
-def get_mail_config() -> ConnectionConfig | None:
+def get_mail_config() -> "ConnectionConfig | None":
     """Get email configuration if SMTP is configured."""
     if not is_smtp_configured():
         return None
 
+    from fastapi_mail import ConnectionConfig
+
     return ConnectionConfig(
         MAIL_USERNAME=SMTP_USER,
         MAIL_PASSWORD=SMTP_PASSWORD,
@@ -57,6 +73,7 @@ def get_mail_config() -> ConnectionConfig | None:
     )
 
 
+@traced("email send_verification_email", KIND_CLIENT)
 async def send_verification_email(email: str, token: str) -> None:
     """
     Send email verification link to user.
@@ -71,7 +88,7 @@ async def send_verification_email(email: str, token: str) -> None:
     verification_link = f"{FRONTEND_URL}/api/v1/auth/verify-email?token={token}"
 
     # Render email template
-    template = jinja_env.get_template("verify_email.html")
+    template = get_jinja_env().get_template("verify_email.html")
     html_content = template.render(verification_link=verification_link)
 
     if not is_smtp_configured():
@@ -91,6 +108,8 @@ async def send_verification_email(email: str, token: str) -> None:
 
     # Send actual email
     try:
+        from fastapi_mail import FastMail, MessageSchema, MessageType
+
         mail_config = get_mail_config()
         fast_mail = FastMail(mail_config)
 
@@ -117,3 +136,44 @@ async def send_verification_email(email: str, token: str) -> None:
         print("=" * 80 + "\n")
 
         raise
+
+
+@traced("email send_birthday_digest_email", KIND_CLIENT)
+async def send_birthday_digest_email(email: str, contacts: list[dict], days: int) -> None:
+    """
+    Send a digest of upcoming contact birthdays to a user.
+
+    If SMTP is not configured, prints the digest to console.
+
+    Args:
+        email: Owner's email address
+        contacts: Dicts with first_name, last_name, next_birthday, days_until,
+            ordered by days_until
+        days: Length of the window in days
+    """
+    template = get_jinja_env().get_template("birthday_digest.html")
+    html_content = template.render(contacts=contacts, days=days)
+
+    if not is_smtp_configured():
+        print("\n" + "=" * 80)
+        print("BIRTHDAY DIGEST (Debug Mode)")
+        print("=" * 80)
+        print(f"To: {email}")
+        for contact in contacts:
+            print(
+                f"  {contact['next_birthday']:%b %d}  "
+                f"{contact['first_name']} {contact['last_name']}"
+            )
+        print("=" * 80 + "\n")
+        return
+
+    from fastapi_mail import FastMail, MessageSchema, MessageType
+
+    message = MessageSchema(
+        subject="Upcoming Birthdays",
+        recipients=[email],
+        body=html_content,
+        subtype=MessageType.html,
+    )
+    await FastMail(get_mail_config()).send_message(message)
+    logger.info(f"Birthday digest sent to {email} ({len(contacts)} contacts)")
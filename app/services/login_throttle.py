@@ -0,0 +1,98 @@
+"""Brute-force protection for login, checked before any password hashing.
+
+Failed logins are counted per account (the submitted email, whether or not
+such a user exists) and per client IP in the `login_throttle` table, so every
+worker sees the same counters. Past a few free attempts each failure blocks
+the key with exponential backoff. A blocked login is rejected before the user
+is looked up or bcrypt runs, so it costs one indexed read and its response
+and timing are the same for existing and unknown accounts.
+"""
+
+import hashlib
+import hmac
+import math
+import random
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants import (
+    LOGIN_THROTTLE_ACCOUNT_FREE_ATTEMPTS,
+    LOGIN_THROTTLE_BASE_DELAY_SECONDS,
+    LOGIN_THROTTLE_IP_FREE_ATTEMPTS,
+    LOGIN_THROTTLE_MAX_DELAY_SECONDS,
+    LOGIN_THROTTLE_WINDOW_SECONDS,
+    SECRET_KEY,
+)
+from app.crud import login_throttle as throttle_crud
+
+# Share of failed logins that also delete idle counters, so the table stays
+# small even when an attacker sprays random emails
+PRUNE_PROBABILITY = 0.01
+
+
+def _key(kind: str, value: str) -> str:
+    # Keyed hash: fixed size, and submitted emails aren't stored in clear
+    return hmac.new(
+        SECRET_KEY.encode("utf-8"), f"{kind}:{value}".encode("utf-8"), hashlib.sha256
+    ).hexdigest()
+
+
+def _account_key(email: str) -> str:
+    return _key("account", email.strip().lower())
+
+
+def _keys(email: str, client_ip: Optional[str]) -> list[tuple[str, int]]:
+    keys = [(_account_key(email), LOGIN_THROTTLE_ACCOUNT_FREE_ATTEMPTS)]
+    if client_ip:
+        keys.append((_key("ip", client_ip), LOGIN_THROTTLE_IP_FREE_ATTEMPTS))
+    return keys
+
+
+async def login_retry_after(
+    db: AsyncSession, email: str, client_ip: Optional[str]
+) -> Optional[int]:
+    """
+    Check whether a login attempt is currently blocked.
+
+    Args:
+        db: Database session on the primary
+        email: Submitted email
+        client_ip: Client address, if known
+
+    Returns:
+        Optional[int]: Seconds to wait (for Retry-After), or None if allowed
+    """
+    seconds = await throttle_crud.get_retry_after(
+        db, [key for key, _ in _keys(email, client_ip)]
+    )
+    return max(1, math.ceil(seconds)) if seconds is not None else None
+
+
+async def record_login_failure(
+    db: AsyncSession, email: str, client_ip: Optional[str]
+) -> None:
+    """Count a failed login against the account and the client IP."""
+    for key, free_attempts in _keys(email, client_ip):
+        await throttle_crud.record_failure(
+            db,
+            key,
+            free_attempts=free_attempts,
+            base_delay=LOGIN_THROTTLE_BASE_DELAY_SECONDS,
+            max_delay=LOGIN_THROTTLE_MAX_DELAY_SECONDS,
+            window=LOGIN_THROTTLE_WINDOW_SECONDS,
+        )
+    if random.random() < PRUNE_PROBABILITY:
+        await throttle_crud.prune(db, LOGIN_THROTTLE_WINDOW_SECONDS)
+    await db.commit()
+
+
+async def record_login_success(db: AsyncSession, email: str) -> None:
+    """
+    Reset the account's failure count.
+
+    The IP counter is left alone: one valid account must not let a client
+    keep guessing passwords for others.
+    """
+    await throttle_crud.clear(db, _account_key(email))
+    await db.commit()
@@ -0,0 +1,90 @@
+"""Delta sync: what changed in a user's contacts since a cursor.
+
+A cursor is an opaque, URL-safe encoding of the `(timestamp, contact_id)` of
+the last change a client has seen. Creates and updates come from
+`contacts.updated_at`, deletes from `contact_tombstones.deleted_at`; both are
+read with index range scans starting at the cursor, merged in timestamp order
+and cut to one page, so a sync costs O(changes), not O(address book).
+"""
+
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone
+from heapq import merge
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.constants import SYNC_TOMBSTONE_RETENTION_DAYS
+from app.crud.contact import (
+    get_contact_changes,
+    get_contact_deletions,
+    get_sync_horizon,
+)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def encode_cursor(at: datetime, contact_id: int) -> str:
+    micros = (at - _EPOCH) // timedelta(microseconds=1)
+    return base64.urlsafe_b64encode(f"{micros}:{contact_id}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Raises ValueError("invalid_cursor") for anything `encode_cursor` didn't produce."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        micros, contact_id = raw.split(":")
+        return _EPOCH + timedelta(microseconds=int(micros)), int(contact_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, OverflowError):
+        raise ValueError("invalid_cursor")
+
+
+async def contact_changes_service(
+    db: AsyncSession, user_id: int, since: Optional[str] = None, limit: int = 500
+) -> dict:
+    """One page of changes after `since` (or of all contacts, without it).
+
+    Raises:
+        ValueError: "invalid_cursor" if `since` can't be decoded,
+            "cursor_expired" if it predates tombstone retention (the client
+            may have missed deletes and must do a full sync).
+    """
+    cursor = decode_cursor(since) if since else None
+    if cursor is not None:
+        retention = timedelta(days=SYNC_TOMBSTONE_RETENTION_DAYS)
+        if cursor[0] < datetime.now(timezone.utc) - retention:
+            raise ValueError("cursor_expired")
+
+    # Fetch one extra row from each side to know whether another page exists
+    updated = await get_contact_changes(db, user_id, cursor, limit + 1)
+    deleted = (
+        await get_contact_deletions(db, user_id, cursor, limit + 1) if cursor else []
+    )
+    events = list(
+        merge(
+            ((row.updated_at, row.id, row) for row in updated),
+            ((row.deleted_at, row.contact_id, None) for row in deleted),
+            key=lambda e: (e[0], e[1]),
+        )
+    )
+    page = events[:limit]
+    has_more = len(events) > limit
+
+    if has_more:
+        last_at, last_id, _row = page[-1]
+        next_cursor = encode_cursor(last_at, last_id)
+    else:
+        # Caught up: resume from the horizon, so the cursor of an idle client
+        # keeps moving and never expires
+        horizon = (await get_sync_horizon(db), 0)
+        if cursor is not None and cursor > horizon:
+            horizon = cursor  # replicas' clocks may trail the primary's
+        next_cursor = encode_cursor(*horizon)
+
+    return {
+        "updated": [row for _at, _id, row in page if row is not None],
+        "deleted": [contact_id for _at, contact_id, row in page if row is None],
+        "cursor": next_cursor,
+        "has_more": has_more,
+    }
@@ -4,7 +4,13 @@ from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.user import create_user, get_user_by_email, get_user_by_id, verify_user_email
+from app.crud.user import (
+    create_user,
+    get_user_by_email,
+    get_user_by_id,
+    update_password_hash,
+    verify_user_email,
+)
 from app.schemas.user import UserCreate
 from app.models.user import User
 from app.services.email import send_verification_email
@@ -12,7 +18,9 @@ from app.utils.auth import (
     create_access_token,
     create_email_verification_token,
     create_refresh_token,
+    dummy_password_hash,
     get_password_hash,
+    password_needs_rehash,
     verify_password,
     verify_email_token,
 )
@@ -53,6 +61,10 @@ async def register_user(db: AsyncSession, user_data: UserCreate) -> User:
 async def authenticate_user(db: AsyncSession, email: str, password: str) -> Optional[User]:
     """
     Authenticate a user by email and password.
+
+    A valid password whose stored hash predates the current hashing policy
+    (scheme or cost) is rehashed and saved, so policy changes roll out as
+    users log in, without password resets.
     
     Args:
         db: Database session
@@ -64,9 +76,14 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> Opti
     """
     user = await get_user_by_email(db, email)
     if not user:
+        # Same bcrypt work as a wrong password, so timing doesn't reveal
+        # which emails have accounts
+        verify_password(password, dummy_password_hash())
         return None
     if not verify_password(password, user.hashed_password):
         return None
+    if password_needs_rehash(user.hashed_password):
+        user = await update_password_hash(db, user, get_password_hash(password))
     return user
 
 
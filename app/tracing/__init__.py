@@ -0,0 +1,38 @@
+from .db import TracedAsyncSession, instrument_sqlalchemy
+from .export import OtlpJsonFileExporter
+from .spans import (
+    KIND_CLIENT,
+    KIND_INTERNAL,
+    KIND_SERVER,
+    Sampler,
+    Span,
+    current_span,
+    sampler,
+    set_exporter,
+    shutdown_exporter,
+    span,
+    start_span,
+    start_trace,
+    traced,
+    use_span,
+)
+
+__all__ = [
+    "KIND_CLIENT",
+    "KIND_INTERNAL",
+    "KIND_SERVER",
+    "OtlpJsonFileExporter",
+    "Sampler",
+    "Span",
+    "TracedAsyncSession",
+    "current_span",
+    "instrument_sqlalchemy",
+    "sampler",
+    "set_exporter",
+    "shutdown_exporter",
+    "span",
+    "start_span",
+    "start_trace",
+    "traced",
+    "use_span",
+]
@@ -0,0 +1,95 @@
+"""SQLAlchemy instrumentation: a span per SQL statement, commit, flush and refresh.
+
+Statement spans come from engine events (`instrument_sqlalchemy`, installed
+with the tracing middleware) and cover the time the statement spent in the
+driver, including waiting for Postgres. They carry the SQL text but never its
+parameters. The session-level spans come from `TracedAsyncSession`, the
+session class of `SessionLocal`; statements issued by a commit or refresh are
+nested under it.
+"""
+
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.tracing.spans import KIND_CLIENT, current_span, span, start_span
+
+MAX_STATEMENT_LENGTH = 2000
+_SPAN_ATTR = "_trace_span"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is None or current_span() is None:
+        return
+    operation = statement.split(None, 1)[0].upper() if statement else "SQL"
+    url = conn.engine.url
+    setattr(
+        context,
+        _SPAN_ATTR,
+        start_span(
+            f"{operation} {url.database}",
+            KIND_CLIENT,
+            {
+                "db.system": "postgresql",
+                "db.name": url.database,
+                "db.operation": operation,
+                "db.statement": statement[:MAX_STATEMENT_LENGTH],
+                "db.executemany": executemany or None,
+                "server.address": url.host,
+                "server.port": url.port,
+            },
+        ),
+    )
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    statement_span = getattr(context, _SPAN_ATTR, None)
+    if statement_span is None:
+        return
+    rowcount = getattr(cursor, "rowcount", -1)
+    if rowcount is not None and rowcount >= 0:
+        statement_span.set_attribute("db.response.rows", rowcount)
+    statement_span.end()
+
+
+def _handle_error(exception_context):
+    statement_span = getattr(exception_context.execution_context, _SPAN_ATTR, None)
+    if statement_span is None:
+        return
+    statement_span.record_exception(exception_context.original_exception)
+    statement_span.end()
+
+
+def instrument_sqlalchemy() -> None:
+    """Trace the statements of every engine (idempotent)."""
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
+
+
+class TracedAsyncSession(AsyncSession):
+    """AsyncSession whose commits, flushes, refreshes and rollbacks are spans."""
+
+    async def commit(self) -> None:
+        with span("session.commit"):
+            await super().commit()
+
+    async def rollback(self) -> None:
+        with span("session.rollback"):
+            await super().rollback()
+
+    async def flush(self, objects: Optional[list] = None) -> None:
+        with span("session.flush"):
+            await super().flush(objects)
+
+    async def refresh(self, instance, attribute_names=None, with_for_update=None) -> None:
+        with span("session.refresh", attributes={"db.entity": type(instance).__name__}):
+            await super().refresh(
+                instance, attribute_names=attribute_names, with_for_update=with_for_update
+            )
@@ -0,0 +1,144 @@
+"""Write finished traces to a local file in the OTLP JSON format.
+
+Each line is one `ExportTraceServiceRequest` in OTLP/JSON encoding (the
+format the OpenTelemetry Collector's `file` exporter writes and its
+`otlpjsonfile` receiver reads), holding one trace. The file can be inspected
+with `jq`, or replayed into Jaeger/Tempo through a collector later. Nothing
+is sent over the network.
+
+Encoding and writing happen on a background thread, off the event loop. If
+the writer falls behind, whole traces are dropped rather than queued without
+bound. Each line is appended with a single write, so the workers of one
+server can share a file.
+"""
+
+import json
+import logging
+import os
+import queue
+import socket
+import threading
+from typing import Any
+
+from app.tracing.spans import Span, Trace
+
+logger = logging.getLogger(__name__)
+
+STATUS_CODE_ERROR = 2
+QUEUE_SIZE = 1000
+
+
+def _value(value: Any) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def encode_attributes(attributes: dict[str, Any]) -> list[dict]:
+    return [
+        {"key": key, "value": _value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def encode_span(trace_id: str, span: Span) -> dict:
+    encoded = {
+        "traceId": trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": span.kind,
+        "startTimeUnixNano": str(span.start_ns),
+        "endTimeUnixNano": str(span.end_ns),
+        "attributes": encode_attributes(span.attributes),
+    }
+    if span.parent_id:
+        encoded["parentSpanId"] = span.parent_id
+    if span.events:
+        encoded["events"] = [
+            {"timeUnixNano": str(at), "name": name, "attributes": encode_attributes(attrs)}
+            for at, name, attrs in span.events
+        ]
+    encoded["status"] = (
+        {"code": STATUS_CODE_ERROR, "message": span.error} if span.error is not None else {}
+    )
+    return encoded
+
+
+def encode_trace(trace: Trace, resource: dict, scope: dict) -> dict:
+    """One trace as an OTLP/JSON `ExportTraceServiceRequest`."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": resource,
+                "scopeSpans": [
+                    {
+                        "scope": scope,
+                        "spans": [encode_span(trace.trace_id, span) for span in trace.spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class OtlpJsonFileExporter:
+    """Appends traces to `path`, one OTLP/JSON request per line."""
+
+    def __init__(self, path: str, service_name: str):
+        self.path = path
+        self.service_name = service_name
+        self.scope = {"name": "app.tracing"}
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(QUEUE_SIZE)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def export(self, trace: Trace) -> None:
+        if self._thread is None:
+            # Started on first use, so it belongs to the serving process
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="trace-exporter", daemon=True
+                    )
+                    self._thread.start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout)
+            self._thread = None
+        if self.dropped:
+            logger.warning(f"{self.dropped} traces were dropped: the exporter fell behind")
+
+    def _run(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        resource = {
+            "attributes": encode_attributes(
+                {
+                    "service.name": self.service_name,
+                    "host.name": socket.gethostname(),
+                    "process.pid": os.getpid(),
+                }
+            )
+        }
+        with open(self.path, "ab", buffering=0) as f:
+            while (trace := self._queue.get()) is not None:
+                try:
+                    line = json.dumps(
+                        encode_trace(trace, resource, self.scope), separators=(",", ":")
+                    )
+                    f.write(line.encode("utf-8") + b"\n")
+                except Exception as e:
+                    logger.warning(f"Could not export trace {trace.trace_id}: {e}")
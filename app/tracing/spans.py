@@ -0,0 +1,248 @@
+"""Minimal span API.
+
+A trace is started per sampled request (see `TracingMiddleware`); code running
+inside it opens child spans with `span(...)` or `@traced(...)`. The current
+span lives in a context variable, so it follows awaits, tasks created during
+the request and SQLAlchemy's greenlets. Outside a sampled trace `span()`
+yields None and `@traced` calls straight through, so instrumented code costs
+one context variable lookup on unsampled requests.
+
+When the root span ends, the whole trace is handed to the exporter.
+"""
+
+import contextvars
+import functools
+import inspect
+import random
+import time
+from typing import Any, Optional
+
+from app.constants import (
+    TRACING_MAX_SPANS_PER_TRACE,
+    TRACING_MAX_TRACES_PER_SECOND,
+    TRACING_SAMPLE_RATIO,
+)
+
+# OTLP span kinds
+KIND_INTERNAL = 1
+KIND_SERVER = 2
+KIND_CLIENT = 3
+
+_current: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+_exporter = None
+
+
+def _new_id(bits: int) -> str:
+    return f"{random.getrandbits(bits) or 1:0{bits // 4}x}"
+
+
+class Sampler:
+    """Decides which requests start a trace: a ratio, capped per second."""
+
+    def __init__(self, ratio: float, max_per_second: float):
+        self.ratio = ratio
+        self.max_per_second = max_per_second
+        self._second = 0
+        self._started = 0
+
+    def should_sample(self, requested: Optional[bool] = None) -> bool:
+        """`requested` is an upstream decision (traceparent), None if there is none."""
+        if requested is False:
+            return False
+        if requested is None and random.random() >= self.ratio:
+            return False
+        second = int(time.monotonic())
+        if second != self._second:
+            self._second, self._started = second, 0
+        if self._started >= self.max_per_second:
+            return False
+        self._started += 1
+        return True
+
+
+sampler = Sampler(TRACING_SAMPLE_RATIO, TRACING_MAX_TRACES_PER_SECOND)
+
+
+class Trace:
+    """The finished spans of one trace, exported together."""
+
+    __slots__ = ("trace_id", "root", "spans", "dropped", "closed")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.root: Optional[Span] = None
+        self.spans: list[Span] = []
+        self.dropped = 0
+        self.closed = False
+
+
+class Span:
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_id",
+        "name",
+        "kind",
+        "attributes",
+        "events",
+        "error",
+        "start_ns",
+        "end_ns",
+    )
+
+    def __init__(
+        self,
+        trace: Trace,
+        name: str,
+        parent_id: Optional[str],
+        kind: int = KIND_INTERNAL,
+        attributes: Optional[dict[str, Any]] = None,
+    ):
+        self.trace = trace
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.events: list[tuple[int, str, dict[str, Any]]] = []
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.error = f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+        self.events.append(
+            (
+                time.time_ns(),
+                "exception",
+                {"exception.type": type(exc).__name__, "exception.message": str(exc)},
+            )
+        )
+
+    def end(self) -> None:
+        if self.end_ns:
+            return
+        self.end_ns = time.time_ns()
+        trace = self.trace
+        if trace.closed:
+            return  # outlived its request; the trace is already exported
+        if self is trace.root:
+            trace.closed = True
+            if trace.dropped:
+                self.attributes["trace.dropped_spans"] = trace.dropped
+            trace.spans.append(self)
+            if _exporter is not None:
+                _exporter.export(trace)
+        elif len(trace.spans) < TRACING_MAX_SPANS_PER_TRACE:
+            trace.spans.append(self)
+        else:
+            trace.dropped += 1
+
+
+def set_exporter(exporter) -> None:
+    """Install the exporter finished traces go to (see `OtlpJsonFileExporter`)."""
+    global _exporter
+    _exporter = exporter
+
+
+def shutdown_exporter() -> None:
+    """Flush and stop the exporter, if any."""
+    if _exporter is not None:
+        _exporter.shutdown()
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def start_trace(
+    name: str,
+    *,
+    kind: int = KIND_SERVER,
+    trace_id: Optional[str] = None,
+    parent_id: Optional[str] = None,
+    sampled: Optional[bool] = None,
+    attributes: Optional[dict[str, Any]] = None,
+) -> Optional[Span]:
+    """Return the root span of a new trace, or None if it isn't sampled.
+
+    `trace_id`/`parent_id`/`sampled` continue a trace started upstream.
+    The span is not made current; use `use_span`.
+    """
+    if not sampler.should_sample(sampled):
+        return None
+    trace = Trace(trace_id or _new_id(128))
+    trace.root = Span(trace, name, parent_id, kind, attributes)
+    return trace.root
+
+
+def start_span(
+    name: str, kind: int = KIND_INTERNAL, attributes: Optional[dict[str, Any]] = None
+) -> Optional[Span]:
+    """Return a child of the current span (not made current), or None outside a trace."""
+    parent = _current.get()
+    if parent is None:
+        return None
+    return Span(parent.trace, name, parent.span_id, kind, attributes)
+
+
+class use_span:
+    """Make `span` current for a block; record an exception and end it on exit."""
+
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span: Optional[Span]):
+        self.span = span
+
+    def __enter__(self) -> Optional[Span]:
+        if self.span is not None:
+            self._token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if self.span is not None:
+            _current.reset(self._token)
+            if exc is not None:
+                self.span.record_exception(exc)
+            self.span.end()
+
+
+def span(
+    name: str, kind: int = KIND_INTERNAL, attributes: Optional[dict[str, Any]] = None
+) -> use_span:
+    """`with span("name") as s:` opens a child span; `s` is None outside a trace."""
+    return use_span(start_span(name, kind, attributes))
+
+
+def traced(name: Optional[str] = None, kind: int = KIND_INTERNAL):
+    """Decorate a function so each call is a span (named after it by default)."""
+
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current.get() is None:
+                    return await func(*args, **kwargs)
+                with span(span_name, kind):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current.get() is None:
+                return func(*args, **kwargs)
+            with span(span_name, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
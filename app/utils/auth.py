@@ -1,9 +1,15 @@
-"""Authentication utilities for password hashing and JWT token management."""
+"""Authentication utilities for password hashing and JWT token management.
+
+`jose` (and its cryptography backend) is imported inside the token helpers so
+it is loaded on the first token operation instead of at app import. Likewise
+`argon2` is only imported when an argon2id hash is made or checked.
+"""
 
 import base64
+import functools
 import hashlib
+import os
 import bcrypt
-from jose import JWTError, jwt
 
 from datetime import datetime, timedelta, timezone
 from typing import Optional
@@ -11,7 +17,12 @@ from typing import Optional
 
 from app.constants import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
+    ARGON2_MEMORY_COST_KIB,
+    ARGON2_PARALLELISM,
+    ARGON2_TIME_COST,
+    BCRYPT_ROUNDS,
     JWT_TOKEN_ALGORITHM,
+    PASSWORD_HASH_SCHEME,
     REFRESH_TOKEN_EXPIRE_DAYS,
     SECRET_KEY,
 )
@@ -36,10 +47,30 @@ def prehash_password(password: str) -> bytes:
     return base64.b64encode(sha_hash)
 
 
+@functools.cache
+def _argon2_hasher():
+    """Return the argon2id hasher for the configured costs (argon2-cffi, optional)."""
+    try:
+        from argon2 import PasswordHasher, Type
+    except ImportError:
+        raise RuntimeError(
+            "PASSWORD_HASH_SCHEME=argon2id needs the argon2-cffi package"
+        ) from None
+    return PasswordHasher(
+        time_cost=ARGON2_TIME_COST,
+        memory_cost=ARGON2_MEMORY_COST_KIB,
+        parallelism=ARGON2_PARALLELISM,
+        type=Type.ID,
+    )
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a plain password against a hashed password.
 
+    The scheme (bcrypt or argon2id) is read from the stored hash, so hashes
+    made under an earlier policy keep working.
+
     Args:
         plain_password: The plain text password to verify
         hashed_password: The hashed password to verify against
@@ -49,12 +80,19 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     # Pre-hash with SHA256 to handle any password length
     prehashed = prehash_password(plain_password)
+    if hashed_password.startswith("$argon2"):
+        from argon2.exceptions import InvalidHashError, VerificationError
+
+        try:
+            return _argon2_hasher().verify(hashed_password, prehashed)
+        except (VerificationError, InvalidHashError):
+            return False
     return bcrypt.checkpw(prehashed, hashed_password.encode("utf-8"))
 
 
 def get_password_hash(password: str) -> str:
     """
-    Hash a password using SHA256 + bcrypt.
+    Hash a password using SHA256 + the configured scheme and cost.
 
     Args:
         password: The plain text password to hash
@@ -64,11 +102,47 @@ def get_password_hash(password: str) -> str:
     """
     # Pre-hash with SHA256 to handle any password length
     prehashed = prehash_password(password)
+    if PASSWORD_HASH_SCHEME == "argon2id":
+        return _argon2_hasher().hash(prehashed)
     # Generate salt and hash
-    hashed = bcrypt.hashpw(prehashed, bcrypt.gensalt())
+    hashed = bcrypt.hashpw(prehashed, bcrypt.gensalt(rounds=BCRYPT_ROUNDS))
     return hashed.decode("utf-8")
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check whether a stored hash was made under another scheme or cost.
+
+    Args:
+        hashed_password: The stored hash
+
+    Returns:
+        bool: True if it should be replaced by `get_password_hash` of the
+        password (known only right after a successful login)
+    """
+    if PASSWORD_HASH_SCHEME == "argon2id":
+        if not hashed_password.startswith("$argon2id$"):
+            return True
+        return _argon2_hasher().check_needs_rehash(hashed_password)
+    # bcrypt: "$2b$<cost>$<salt+hash>"
+    parts = hashed_password.split("$")
+    return not (len(parts) == 4 and parts[1].startswith("2") and parts[2] == f"{BCRYPT_ROUNDS:02d}")
+
+
+@functools.cache
+def dummy_password_hash() -> str:
+    """
+    Return a hash no password is checked against in earnest.
+
+    Verifying against it when a login names an unknown email makes that
+    attempt take as long as a wrong password for an existing user.
+
+    Returns:
+        str: A hash made with the same cost as real ones
+    """
+    return get_password_hash(base64.b64encode(os.urandom(16)).decode("ascii"))
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
     Create a JWT access token.
@@ -80,6 +154,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         str: The encoded JWT token
     """
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -103,6 +179,8 @@ def create_refresh_token(data: dict) -> str:
     Returns:
         str: The encoded JWT refresh token
     """
+    from jose import jwt
+
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "iat": datetime.now(timezone.utc)})
@@ -120,6 +198,8 @@ def decode_token(token: str) -> Optional[str]:
     Returns:
         Optional[str]: The user email from token subject, or None if invalid
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_TOKEN_ALGORITHM])
         email: str = payload.get("sub")
@@ -138,6 +218,8 @@ def create_email_verification_token(email: str) -> str:
     Returns:
         str: The encoded JWT token for email verification
     """
+    from jose import jwt
+
     data = {"sub": email, "type": "email_verification"}
     expire = datetime.now(timezone.utc) + timedelta(hours=24)  # 24 hour expiration
     data.update({"exp": expire, "iat": datetime.now(timezone.utc)})
@@ -154,6 +236,8 @@ def verify_email_token(token: str) -> Optional[str]:
     Returns:
         Optional[str]: The user email if valid, None otherwise
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[JWT_TOKEN_ALGORITHM])
         if payload.get("type") != "email_verification":
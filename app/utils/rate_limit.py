@@ -0,0 +1,41 @@
+"""Rate limiting backed by slowapi, loaded on first use.
+
+`limit()` mirrors `Limiter.limit` but defers importing slowapi (and `limits`)
+until the decorated endpoint is first called.
+"""
+
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from slowapi import Limiter
+
+
+@functools.cache
+def get_limiter() -> "Limiter":
+    """Return the process-wide limiter keyed by client address."""
+    from slowapi import Limiter
+    from slowapi.util import get_remote_address
+
+    return Limiter(key_func=get_remote_address)
+
+
+def limit(limit_value: str):
+    """Decorate an endpoint with a slowapi rate limit applied lazily.
+
+    The endpoint must accept a `request: Request` argument, as with slowapi.
+    """
+
+    def decorator(func):
+        limited = None
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            nonlocal limited
+            if limited is None:
+                limited = get_limiter().limit(limit_value)(func)
+            return await limited(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
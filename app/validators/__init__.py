@@ -1,3 +1,3 @@
-from .phone import validate_phone_digits
+from .phone import normalize_phone, validate_phone_digits
 
-__all__ = ["validate_phone_digits"]
+__all__ = ["normalize_phone", "validate_phone_digits"]
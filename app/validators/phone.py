@@ -1,3 +1,4 @@
+import re
 from typing import Optional
 
 
@@ -34,3 +35,17 @@ def validate_phone_digits(
             f"phone_number length must be between {min_len} and {max_len} digits (got {ln})"
         )
     return v
+
+
+def normalize_phone(v: str) -> str:
+    """Normalize a phone number for storage and lookup.
+
+    Keeps digits only and drops a leading international "00" prefix, so
+    "+380 (50) 123-45-67", "00380501234567" and "380501234567" all become
+    "380501234567". Must stay in sync with the generated
+    `contacts.normalized_phone` column expression.
+    """
+    digits = re.sub(r"\D", "", v)
+    if digits.startswith("00"):
+        digits = digits[2:]
+    return digits
@@ -0,0 +1,87 @@
+"""Memory and CPU per contact-list page: ORM instances vs column rows.
+
+    python -m benchmarks.bench_contact_list --user-id 1
+    python -m benchmarks.bench_contact_list --user-id 1 --limit 100 -n 200
+
+Runs against `SQLALCHEMY_DATABASE_URL`. Each iteration loads one page and
+serializes it with `ContactRead`, as the list endpoint does. "orm" is the
+previous path (`select(Contact)` -> tracked instances), "rows" is
+`crud.contact.get_contacts`.
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from pydantic import TypeAdapter
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.crud.contact import get_contacts
+from app.db.get_session import async_db_url
+from app.models.contact import Contact
+from app.schemas.contact import ContactRead
+
+page_adapter = TypeAdapter(list[ContactRead])
+
+
+async def load_orm(db: AsyncSession, user_id: int, limit: int):
+    result = await db.execute(
+        select(Contact)
+        .where(Contact.user_id == user_id)
+        .order_by(Contact.id.asc())
+        .offset(0)
+        .limit(limit)
+    )
+    return result.scalars().all()
+
+
+async def load_rows(db: AsyncSession, user_id: int, limit: int):
+    return await get_contacts(db, user_id=user_id, skip=0, limit=limit)
+
+
+async def measure(engine, load, user_id: int, limit: int, iterations: int) -> tuple[int, float, int]:
+    """Return (rows per page, ms per page, peak bytes for one page)."""
+    # CPU: fresh session per page, as per request
+    started = time.perf_counter()
+    for _ in range(iterations):
+        async with AsyncSession(engine, expire_on_commit=False) as db:
+            page = await load(db, user_id, limit)
+            page_adapter.dump_json(page_adapter.validate_python(page, from_attributes=True))
+    ms_per_page = (time.perf_counter() - started) / iterations * 1000
+
+    # Memory: peak allocated while one page (and its session) is alive
+    async with AsyncSession(engine, expire_on_commit=False) as db:
+        await db.execute(select(1))  # check out the connection outside the trace
+        tracemalloc.start()
+        page = await load(db, user_id, limit)
+        page_adapter.dump_json(page_adapter.validate_python(page, from_attributes=True))
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return len(page), ms_per_page, peak
+
+
+async def run(user_id: int, limit: int, iterations: int) -> None:
+    engine = create_async_engine(async_db_url)
+    try:
+        print(f"{'path':<6} {'rows':>6} {'ms/page':>9} {'peak KiB':>10}")
+        for name, load in (("orm", load_orm), ("rows", load_rows)):
+            await measure(engine, load, user_id, limit, 5)  # warm caches
+            rows, ms, peak = await measure(engine, load, user_id, limit, iterations)
+            print(f"{name:<6} {rows:>6} {ms:>9.3f} {peak / 1024:>10.1f}")
+    finally:
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", type=int, required=True)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("-n", "--iterations", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(run(args.user_id, args.limit, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Per-call overhead of the hot lookups: inline `select(...)` vs the registry.
+
+    python -m benchmarks.bench_hot_statements              # statement overhead only
+    python -m benchmarks.bench_hot_statements --db         # also execute against the DB
+
+Without `--db` this measures what SQLAlchemy does in Python before a query is
+sent: building the construct, generating its cache key and looking up the
+compiled form. With `--db` the lookups run through an AsyncSession against
+`SQLALCHEMY_DATABASE_URL`, with asyncpg's prepared-statement cache disabled
+and enabled.
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql.asyncpg import dialect as asyncpg_dialect
+from sqlalchemy.sql import and_
+from sqlalchemy.util import LRUCache
+
+from app.db.statements import CONTACT_BY_ID, CONTACTS_PAGE, USER_BY_EMAIL
+from app.models.contact import Contact
+from app.models.user import User
+
+
+def inline_user_by_email(email):
+    return select(User).where(User.email == email), None
+
+
+def inline_contact_by_id(contact_id, user_id):
+    stmt = select(Contact).where(and_(Contact.id == contact_id, Contact.user_id == user_id))
+    return stmt, None
+
+
+def inline_contacts_page(user_id, skip, limit):
+    stmt = (
+        select(Contact)
+        .where(Contact.user_id == user_id)
+        .order_by(Contact.id.asc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return stmt, None
+
+
+def registry_user_by_email(email):
+    return USER_BY_EMAIL, {"email": email}
+
+
+def registry_contact_by_id(contact_id, user_id):
+    return CONTACT_BY_ID, {"contact_id": contact_id, "user_id": user_id}
+
+
+def registry_contacts_page(user_id, skip, limit):
+    return CONTACTS_PAGE, {"user_id": user_id, "skip": skip, "limit": limit}
+
+
+CASES = {
+    "user_by_email": (inline_user_by_email, registry_user_by_email, ("a@example.com",)),
+    "contact_by_id": (inline_contact_by_id, registry_contact_by_id, (1, 1)),
+    "contacts_page": (inline_contacts_page, registry_contacts_page, (1, 0, 100)),
+}
+
+
+def bench_statement_overhead(iterations: int) -> None:
+    dialect = asyncpg_dialect()
+    # An engine's compiled cache, as sized by create_engine(query_cache_size=500)
+    compiled_cache = LRUCache(500)
+
+    def prepare(build, args):
+        # What Connection.execute does before talking to the DB: generate the
+        # cache key and look up (or compile) the statement in the engine cache
+        stmt, _params = build(*args)
+        compiled, _extracted_params, _cache_hit = stmt._compile_w_cache(
+            dialect, compiled_cache=compiled_cache, column_keys=[]
+        )
+        return compiled
+
+    print(f"Statement overhead, {iterations} calls each (us/call):")
+    print(f"{'statement':<16} {'inline':>10} {'registry':>10} {'speedup':>8}")
+    for name, (inline, registry, args) in CASES.items():
+        timings = []
+        for build in (inline, registry):
+            prepare(build, args)
+            started = time.perf_counter()
+            for _ in range(iterations):
+                prepare(build, args)
+            timings.append((time.perf_counter() - started) / iterations * 1e6)
+        print(f"{name:<16} {timings[0]:>10.1f} {timings[1]:>10.1f} {timings[0] / timings[1]:>7.1f}x")
+
+
+async def bench_db(iterations: int) -> None:
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from app.db.get_session import async_db_url
+
+    print(f"\nThrough AsyncSession against the DB, {iterations} calls each (us/call):")
+    print(f"{'statement':<16} {'inline/no-prep':>15} {'inline':>10} {'registry':>10}")
+    engines = {
+        size: create_async_engine(
+            async_db_url, connect_args={"prepared_statement_cache_size": size}
+        )
+        for size in (0, 100)
+    }
+    try:
+        for name, (inline, registry, args) in CASES.items():
+            row = []
+            for size, build in ((0, inline), (100, inline), (100, registry)):
+                async with AsyncSession(engines[size]) as db:
+                    stmt, params = build(*args)
+                    await db.execute(stmt, params)
+                    started = time.perf_counter()
+                    for _ in range(iterations):
+                        stmt, params = build(*args)
+                        (await db.execute(stmt, params)).all()
+                    row.append((time.perf_counter() - started) / iterations * 1e6)
+            print(f"{name:<16} {row[0]:>15.1f} {row[1]:>10.1f} {row[2]:>10.1f}")
+    finally:
+        for engine in engines.values():
+            await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--iterations", type=int, default=5000)
+    parser.add_argument("--db", action="store_true", help="also execute against the database")
+    args = parser.parse_args()
+
+    bench_statement_overhead(args.iterations)
+    if args.db:
+        asyncio.run(bench_db(args.iterations // 5))
+
+
+if __name__ == "__main__":
+    main()
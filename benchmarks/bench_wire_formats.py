@@ -0,0 +1,90 @@
+"""Bytes on the wire and encode time of the contact-list wire formats.
+
+    python -m benchmarks.bench_wire_formats
+    python -m benchmarks.bench_wire_formats --rows 100 1000 10000 -n 50
+
+Encodes synthetic `ContactRead` rows with `app.api.wire` in every layout
+(rows/columnar), encoding (JSON/MessagePack) and compression (none, gzip,
+brotli). Times include compression. MessagePack and brotli rows are skipped
+when the optional packages aren't installed.
+"""
+
+import argparse
+import random
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+
+from app.api.wire import (
+    JSON,
+    MSGPACK,
+    WireFormat,
+    _brotli,
+    _msgpack,
+    compress,
+    encode_rows,
+)
+from app.schemas.contact import ContactRead
+
+FIELDS = tuple(ContactRead.model_fields)
+Row = namedtuple("Row", FIELDS)
+
+FIRST_NAMES = ["Olena", "Taras", "Iryna", "Andrii", "Maria", "John", "Anna", "Petro"]
+LAST_NAMES = ["Shevchenko", "Kovalenko", "Bondarenko", "Tkachenko", "Smith", "Melnyk"]
+
+
+def make_rows(count: int, seed: int = 0) -> list:
+    rnd = random.Random(seed)
+    rows = []
+    for i in range(count):
+        first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+        values = {
+            "id": i + 1,
+            "first_name": first,
+            "last_name": last,
+            "email": f"{first}.{last}{i}@example.com".lower(),
+            "phone_number": f"380{rnd.randrange(10**8, 10**9)}",
+            "birthday": date(1970, 1, 1) + timedelta(days=rnd.randrange(15000))
+            if rnd.random() < 0.7
+            else None,
+            "additional_data": "met at the conference" if rnd.random() < 0.3 else None,
+        }
+        rows.append(Row(**{name: values[name] for name in FIELDS}))
+    return rows
+
+
+def measure(rows: list, fmt: WireFormat, encoding, iterations: int) -> tuple[int, float]:
+    """Return (bytes, ms per encode) for one format/compression."""
+    body = compress(encode_rows(rows, FIELDS, fmt), encoding)
+    started = time.perf_counter()
+    for _ in range(iterations):
+        compress(encode_rows(rows, FIELDS, fmt), encoding)
+    return len(body), (time.perf_counter() - started) / iterations * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("-n", "--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    formats = [WireFormat(JSON, False), WireFormat(JSON, True)]
+    if _msgpack() is not None:
+        formats += [WireFormat(MSGPACK, False), WireFormat(MSGPACK, True)]
+    encodings = [None, "gzip"] + (["br"] if _brotli() is not None else [])
+
+    print(f"{'rows':>6} {'format':<40} {'encoding':<8} {'bytes':>10} {'ms':>9}")
+    for count in args.rows:
+        rows = make_rows(count)
+        for fmt in formats:
+            for encoding in encodings:
+                size, ms = measure(rows, fmt, encoding, args.iterations)
+                print(
+                    f"{count:>6} {fmt.content_type:<40} {encoding or 'identity':<8} "
+                    f"{size:>10,} {ms:>9.3f}"
+                )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,7 +4,7 @@ set -e # Exit immediately if a command exits with a non-zero status.
 # Entry point script: wait for DB readiness and run alembic migrations before starting the app.
 # It then execs the CMD (uvicorn) as PID 1.
 
-echo "Running migrations (alembic upgrade head)..."
+echo "Running migrations (python -m app.scripts.migrate)..."
 
 # Load environment variables from .env if present so alembic and the app see them.
 # Use `set -a` to export all variables defined in the file.
@@ -19,7 +19,9 @@ fi
 MAX_RETRIES=1
 RETRY=0
 while true; do
-  if alembic upgrade head; then
+  # Skips Alembic entirely when already at head; otherwise upgrades under a
+  # Postgres advisory lock so concurrently starting containers don't race
+  if python -m app.scripts.migrate; then
     echo "Migrations applied successfully."
     break
   fi
@@ -0,0 +1,77 @@
+"""Add contacts.updated_at and contact_tombstones for delta sync
+
+Revision ID: 0a4b2d7f5e3c
+Revises: f9a3c1e6d4b2
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0a4b2d7f5e3c"
+down_revision: Union[str, Sequence[str], None] = "f9a3c1e6d4b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # now() is stable, so existing rows get it without a table rewrite;
+    # new rows then default to clock_timestamp()
+    op.add_column(
+        "contacts",
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+    op.alter_column("contacts", "updated_at", server_default=sa.text("clock_timestamp()"))
+
+    op.create_table(
+        "contact_tombstones",
+        sa.Column("contact_id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("clock_timestamp()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("contact_id"),
+    )
+    op.create_index(
+        "ix_contact_tombstones_user_id_deleted_at",
+        "contact_tombstones",
+        ["user_id", "deleted_at", "contact_id"],
+        unique=False,
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_user_id_updated_at",
+            "contacts",
+            ["user_id", "updated_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_contacts_user_id_updated_at",
+            table_name="contacts",
+            postgresql_concurrently=True,
+        )
+    op.drop_index("ix_contact_tombstones_user_id_deleted_at", table_name="contact_tombstones")
+    op.drop_table("contact_tombstones")
+    op.drop_column("contacts", "updated_at")
@@ -0,0 +1,180 @@
+"""Add hash-partitioned shadow of contacts, kept in sync by a trigger
+
+Step 1 of 2 of partitioning contacts by user_id. Creates
+`contacts_partitioned` (the future `contacts`) and a trigger that mirrors
+every write on `contacts` into it. Existing rows are copied online by
+`python -m app.scripts.partition_contacts backfill`; revision 2c7e5a0f3b8d
+then swaps the tables.
+
+Revision ID: 1b6d4f9e2a7c
+Revises: 0a4b2d7f5e3c
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1b6d4f9e2a7c"
+down_revision: Union[str, Sequence[str], None] = "0a4b2d7f5e3c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Fixed for the life of the table: changing it means re-partitioning
+PARTITIONS = 16
+
+NORMALIZED_PHONE_EXPRESSION = (
+    "regexp_replace(regexp_replace(phone_number, '\\D', '', 'g'), '^00', '')"
+)
+
+SEARCH_VECTOR_EXPRESSION = (
+    "to_tsvector('simple', "
+    "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || "
+    "regexp_replace(coalesce(email, ''), '[^[:alnum:]]+', ' ', 'g') || ' ' || "
+    "coalesce(phone_number, '') || ' ' || coalesce(additional_data, ''))"
+)
+
+# Stored columns (generated ones are recomputed by the target table)
+COLUMNS = [
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "birthday",
+    "additional_data",
+    "user_id",
+    "updated_at",
+]
+
+MIRROR_FUNCTION = f"""
+CREATE FUNCTION contacts_mirror_to_partitioned() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND NEW.user_id <> OLD.user_id) THEN
+        DELETE FROM contacts_partitioned WHERE user_id = OLD.user_id AND id = OLD.id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO contacts_partitioned ({", ".join(COLUMNS)})
+        VALUES ({", ".join(f"NEW.{c}" for c in COLUMNS)})
+        ON CONFLICT (user_id, id) DO UPDATE SET
+            {", ".join(f"{c} = EXCLUDED.{c}" for c in COLUMNS if c not in ("id", "user_id"))};
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+MIRROR_TRIGGER = """
+CREATE TRIGGER contacts_mirror_to_partitioned
+AFTER INSERT OR UPDATE OR DELETE ON contacts
+FOR EACH ROW EXECUTE FUNCTION contacts_mirror_to_partitioned()
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "contacts_partitioned",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('contacts_id_seq'::regclass)"),
+            autoincrement=False,
+            nullable=False,
+        ),
+        sa.Column("first_name", sa.String(length=100), nullable=False),
+        sa.Column("last_name", sa.String(length=100), nullable=False),
+        sa.Column("email", sa.String(length=100), nullable=False),
+        sa.Column("phone_number", sa.String(length=20), nullable=False),
+        sa.Column(
+            "normalized_phone",
+            sa.String(length=20),
+            sa.Computed(NORMALIZED_PHONE_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+        sa.Column("birthday", sa.Date(), nullable=True),
+        sa.Column("additional_data", sa.String(length=255), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("clock_timestamp()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], name="fk_contacts_user_id_users", ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("user_id", "id", name="contacts_partitioned_pkey"),
+        postgresql_partition_by="HASH (user_id)",
+    )
+    for remainder in range(PARTITIONS):
+        op.execute(
+            f"CREATE TABLE contacts_p{remainder:02d} PARTITION OF contacts_partitioned "
+            f"FOR VALUES WITH (MODULUS {PARTITIONS}, REMAINDER {remainder})"
+        )
+
+    # Same indexes as contacts, suffixed until the swap; the table is empty,
+    # so building them here is instant. No separate user_id index: the
+    # primary key leads with user_id.
+    op.create_index(
+        "ix_contacts_birthday_md_part",
+        "contacts_partitioned",
+        [
+            sa.text("(EXTRACT(month FROM birthday) * 100 + EXTRACT(day FROM birthday))"),
+            "user_id",
+        ],
+        unique=False,
+        postgresql_where=sa.text("birthday IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_contacts_search_vector_part",
+        "contacts_partitioned",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_contacts_user_id_normalized_phone_part",
+        "contacts_partitioned",
+        ["user_id", "normalized_phone"],
+        unique=False,
+        postgresql_ops={"normalized_phone": "varchar_pattern_ops"},
+    )
+    op.create_index(
+        "ix_contacts_user_id_updated_at_part",
+        "contacts_partitioned",
+        ["user_id", "updated_at", "id"],
+        unique=False,
+    )
+
+    # Backfill high-water mark: every contacts row with id <= last_id has been copied
+    op.create_table(
+        "contacts_partition_backfill",
+        sa.Column("last_id", sa.Integer(), nullable=False),
+    )
+    op.execute("INSERT INTO contacts_partition_backfill (last_id) VALUES (0)")
+
+    op.execute(MIRROR_FUNCTION)
+    op.execute(MIRROR_TRIGGER)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER contacts_mirror_to_partitioned ON contacts")
+    op.execute("DROP FUNCTION contacts_mirror_to_partitioned()")
+    op.drop_table("contacts_partition_backfill")
+    # Drops the partitions and their indexes too
+    op.drop_table("contacts_partitioned")
@@ -0,0 +1,225 @@
+"""Swap the hash-partitioned contacts table in
+
+Step 2 of 2 of partitioning contacts by user_id (see 1b6d4f9e2a7c). Copies
+whatever the online backfill hasn't copied yet, then replaces `contacts` with
+`contacts_partitioned`, all under a short ACCESS EXCLUSIVE lock. Refuses to
+run when too many rows are left, so a large table is never copied under the
+lock: run `python -m app.scripts.partition_contacts backfill` first.
+
+Revision ID: 2c7e5a0f3b8d
+Revises: 1b6d4f9e2a7c
+Create Date: 2026-10-19 16:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2c7e5a0f3b8d"
+down_revision: Union[str, Sequence[str], None] = "1b6d4f9e2a7c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Rows the swap may copy itself while holding the lock (about a second)
+INLINE_COPY_MAX_ROWS = 100_000
+
+INDEXES = [
+    "ix_contacts_birthday_md",
+    "ix_contacts_search_vector",
+    "ix_contacts_user_id_normalized_phone",
+    "ix_contacts_user_id_updated_at",
+]
+
+NORMALIZED_PHONE_EXPRESSION = (
+    "regexp_replace(regexp_replace(phone_number, '\\D', '', 'g'), '^00', '')"
+)
+
+SEARCH_VECTOR_EXPRESSION = (
+    "to_tsvector('simple', "
+    "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || "
+    "regexp_replace(coalesce(email, ''), '[^[:alnum:]]+', ' ', 'g') || ' ' || "
+    "coalesce(phone_number, '') || ' ' || coalesce(additional_data, ''))"
+)
+
+COLUMNS = [
+    "id",
+    "first_name",
+    "last_name",
+    "email",
+    "phone_number",
+    "birthday",
+    "additional_data",
+    "user_id",
+    "updated_at",
+]
+
+MIRROR_FUNCTION = f"""
+CREATE FUNCTION contacts_mirror_to_partitioned() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'DELETE' OR (TG_OP = 'UPDATE' AND NEW.user_id <> OLD.user_id) THEN
+        DELETE FROM contacts_partitioned WHERE user_id = OLD.user_id AND id = OLD.id;
+    END IF;
+    IF TG_OP <> 'DELETE' THEN
+        INSERT INTO contacts_partitioned ({", ".join(COLUMNS)})
+        VALUES ({", ".join(f"NEW.{c}" for c in COLUMNS)})
+        ON CONFLICT (user_id, id) DO UPDATE SET
+            {", ".join(f"{c} = EXCLUDED.{c}" for c in COLUMNS if c not in ("id", "user_id"))};
+    END IF;
+    RETURN NULL;
+END
+$$
+"""
+
+MIRROR_TRIGGER = """
+CREATE TRIGGER contacts_mirror_to_partitioned
+AFTER INSERT OR UPDATE OR DELETE ON contacts
+FOR EACH ROW EXECUTE FUNCTION contacts_mirror_to_partitioned()
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    conn = op.get_bind()
+    last_id = conn.execute(sa.text("SELECT last_id FROM contacts_partition_backfill")).scalar_one()
+    remaining = conn.execute(
+        sa.text("SELECT count(*) FROM (SELECT 1 FROM contacts WHERE id > :last_id LIMIT :cap) t"),
+        {"last_id": last_id, "cap": INLINE_COPY_MAX_ROWS + 1},
+    ).scalar_one()
+    if remaining > INLINE_COPY_MAX_ROWS:
+        raise RuntimeError(
+            f"More than {INLINE_COPY_MAX_ROWS} contacts are not copied to the partitioned "
+            "table yet. Run `alembic upgrade 1b6d4f9e2a7c`, then "
+            "`python -m app.scripts.partition_contacts backfill`, then upgrade again."
+        )
+
+    # Fail fast instead of queueing behind long transactions (and blocking
+    # every request that queues behind this lock)
+    op.execute("SET LOCAL lock_timeout = '10s'")
+    op.execute("LOCK TABLE contacts IN ACCESS EXCLUSIVE MODE")
+    columns = ", ".join(COLUMNS)
+    conn.execute(
+        sa.text(
+            f"INSERT INTO contacts_partitioned ({columns}) "
+            f"SELECT {columns} FROM contacts WHERE id > :last_id "
+            "ON CONFLICT (user_id, id) DO NOTHING"
+        ),
+        {"last_id": last_id},
+    )
+
+    op.execute("DROP TRIGGER contacts_mirror_to_partitioned ON contacts")
+    op.execute("DROP FUNCTION contacts_mirror_to_partitioned()")
+    # The sequence belongs to contacts.id and would be dropped with the table
+    op.execute("ALTER SEQUENCE contacts_id_seq OWNED BY contacts_partitioned.id")
+    op.drop_table("contacts")
+    op.drop_table("contacts_partition_backfill")
+
+    op.rename_table("contacts_partitioned", "contacts")
+    op.execute("ALTER TABLE contacts RENAME CONSTRAINT contacts_partitioned_pkey TO contacts_pkey")
+    for name in INDEXES:
+        op.execute(f"ALTER INDEX {name}_part RENAME TO {name}")
+    # Autovacuum analyzes the partitions but never the parent table: run
+    # `ANALYZE contacts` once after this migration.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Back to the state after 1b6d4f9e2a7c: the partitioned table becomes the
+    # shadow again, fully backfilled, and a plain contacts table is rebuilt.
+    # Offline: the plain table is filled while holding locks.
+    for name in INDEXES:
+        op.execute(f"ALTER INDEX {name} RENAME TO {name}_part")
+    op.execute("ALTER TABLE contacts RENAME CONSTRAINT contacts_pkey TO contacts_partitioned_pkey")
+    op.rename_table("contacts", "contacts_partitioned")
+
+    op.create_table(
+        "contacts",
+        sa.Column(
+            "id",
+            sa.Integer(),
+            server_default=sa.text("nextval('contacts_id_seq'::regclass)"),
+            autoincrement=False,
+            nullable=False,
+        ),
+        sa.Column("first_name", sa.String(length=100), nullable=False),
+        sa.Column("last_name", sa.String(length=100), nullable=False),
+        sa.Column("email", sa.String(length=100), nullable=False),
+        sa.Column("phone_number", sa.String(length=20), nullable=False),
+        sa.Column(
+            "normalized_phone",
+            sa.String(length=20),
+            sa.Computed(NORMALIZED_PHONE_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+        sa.Column("birthday", sa.Date(), nullable=True),
+        sa.Column("additional_data", sa.String(length=255), nullable=True),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("clock_timestamp()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], name="fk_contacts_user_id_users", ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id", name="contacts_pkey"),
+    )
+    columns = ", ".join(COLUMNS)
+    op.execute(f"INSERT INTO contacts ({columns}) SELECT {columns} FROM contacts_partitioned")
+    op.execute("ALTER SEQUENCE contacts_id_seq OWNED BY contacts.id")
+
+    op.create_index("ix_contacts_user_id", "contacts", ["user_id"], unique=False)
+    op.create_index(
+        "ix_contacts_birthday_md",
+        "contacts",
+        [
+            sa.text("(EXTRACT(month FROM birthday) * 100 + EXTRACT(day FROM birthday))"),
+            "user_id",
+        ],
+        unique=False,
+        postgresql_where=sa.text("birthday IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_contacts_search_vector",
+        "contacts",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_contacts_user_id_normalized_phone",
+        "contacts",
+        ["user_id", "normalized_phone"],
+        unique=False,
+        postgresql_ops={"normalized_phone": "varchar_pattern_ops"},
+    )
+    op.create_index(
+        "ix_contacts_user_id_updated_at",
+        "contacts",
+        ["user_id", "updated_at", "id"],
+        unique=False,
+    )
+
+    op.create_table(
+        "contacts_partition_backfill",
+        sa.Column("last_id", sa.Integer(), nullable=False),
+    )
+    op.execute(
+        "INSERT INTO contacts_partition_backfill (last_id) "
+        "SELECT coalesce(max(id), 0) FROM contacts"
+    )
+    op.execute(MIRROR_FUNCTION)
+    op.execute(MIRROR_TRIGGER)
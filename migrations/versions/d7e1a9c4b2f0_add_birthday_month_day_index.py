@@ -0,0 +1,44 @@
+"""Add birthday month/day index to contacts
+
+Revision ID: d7e1a9c4b2f0
+Revises: c456e1c383c9
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d7e1a9c4b2f0"
+down_revision: Union[str, Sequence[str], None] = "c456e1c383c9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Built concurrently so large contacts tables stay writable
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_birthday_md",
+            "contacts",
+            [
+                sa.text("(EXTRACT(month FROM birthday) * 100 + EXTRACT(day FROM birthday))"),
+                "user_id",
+            ],
+            unique=False,
+            postgresql_where=sa.text("birthday IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_contacts_birthday_md", table_name="contacts", postgresql_concurrently=True
+        )
@@ -0,0 +1,71 @@
+"""Add full-text search vector and phone prefix index to contacts
+
+Revision ID: e8f2b0d5c3a1
+Revises: d7e1a9c4b2f0
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8f2b0d5c3a1"
+down_revision: Union[str, Sequence[str], None] = "d7e1a9c4b2f0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "to_tsvector('simple', "
+    "coalesce(first_name, '') || ' ' || coalesce(last_name, '') || ' ' || "
+    "coalesce(email, '') || ' ' || "
+    "regexp_replace(coalesce(email, ''), '[^[:alnum:]]+', ' ', 'g') || ' ' || "
+    "coalesce(phone_number, '') || ' ' || coalesce(additional_data, ''))"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a stored generated column rewrites the table once
+    op.add_column(
+        "contacts",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_search_vector",
+            "contacts",
+            ["search_vector"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_contacts_user_id_phone_prefix",
+            "contacts",
+            ["user_id", "phone_number"],
+            unique=False,
+            postgresql_ops={"phone_number": "varchar_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_contacts_user_id_phone_prefix", table_name="contacts", postgresql_concurrently=True
+        )
+        op.drop_index(
+            "ix_contacts_search_vector", table_name="contacts", postgresql_concurrently=True
+        )
+    op.drop_column("contacts", "search_vector")
@@ -0,0 +1,69 @@
+"""Add normalized phone column and reverse-lookup index to contacts
+
+Revision ID: f9a3c1e6d4b2
+Revises: e8f2b0d5c3a1
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f9a3c1e6d4b2"
+down_revision: Union[str, Sequence[str], None] = "e8f2b0d5c3a1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NORMALIZED_PHONE_EXPRESSION = (
+    "regexp_replace(regexp_replace(phone_number, '\\D', '', 'g'), '^00', '')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Adding a stored generated column rewrites the table once
+    op.add_column(
+        "contacts",
+        sa.Column(
+            "normalized_phone",
+            sa.String(length=20),
+            sa.Computed(NORMALIZED_PHONE_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_user_id_normalized_phone",
+            "contacts",
+            ["user_id", "normalized_phone"],
+            unique=False,
+            postgresql_ops={"normalized_phone": "varchar_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+        # Phone prefix search now uses the normalized column
+        op.drop_index(
+            "ix_contacts_user_id_phone_prefix", table_name="contacts", postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_contacts_user_id_phone_prefix",
+            "contacts",
+            ["user_id", "phone_number"],
+            unique=False,
+            postgresql_ops={"phone_number": "varchar_pattern_ops"},
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_contacts_user_id_normalized_phone",
+            table_name="contacts",
+            postgresql_concurrently=True,
+        )
+    op.drop_column("contacts", "normalized_phone")